@@ -13,9 +13,14 @@
 
 #------------------------------------------------------------------------------------------------------#
 
-import math
+import queue
+import struct
+import threading
+import time
 from time import sleep
 from i2c.i2c import I2C
+from hub.stream import paced
+from hub.motion import MotionAnalyzer, direction, tilt
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -79,6 +84,39 @@ ADXL345_RANGE_4G                          = 0x01    # +-4 g
 ADXL345_RANGE_8G                          = 0x02    # +-8 g
 ADXL345_RANGE_16G                         = 0x03    # +-16 g
 
+# FIFO mode (FIFO_CTL bit 7 - 6)
+ADXL345_FIFO_BYPASS                       = 0x00    # FIFO is off
+ADXL345_FIFO_FIFO                         = 0x01    # Collect 32 samples then stop
+ADXL345_FIFO_STREAM                       = 0x02    # Keep last 32 samples, oldest are overwritten
+ADXL345_FIFO_TRIGGER                      = 0x03    # Keep last samples, hold after trigger
+
+ADXL345_FIFO_TRIGGERED                    = 0x80    # FIFO_STATUS: trigger event occurred
+ADXL345_FIFO_SIZE                         = 32      # Samples
+ADXL345_SAMPLE_SIZE                       = 6       # Bytes of x, y, z
+
+# Interrupts (bits of INT_ENABLE, INT_MAP, INT_SOURCE)
+ADXL345_INT_DATA_READY                    = 0x80
+ADXL345_INT_SINGLE_TAP                    = 0x40
+ADXL345_INT_DOUBLE_TAP                    = 0x20
+ADXL345_INT_ACTIVITY                      = 0x10
+ADXL345_INT_INACTIVITY                    = 0x08
+ADXL345_INT_FREE_FALL                     = 0x04
+ADXL345_INT_WATERMARK                     = 0x02
+ADXL345_INT_OVERRUN                       = 0x01
+
+ADXL345_THRESH_SCALE                      = 0.0625  # g / LSB of THRESH_TAP, THRESH_ACT, THRESH_INACT, THRESH_FF
+ADXL345_TIME_FF_SCALE                     = 0.005   # s / LSB of TIME_FF
+ADXL345_TIME_INACT_SCALE                  = 1.0     # s / LSB of TIME_INACT
+
+# Events of INT_SOURCE, in order of report
+ADXL345_EVENTS                            = [(ADXL345_INT_FREE_FALL, "Free Fall"),
+                                             (ADXL345_INT_ACTIVITY, "Activity"),
+                                             (ADXL345_INT_INACTIVITY, "Inactivity"),
+                                             (ADXL345_INT_DOUBLE_TAP, "Double Tap"),
+                                             (ADXL345_INT_SINGLE_TAP, "Single Tap")]
+ADXL345_INT_EVENTS                        = ADXL345_INT_FREE_FALL | ADXL345_INT_ACTIVITY | ADXL345_INT_INACTIVITY | \
+                                            ADXL345_INT_DOUBLE_TAP | ADXL345_INT_SINGLE_TAP
+
 #------------------------------------------------------------------------------------------------------#
 
 class ADXL345:
@@ -87,6 +125,12 @@ class ADXL345:
         self.__i2c = i2c
         self.__address = address
         self.__range = srange
+        self.__accel_buf = bytearray(6)         # Reused by get_accel, no allocation per sample
+        self.__rate_hz = 100.0
+        self.__fifo_last = None                 # Time of last sample read from FIFO
+        self.__trigger = None                   # (pre_samples, int2) while trigger capture is armed
+        self.fifo_full = 0                      # FIFO reads with 32 entries (samples may be lost)
+        self.motion = MotionAnalyzer()          # Updated by is_vibration
 
         self.set_range(srange)
         self.set_rate(ADXL345_RATE_200HZ)
@@ -99,8 +143,12 @@ class ADXL345:
     
     # Read bytes from register
     def __read_reg(self, reg, size):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        return self.__i2c.i2c_read_data(self.__address, size)
+        return self.__i2c.i2c_read_write_data(self.__address, [reg], size)
+
+    # Set bits of mask to value (read - modify - write)
+    def __update_reg(self, reg, mask, value):
+        old = self.__read_reg(reg, 1)[0]
+        self.__write_reg(reg, (old & ~mask) | (value & mask))
 
     #--------------------------------------------------------------------------------------------------#
 
@@ -119,6 +167,17 @@ class ADXL345:
             return 0
         
         return (res * value * 2) / 1024.0
+
+    # Convert a block of raw samples to SI in one operation (numpy)
+    # raw: bytes of N samples, 6 bytes each as read from DATAX0 (x, y, z little endian)
+    # Return float array (N, 3), unit g, same scale as convert
+    def decode_accel(self, raw):
+        import numpy
+
+        if len(raw) % 6:
+            raise ValueError("Raw data must be a multiple of 6 bytes")
+        samples = numpy.frombuffer(raw, dtype = '<i2').reshape(-1, 3)
+        return samples * self.convert(1.0)
     
     # Set data rate
     # See constant "Data rate"
@@ -128,6 +187,12 @@ class ADXL345:
     def set_rate(self, rate):
         # Low power = 0
         self.__write_reg(REG_BW_RATE, rate & 0xFF)
+        # 3200 Hz / 2 ^ (15 - rate)
+        self.__rate_hz = 3200.0 / (1 << (ADXL345_RATE_3200HZ - (rate & 0x0F)))
+
+    # Output data rate (Hz)
+    def get_rate_hz(self):
+        return self.__rate_hz
 
     # Set range
     # See constant "Range"
@@ -173,14 +238,192 @@ class ADXL345:
     # Return value of ax, ay, az (unit g (1g = 9.8 m/s^2))
     # Normal x = 0g, y = 0g, z = 1g
     def get_accel(self):
-        read = self.__read_reg(REG_DATAX0, 6)
+        self.__i2c.i2c_read_write_into(self.__address, [REG_DATAX0], self.__accel_buf)
         # Little endian
-        x = int.from_bytes([read[0], read[1]], byteorder = 'little', signed = True)
-        y = int.from_bytes([read[2], read[3]], byteorder = 'little', signed = True)
-        z = int.from_bytes([read[4], read[5]], byteorder = 'little', signed = True)
+        x, y, z = struct.unpack_from('<hhh', self.__accel_buf)
 
         return self.convert(x), self.convert(y), self.convert(z)
 
+    # Yield (t, (ax, ay, az)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_accel, rate_hz, count)
+
+    #--------------------------------------------------------------------------------------------------#
+
+    # Config FIFO
+    # mode: see constant "FIFO mode", ex ADXL345_FIFO_STREAM
+    # samples: watermark (stream, FIFO mode) or samples kept before trigger (trigger mode), 0 - 31
+    # trigger_int2: trigger event is on INT2 (else INT1), trigger mode only
+    def config_fifo(self, mode = ADXL345_FIFO_STREAM, samples = 16, trigger_int2 = False):
+        value = ((mode & 0x03) << 6) | ((1 if trigger_int2 else 0) << 5) | (samples & 0x1F)
+        self.__write_reg(REG_FIFO_CTL, value)
+        self.__fifo_last = None
+
+    # Number of samples in FIFO (FIFO_STATUS entries)
+    def get_fifo_count(self):
+        return self.__read_reg(REG_FIFO_STATUS, 1)[0] & 0x3F
+
+    # Drain FIFO: one status read, then all samples in one batched transaction
+    # (each sample is a DATAX0 write + 6 byte read, the write gives the 5 us the FIFO needs to pop)
+    # A burst of count * 6 bytes is not possible: after DATAZ1 (0x37) the address goes on to FIFO_CTL,
+    # the next FIFO entry is only read from DATAX0 again (datasheet "Retrieving Data from FIFO")
+    # On the real bus more than 21 samples (42 messages, I2C_RDWR_MAX_MSGS) are sent as 2 i2c_rdwr,
+    # split between samples: this is safe, count comes from FIFO_STATUS before the reads and the FIFO
+    # only adds entries at its end, a sample arriving between the 2 calls stays for the next drain
+    # max_count: max number of samples read
+    # Return (t, raw): t time of last sample, raw bytes of samples oldest first (see decode_accel)
+    def read_fifo_raw(self, max_count = ADXL345_FIFO_SIZE):
+        count = min(self.get_fifo_count(), max_count)
+        t = time.monotonic()
+        if count == 0:
+            return t, b""
+        if count >= ADXL345_FIFO_SIZE:
+            self.fifo_full += 1
+
+        transaction = self.__i2c.i2c_transaction(self.__address)
+        for i in range(count):
+            transaction.write_read([REG_DATAX0], ADXL345_SAMPLE_SIZE)
+        raw = b"".join(bytes(sample) for sample in transaction.execute())
+        return t, raw
+
+    # Drain FIFO
+    # Times are spaced by the data rate back from the read time, and stay after the previous block
+    # Return list of (t, (ax, ay, az)) oldest first, unit g
+    def read_fifo(self, max_count = ADXL345_FIFO_SIZE):
+        t, raw = self.read_fifo_raw(max_count)
+        count = len(raw) // ADXL345_SAMPLE_SIZE
+        if count == 0:
+            return []
+
+        period = 1.0 / self.__rate_hz
+        first = t - (count - 1) * period
+        if self.__fifo_last is not None and first <= self.__fifo_last:
+            first = self.__fifo_last + period
+        self.__fifo_last = first + (count - 1) * period
+
+        scale = self.convert(1.0)
+        return [(first + i * period, (x * scale, y * scale, z * scale)) for i, (x, y, z) in enumerate(struct.iter_unpack('<hhh', raw))]
+
+    # Yield (t, (ax, ay, az)) of every sample at the data rate, read by FIFO blocks
+    # FIFO must be in stream mode (config_fifo), a block is read about every 16 samples
+    # count: number of samples, None = forever
+    def stream_fifo(self, count = None):
+        n = 0
+        while count is None or n < count:
+            for sample in self.read_fifo():
+                yield sample
+                n += 1
+                if count is not None and n >= count:
+                    return
+            sleep(ADXL345_FIFO_SIZE / 2 / self.__rate_hz)
+
+    #--------------------------------------------------------------------------------------------------#
+
+    # Arm trigger capture: the chip keeps pre_samples of history in FIFO while the host sleeps,
+    # on the trigger interrupt it collects the remaining samples up to 32 and holds them
+    # source: interrupt that triggers, ex ADXL345_INT_ACTIVITY (shock above threshold), ADXL345_INT_SINGLE_TAP
+    # threshold: activity threshold (g, ac-coupled on x, y, z), used with ADXL345_INT_ACTIVITY
+    # int2: trigger interrupt is mapped to INT2 (else INT1), other interrupts on this pin also trigger
+    def arm_trigger(self, pre_samples = 16, threshold = 2.0, source = ADXL345_INT_ACTIVITY, int2 = False):
+        if source & ADXL345_INT_ACTIVITY:
+            self.__write_reg(REG_THRESH_ACT, max(1, min(255, int(round(threshold / ADXL345_THRESH_SCALE)))))
+            self.__update_reg(REG_ACT_INACT_CTL, 0xF0, 0xF0)
+        self.__update_reg(REG_INT_MAP, source, source if int2 else 0x00)
+        self.__update_reg(REG_INT_ENABLE, source, source)
+        self.__trigger = (pre_samples, int2)
+        self.__rearm()
+
+    # Restart trigger mode: bypass clears FIFO and trigger, INT_SOURCE read clears latched interrupts
+    def __rearm(self):
+        pre_samples, int2 = self.__trigger
+        self.config_fifo(ADXL345_FIFO_BYPASS)
+        self.__read_reg(REG_INT_SOUCE, 1)
+        self.config_fifo(ADXL345_FIFO_TRIGGER, pre_samples, int2)
+
+    # Stop trigger capture, FIFO is bypassed
+    def disarm_trigger(self):
+        self.__trigger = None
+        self.config_fifo(ADXL345_FIFO_BYPASS)
+
+    # Trigger event occurred (FIFO_STATUS, one byte read)
+    def is_triggered(self):
+        return bool(self.__read_reg(REG_FIFO_STATUS, 1)[0] & ADXL345_FIFO_TRIGGERED)
+
+    # Wait for the trigger and the samples after it (FIFO full)
+    # poll: seconds between FIFO_STATUS reads, one byte on the bus each
+    # Return True, or False on timeout
+    def wait_trigger(self, timeout = None, poll = 0.01):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.__read_reg(REG_FIFO_STATUS, 1)[0]
+            if status & ADXL345_FIFO_TRIGGERED and (status & 0x3F) >= ADXL345_FIFO_SIZE:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            sleep(poll)
+
+    # Wait for a trigger, drain the window and arm again
+    # Return (t, samples): t time of the trigger sample, samples list of (t, (ax, ay, az)) oldest first
+    # None on timeout
+    def capture_trigger(self, timeout = None, poll = 0.01):
+        if self.__trigger is None:
+            raise RuntimeError("Trigger capture is not armed")
+        if not self.wait_trigger(timeout, poll):
+            return None
+        samples = self.read_fifo()
+        pre_samples = self.__trigger[0]
+        self.__rearm()
+        if not samples:
+            return None
+        return samples[min(pre_samples, len(samples) - 1)][0], samples
+
+    #--------------------------------------------------------------------------------------------------#
+
+    # Threshold register value of g
+    def __thresh(self, value, scale):
+        return max(1, min(255, int(round(value / scale))))
+
+    # Program motion events, None disables an event
+    # activity: threshold (g), inactivity: threshold (g) held for inactivity_time (s, 1 - 255)
+    # free_fall: threshold (g) of all axes held for free_fall_time (s, 0.005 - 1.275)
+    # tap: single and double tap (thresholds of config_tap_detect)
+    # int2: events are mapped to INT2 (else INT1)
+    # Only event bits are changed, other interrupts (ex watermark or trigger of arm_trigger) are kept
+    def config_events(self, activity = 1.5, inactivity = 0.2, inactivity_time = 5, free_fall = 0.45, free_fall_time = 0.1, tap = True, int2 = False):
+        enable = 0
+        if activity is not None:
+            self.__write_reg(REG_THRESH_ACT, self.__thresh(activity, ADXL345_THRESH_SCALE))
+            enable |= ADXL345_INT_ACTIVITY
+        if inactivity is not None:
+            self.__write_reg(REG_THRESH_INACT, self.__thresh(inactivity, ADXL345_THRESH_SCALE))
+            self.__write_reg(REG_TIME_INACT, self.__thresh(inactivity_time, ADXL345_TIME_INACT_SCALE))
+            enable |= ADXL345_INT_INACTIVITY
+        if free_fall is not None:
+            self.__write_reg(REG_THRESH_FF, self.__thresh(free_fall, ADXL345_THRESH_SCALE))
+            self.__write_reg(REG_TIME_FF, self.__thresh(free_fall_time, ADXL345_TIME_FF_SCALE))
+            enable |= ADXL345_INT_FREE_FALL
+        if tap:
+            enable |= ADXL345_INT_SINGLE_TAP | ADXL345_INT_DOUBLE_TAP
+
+        # Activity and inactivity ac-coupled on x, y, z
+        control = (0xF0 if activity is not None else 0x00) | (0x0F if inactivity is not None else 0x00)
+        if control:
+            self.__update_reg(REG_ACT_INACT_CTL, control, control)
+        # Events off while they are remapped
+        self.__update_reg(REG_INT_ENABLE, ADXL345_INT_EVENTS, 0x00)
+        self.__update_reg(REG_INT_MAP, ADXL345_INT_EVENTS, enable if int2 else 0x00)
+        self.__update_reg(REG_INT_ENABLE, ADXL345_INT_EVENTS, enable)
+
+    # Read and clear events (one INT_SOURCE read)
+    # A double tap is reported without its single tap
+    # Return list of event names, ex ["Activity", "Double Tap"]
+    def read_events(self):
+        source = self.__read_reg(REG_INT_SOUCE, 1)[0]
+        if source & ADXL345_INT_DOUBLE_TAP:
+            source &= ~ADXL345_INT_SINGLE_TAP
+        return [name for bit, name in ADXL345_EVENTS if source & bit]
+
     # Get tap status
     # Return Single Tap, Double Tap or None
     def get_tap(self):
@@ -195,68 +438,108 @@ class ADXL345:
     # Get Tilt angle
     # x, y, z: accel x, y, z
     # Return x, y, z angle in radian
+    # Block of samples (ex decode_accel of the bytes of read_fifo_raw): hub.motion.tilt_angles
     # https://forum.arduino.cc/t/how-to-get-degrees-of-rotation-from-raw-acceleration-data/451992/11
     # https://wiki.dfrobot.com/How_to_Use_a_Three-Axis_Accelerometer_for_Tilt_Sensing
     def get_tilt_angle(self, x, y, z):
-        if y == 0 and z == 0 and x >= 0:
-            ax = math.pi / 2
-        elif y == 0 and z == 0 and x < 0:
-            ax = -math.pi / 2
-        else:
-            ax = math.atan(x / math.sqrt(pow(y, 2) + pow(z, 2)))
-
-        if x == 0 and z == 0 and y >= 0:
-            ay = math.pi / 2
-        elif x == 0 and z == 0 and y < 0:
-            ay = -math.pi / 2
-        else:
-            ay = math.atan(y / math.sqrt(pow(x, 2) + pow(z, 2)))
-        
-        if z == 0:
-            az = 0
-        else:
-            az = math.atan(math.sqrt(pow(x, 2) + pow(y, 2)) / z)
-
-        return ax, ay, az
+        return tilt(x, y, z)
     
     # Get direction
     # Return up (z max), down (z min), right (x max), left (x min), front (y max), back (y min)
     def get_direction(self, x, y, z):
-        THRESHOLD = 0.3
-
-        if x > THRESHOLD and x > y and x > z:
-            return "Right"
-        elif x < -THRESHOLD and x < y and x < z:
-            return "Left"
-
-        elif y > THRESHOLD and y > x and y > z:
-            return "Front"
-        elif y < -THRESHOLD and y < x and y < z:
-            return "Back"
-
-        elif z > THRESHOLD and z > x and z > y:
-            return "Up"
-        elif z < -THRESHOLD and z < x and z < y:
-            return "Down"
-        
-        else:
-            return "Unknow"
+        return direction(x, y, z)
 
     # Get sensor is vibration or not
-    # Time sleep between 2 measure depends on data rate
+    # Each call reads one sample (no sleep), vibration is over the last 3 samples at least 0.1 s apart
+    # False until 3 such samples are read (call again, at least every second)
     # Return true if is vibration
     def is_vibration(self):
-        values1 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values2 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values3 = list(self.get_accel())
+        return self.motion.poll(self.get_accel).is_vibration()
 
-        delta = 0
+#------------------------------------------------------------------------------------------------------#
+
+# Motion event engine (config_events), no raw acceleration on the bus
+# Driven by the INT pin (edge callback reads INT_SOURCE) or by one INT_SOURCE read per interval
+# Events are put in queue as (t, event), or given to callback(t, event) (called in the GPIO or poll thread)
+# Other INT_SOURCE reads (get_tap) clear the events, do not mix them
+class ADXL345Events:
+    # pin: BCM pin of the ADXL345 INT output, None = polling
+    # gpio: RPi.GPIO (default) or i2c.sim.SimGPIO
+    def __init__(self, adxl345, callback = None, pin = None, gpio = None, interval = 0.05):
+        self.adxl345 = adxl345
+        self.callback = callback
+        self.queue = queue.Queue()
+        self.pin = pin
+        self.interval = interval
+        self.reads = 0                          # INT_SOURCE reads
+        self.__gpio = gpio
+        self.__stop = threading.Event()
+        self.__thread = None
+
+        if pin is not None:
+            if self.__gpio is None:
+                import RPi.GPIO as GPIO
+                self.__gpio = GPIO
+            self.__gpio.setwarnings(False)
+            self.__gpio.setmode(self.__gpio.BCM)
+            self.__gpio.setup(pin, self.__gpio.IN, pull_up_down = self.__gpio.PUD_OFF)
+
+    def __deliver(self, t, events):
+        for event in events:
+            if self.callback is not None:
+                self.callback(t, event)
+            else:
+                self.queue.put((t, event))
+
+    # Read INT_SOURCE, deliver its events
+    def poll(self):
+        t = time.monotonic()
+        events = self.adxl345.read_events()
+        self.reads += 1
+        self.__deliver(t, events)
+        return events
+
+    # INT pin rising edge, read until INT is low (events latched during the read keep it high)
+    def __on_interrupt(self, pin):
+        self.poll()
         for i in range(3):
-            delta += abs(values2[i] - values1[i]) + abs(values3[i] - values2[i])
+            if not self.__gpio.input(self.pin):
+                break
+            self.poll()
 
-        return delta > 0.5
+    def __poll_loop(self):
+        while not self.__stop.wait(self.interval):
+            self.poll()
+
+    #--------------------------------------------------------------------------------------------------#
+
+    def start(self):
+        self.__stop.clear()
+        # Clear old events, INT would stay high and no edge would come
+        self.adxl345.read_events()
+        if self.pin is not None:
+            self.__gpio.add_event_detect(self.pin, self.__gpio.RISING, callback = self.__on_interrupt)
+            if self.__gpio.input(self.pin):
+                self.__on_interrupt(self.pin)
+        else:
+            self.__thread = threading.Thread(target = self.__poll_loop, name = "adxl345-events", daemon = True)
+            self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+        if self.pin is not None:
+            self.__gpio.remove_event_detect(self.pin)
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    # Next event from queue
+    # Return (t, event), None on timeout
+    def get(self, timeout = None):
+        try:
+            return self.queue.get(timeout = timeout)
+        except queue.Empty:
+            return None
 
 #-------------------------- Example --------------------------
 
@@ -278,4 +561,24 @@ while True:
     sleep(0.5)
 
 adxl345.stop()
+
+# 10 s at 3200 Hz without losing samples: FIFO read by blocks
+adxl345.set_rate(ADXL345_RATE_3200HZ)
+adxl345.config_fifo(ADXL345_FIFO_STREAM)
+adxl345.start()
+samples = list(adxl345.stream_fifo(count = 3200 * 10))     # count is samples, not Hz
+print(len(samples), samples[-1])
+
+# Motion events on INT1 (GPIO 17), nothing on the bus between events
+adxl345.config_events(activity = 1.5, free_fall = 0.45)
+events = ADXL345Events(adxl345, pin = 17)
+events.start()
+while True:
+    print(events.get())      # (t, "Free Fall")
+
+# Shock capture: 16 samples before and 16 after a 4 g shock, one status byte per poll in between
+adxl345.arm_trigger(pre_samples = 16, threshold = 4.0)
+while True:
+    t, samples = adxl345.capture_trigger()
+    print("Shock at", t, max(abs(z) for ts, (x, y, z) in samples))
 """
\ No newline at end of file
@@ -13,6 +13,7 @@
 
 from time import sleep
 from i2c.i2c import I2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -66,41 +67,35 @@ class BMP280:
 
     # Read UINT8
     def __read_u8(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        return self.__i2c.i2c_read_byte(self.__address)
+        return self.__i2c.i2c_read_write_data(self.__address, [reg], 1)[0]
 
     # Read UINT16 big endian
     def __read_u16(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        read = self.__i2c.i2c_read_data(self.__address, 2)
+        read = self.__i2c.i2c_read_write_data(self.__address, [reg], 2)
 
         return int.from_bytes([read[0], read[1]], byteorder = 'big', signed = False)
 
     # Read UINT16 little endian
     def __read_u16_le(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        read = self.__i2c.i2c_read_data(self.__address, 2)
+        read = self.__i2c.i2c_read_write_data(self.__address, [reg], 2)
 
         return int.from_bytes([read[0], read[1]], byteorder = 'little', signed = False)
 
     # Read INT16 big endian
     def __read_s16(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        read = self.__i2c.i2c_read_data(self.__address, 2)
+        read = self.__i2c.i2c_read_write_data(self.__address, [reg], 2)
 
         return int.from_bytes([read[0], read[1]], byteorder = 'big', signed = True)
     
     # Read INT16 little endian
     def __read_s16_le(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        read = self.__i2c.i2c_read_data(self.__address, 2)
+        read = self.__i2c.i2c_read_write_data(self.__address, [reg], 2)
 
         return int.from_bytes([read[0], read[1]], byteorder = 'little', signed = True)
 
     # Read UINT24 big endian
     def __read_u24(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        read = self.__i2c.i2c_read_data(self.__address, 3)
+        read = self.__i2c.i2c_read_write_data(self.__address, [reg], 3)
 
         return int.from_bytes([read[0], read[1], read[2]], byteorder = 'big', signed = False)
 
@@ -130,7 +125,21 @@ class BMP280:
     def get_pressure(self):
         # Call getTemperature to get t_fine
         self.get_temperature()
+        return self.__read_pressure()
 
+    # Get temperature and pressure (one temperature read for both)
+    # Return: (temperature, pressure)
+    def get_temperature_pressure(self):
+        temperature = self.get_temperature()
+        return temperature, self.__read_pressure()
+
+    # Yield (t, (temperature, pressure)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_temperature_pressure, rate_hz, count)
+
+    # Read pressure, t_fine must be updated by get_temperature before
+    def __read_pressure(self):
         adc = self.__read_u24(BMP280_REG_PRESSUREDATA)
         adc = adc >> 4
 
@@ -13,6 +13,7 @@
 #------------------------------------------------------------------------------------------------------#
 
 from i2c.i2c import I2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -37,6 +38,11 @@ class MEGA328P:
         button = read[2]
 
         return x, y, button
+
+    # Yield (t, (x, y, button)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_value, rate_hz, count)
     
 #-------------------------- Example --------------------------
 
@@ -14,6 +14,8 @@
 
 from time import sleep
 from i2c.i2c import I2C
+from hub.stream import paced
+from hub.motion import MotionAnalyzer
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -67,6 +69,7 @@ class MMA7660FC:
     def __init__(self, i2c, address = MMA7660FC_I2C_ADDRESS):
         self.__address = address
         self.__i2c = i2c
+        self.motion = MotionAnalyzer()          # Updated by get_direction/ is_vibration
         
         self.__start()
     
@@ -119,46 +122,35 @@ class MMA7660FC:
             return 0, 0, 0
 
         return x * 1.5 / 31, y * 1.5 / 31, z * 1.5 / 31
+
+    # Convert a block of raw samples to g in one operation (numpy)
+    # raw: bytes of N samples, 3 bytes each as read from XOUT (6 bit signed x, y, z)
+    # Return float array (N, 3), same scale as get_accel
+    def decode_accel(self, raw):
+        import numpy
+
+        if len(raw) % 3:
+            raise ValueError("Raw data must be a multiple of 3 bytes")
+        samples = numpy.frombuffer(raw, dtype = numpy.uint8).reshape(-1, 3).astype(numpy.int8)
+        samples = ((samples & 0x3F) ^ 0x20) - 0x20
+        return samples * (1.5 / 31)
+
+    # Yield (t, (ax, ay, az)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_accel, rate_hz, count)
     
     # Get direction
     # Return up (z max), down (z min), right (x max), left (x min), front (y max), back (y min)
     def get_direction(self):
-        x, y, z = self.get_accel()
-        THRESHOLD = 0.3
-
-        if x > THRESHOLD and x > y and x > z:
-            return "Right"
-        elif x < -THRESHOLD and x < y and x < z:
-            return "Left"
-
-        elif y > THRESHOLD and y > x and y > z:
-            return "Front"
-        elif y < -THRESHOLD and y < x and y < z:
-            return "Back"
-
-        elif z > THRESHOLD and z > x and z > y:
-            return "Up"
-        elif z < -THRESHOLD and z < x and z < y:
-            return "Down"
-        
-        else:
-            return "Unknow"
+        return self.motion.update(self.get_accel()).direction
 
     # Get sensor is vibration or not
-    # Time sleep between 2 measure depends on data rate
+    # Each call reads one sample (no sleep), vibration is over the last 3 samples at least 0.1 s apart
+    # False until 3 such samples are read (call again, at least every second)
     # Return true if is vibration
     def is_vibration(self):
-        values1 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values2 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values3 = list(self.get_accel())
-
-        delta = 0
-        for i in range(3):
-            delta += abs(values2[i] - values1[i]) + abs(values3[i] - values2[i])
-
-        return delta > 0.5
+        return self.motion.poll(self.get_accel).is_vibration()
 
 #-------------------------- Example --------------------------
 
@@ -12,8 +12,11 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import struct
 from time import sleep
 from i2c.i2c import I2C
+from hub.stream import paced
+from hub.motion import MotionAnalyzer
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -81,6 +84,8 @@ class MPU6886:
         self.__address = address
         self.__gyscale = gyscale
         self.__acscale = acscale
+        self.__buf = bytearray(6)               # Reused by get_accel_adc/ get_gyro_adc
+        self.motion = MotionAnalyzer()          # Updated by get_direction/ is_vibration
         self.__start()
 
     def __read_data(self, reg, size):
@@ -175,11 +180,9 @@ class MPU6886:
 
     # Get accel adc from register
     def get_accel_adc(self):
-        adc = self.__read_data(IMU_6886_ACCEL_XOUT_H, 6)
+        self.__i2c.i2c_read_block_into(self.__address, IMU_6886_ACCEL_XOUT_H, self.__buf)
         # Big endian and signed
-        ax = int.from_bytes([adc[0], adc[1]], byteorder = 'big', signed = True)
-        ay = int.from_bytes([adc[2], adc[3]], byteorder = 'big', signed = True)
-        az = int.from_bytes([adc[4], adc[5]], byteorder = 'big', signed = True)
+        ax, ay, az = struct.unpack_from('>hhh', self.__buf)
 
         if ax == 0 and ay == 0 and az == 0:
             self.__start()
@@ -187,11 +190,9 @@ class MPU6886:
 
     # Get gyro adc from register
     def get_gyro_adc(self):
-        adc = self.__read_data(IMU_6886_GYRO_XOUT_H, 6)
-        # Big endian and unsigned
-        gx = int.from_bytes([adc[0], adc[1]], byteorder = 'big', signed = True)
-        gy = int.from_bytes([adc[2], adc[3]], byteorder = 'big', signed = True)
-        gz = int.from_bytes([adc[4], adc[5]], byteorder = 'big', signed = True)
+        self.__i2c.i2c_read_block_into(self.__address, IMU_6886_GYRO_XOUT_H, self.__buf)
+        # Big endian and signed
+        gx, gy, gz = struct.unpack_from('>hhh', self.__buf)
 
         if gx == 0 and gy == 0 and gz == 0:
             self.__start()
@@ -219,6 +220,17 @@ class MPU6886:
         az = z * self.__ares
 
         return ax, ay, az
+
+    # Convert a block of raw accel samples to g in one operation (numpy)
+    # raw: bytes of N samples, 6 bytes each as read from ACCEL_XOUT_H (x, y, z big endian)
+    # Return float array (N, 3), scale of current accel range
+    def decode_accel(self, raw):
+        import numpy
+
+        if len(raw) % 6:
+            raise ValueError("Raw data must be a multiple of 6 bytes")
+        samples = numpy.frombuffer(raw, dtype = '>i2').reshape(-1, 3)
+        return samples * self.__ares
     
     # Get gyro values (x, y, z)
     def get_gyro(self):
@@ -229,6 +241,11 @@ class MPU6886:
 
         return gx, gy, gz
 
+    # Yield (t, (ax, ay, az, gx, gy, gz)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(lambda: self.get_accel() + self.get_gyro(), rate_hz, count)
+
     # Get temperature
     def get_temperature(self):
         temp = self.get_temperature_adc()
@@ -239,42 +256,14 @@ class MPU6886:
     # Get direction
     # Return up (z max), down (z min), right (x max), left (x min), front (y max), back (y min)
     def get_direction(self):
-        x, y, z = self.get_accel()
-        THRESHOLD = 0.3
-
-        if x > THRESHOLD and x > y and x > z:
-            return "Right"
-        elif x < -THRESHOLD and x < y and x < z:
-            return "Left"
-
-        elif y > THRESHOLD and y > x and y > z:
-            return "Front"
-        elif y < -THRESHOLD and y < x and y < z:
-            return "Back"
-
-        elif z > THRESHOLD and z > x and z > y:
-            return "Up"
-        elif z < -THRESHOLD and z < x and z < y:
-            return "Down"
-        
-        else:
-            return "Unknow"
+        return self.motion.update(self.get_accel()).direction
 
     # Get sensor is vibration or not
-    # Time sleep between 2 measure depends on data rate
+    # Each call reads one sample (no sleep), vibration is over the last 3 samples at least 0.1 s apart
+    # False until 3 such samples are read (call again, at least every second)
     # Return true if is vibration
     def is_vibration(self):
-        values1 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values2 = list(self.get_accel())
-        sleep(0.1)  # wait new sample
-        values3 = list(self.get_accel())
-
-        delta = 0
-        for i in range(3):
-            delta += abs(values2[i] - values1[i]) + abs(values3[i] - values2[i])
-
-        return delta > 0.5
+        return self.motion.poll(self.get_accel).is_vibration()
 
 #-------------------------- Example --------------------------
 
@@ -153,6 +153,8 @@ class OLED128x64:
         self.width = 128
         self.height = 64
         self.pages = int(self.height / 8)
+        self.__frame = bytearray(1 + self.width * self.pages)     # Data mode byte + frame, reused
+        self.__frame[0] = OLED_DATA_MODE
         self.image = Image.new('1', (self.width, self.height))
         self.canvas = ImageDraw.Draw(self.image) # this is a "draw" object for preparing display contents
 
@@ -174,9 +176,9 @@ class OLED128x64:
         data = [OLED_COMMAND_MODE, command]
         self.__i2c.i2c_write_data(self.__address, data)
 
-    def __send_frame(self, frame):
-        for i in range(0, len(frame), 31):
-            self.__i2c.i2c_write_block_data(self.__address, OLED_DATA_MODE, list(frame[i:i+31]))
+    # Send frame buffer (data mode byte + whole frame) in one transfer
+    def __send_frame(self):
+        self.__i2c.i2c_write_data(self.__address, self.__frame)
 
     #--------------------------------------------------------------------------------------------------#
 
@@ -284,7 +286,8 @@ class OLED128x64:
         # Send image frame to oled
         pix = list(self.image.getdata())
         step = self.width * 8
-        buf = []
+        buf = self.__frame
+        k = 1
         for y in range(0, self.pages * step, step):
             i = y + self.width - 1
             while i >= y:
@@ -293,13 +296,15 @@ class OLED128x64:
                     byte |= (pix[i + n] & 0x01) << 8
                     byte >>= 1
 
-                buf.append(byte)
+                buf[k] = byte
+                k += 1
                 i -= 1
 
-        self.__send_frame(buf) # push out the whole lot
+        self.__send_frame() # push out the whole lot
 
 #-------------------------- Example --------------------------
 
+"""
 i2c = I2C()
 oled = OLED128x64(i2c)
 # oled.disable_scroll()
@@ -316,4 +321,5 @@ oled.display_image('image/kaito_kid.png', 0, 0)
 time.sleep(3)
 oled.display_image('image/earth.png', 32, 0)
 time.sleep(3)
-oled.display_image('image/pi_logo.png', 32, 0)
\ No newline at end of file
+oled.display_image('image/pi_logo.png', 32, 0)
+"""
\ No newline at end of file
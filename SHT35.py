@@ -13,6 +13,7 @@
 #------------------------------------------------------------------------------------------------------#
 
 from i2c.i2c import I2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -85,6 +86,10 @@ class SHT35:
 
         return temp, humi
 
+    # Yield (t, (temp, humi)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.read_measure_data, rate_hz, count)
 
 #-------------------------- Example --------------------------
 
@@ -11,8 +11,12 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import asyncio
 from time import sleep
 from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+from hub.stream import paced
+from i2c.cache import RegisterCache
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -87,6 +91,9 @@ class TCS3472:
     def __init__(self, i2c, address = TCS3472_I2C_ADDRESS, it = TCS34725_INTEGRATIONTIME_700MS, gain = TCS34725_GAIN_1X):
         self.__i2c = i2c
         self.__address = address
+        # Shadow copy of config registers (ENABLE, ATIME, CONTROL...), status and data are volatile
+        volatile = [TCS34725_COMMAND_BIT | reg for reg in range(TCS34725_STATUS, TCS34725_BDATAH + 1)]
+        self.__registers = RegisterCache(i2c, address, volatile)
         self.set_integration_time(it)
         self.set_gain(gain)
         self.enable()
@@ -96,39 +103,49 @@ class TCS3472:
     # reg: register address
     # value: byte to write
     def __command(self, reg, value):
-        data = [TCS34725_COMMAND_BIT | reg, value]
-        self.__i2c.i2c_write_data(self.__address, data)
+        self.__registers.write(TCS34725_COMMAND_BIT | reg, value)
 
-    # Read byte from register
+    # Read byte from register (from cache if possible)
     # reg: register address
     def __read8(self, reg):
-        self.__i2c.i2c_write_data(self.__address, TCS34725_COMMAND_BIT | reg)
-        return self.__i2c.i2c_read_byte(self.__address)
+        return self.__registers.read(TCS34725_COMMAND_BIT | reg)
 
     # Read UINT16 (2 bytes) from register
     # reg: register address
     def __read16(self, reg):
-        self.__i2c.i2c_write_byte(self.__address, TCS34725_COMMAND_BIT | reg)
-        read = self.__i2c.i2c_read_data(self.__address, 2)
+        read = self.__i2c.i2c_read_write_data(self.__address, [TCS34725_COMMAND_BIT | reg], 2)
         return ((read[1] << 8) | read[0]) & 0xFFFF
 
-    # Set a delay for the integration time
-    # This is only necessary in the case where enabling and then immediately trying to read values back
-    # This is because setting AEN triggers an automatic integration, so if a read RGBC is
-    # performed too quickly, the data is not yet valid and all 0's are returned
-    def __delay(self):
+    # Integration time in seconds
+    def __delay_time(self):
         if self.__integ == TCS34725_INTEGRATIONTIME_2_4MS:
-            sleep(0.003)
+            return 0.003
         elif self.__integ == TCS34725_INTEGRATIONTIME_24MS:
-            sleep(0.024)
+            return 0.024
         elif self.__integ == TCS34725_INTEGRATIONTIME_50MS:
-            sleep(0.050)
+            return 0.050
         elif self.__integ == TCS34725_INTEGRATIONTIME_101MS:
-            sleep(0.101)
+            return 0.101
         elif self.__integ == TCS34725_INTEGRATIONTIME_154MS:
-            sleep(0.154)
+            return 0.154
         elif self.__integ == TCS34725_INTEGRATIONTIME_700MS:
-            sleep(0.700)
+            return 0.700
+        return 0
+
+    # Set a delay for the integration time
+    # This is only necessary in the case where enabling and then immediately trying to read values back
+    # This is because setting AEN triggers an automatic integration, so if a read RGBC is
+    # performed too quickly, the data is not yet valid and all 0's are returned
+    def __delay(self):
+        sleep(self.__delay_time())
+
+    # Read r, g, b, c channels
+    # 4 channels are read in one transaction
+    def __read_rgbc(self):
+        transaction = self.__i2c.i2c_transaction(self.__address)
+        for reg in [TCS34725_RDATAL, TCS34725_GDATAL, TCS34725_BDATAL, TCS34725_CDATAL]:
+            transaction.write_read([TCS34725_COMMAND_BIT | reg], 2)
+        return [((read[1] << 8) | read[0]) & 0xFFFF for read in transaction.execute()]
 
     #--------------------------------------------------------------------------------------------------#
 
@@ -167,13 +184,24 @@ class TCS3472:
     # Wait for measurement and convertation
     # Retur r, g, b, c raw data
     def get_raw_data(self):
-        r = self.__read16(TCS34725_RDATAL)
-        g = self.__read16(TCS34725_GDATAL)
-        b = self.__read16(TCS34725_BDATAL)
-        c = self.__read16(TCS34725_CDATAL)
+        r, g, b, c = self.__read_rgbc()
         self.__delay()
 
         return [r, g, b, c]
+
+    # Same as get_raw_data, but await the integration time instead of sleeping
+    # Bus reads run in the bus thread (AsyncI2C), never in the event loop
+    async def get_raw_data_async(self):
+        r, g, b, c = await AsyncI2C.of(self.__i2c).call(self.__read_rgbc)
+        await asyncio.sleep(self.__delay_time())
+
+        return [r, g, b, c]
+
+    # Yield (t, [r, g, b, c]) at rate_hz, paced on the monotonic clock
+    # Rate is limited by the integration time (get_raw_data waits for it)
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_raw_data, rate_hz, count)
     
     # Converts the raw R/G/B values to color temperature in degrees Kelvin
     # Return the results in degrees Kelvin
@@ -224,8 +252,12 @@ class TCS3472:
     # Read and Converts the raw R/G/B values to rgb
     # Return rgb value
     def get_rgb(self):
-        r, g, b, c = tcs3472.get_raw_data()
-        return tcs3472.calculate_rgb(r, g, b, c)
+        r, g, b, c = self.get_raw_data()
+        return self.calculate_rgb(r, g, b, c)
+
+    async def get_rgb_async(self):
+        r, g, b, c = await self.get_raw_data_async()
+        return self.calculate_rgb(r, g, b, c)
 
 
 #-------------------------- Example --------------------------
@@ -11,8 +11,11 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import asyncio
 from time import sleep
 from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -117,12 +120,13 @@ class TSL2561:
 
     # Get value from adc channel 0, 1
     # Return UINT16 value (channel 0, channel 1)
+    # 4 register reads are batched in one transaction
     def __get_chx_value(self):
-        ch0_l = self.__read_register(TSL2561_CHANNEL0_L)
-        ch0_h = self.__read_register(TSL2561_CHANNEL0_H)
-        ch1_l = self.__read_register(TSL2561_CHANNEL1_L)
-        ch1_h = self.__read_register(TSL2561_CHANNEL1_H)
-        
+        transaction = self.__i2c.i2c_transaction(self.__address)
+        for reg in [TSL2561_CHANNEL0_L, TSL2561_CHANNEL0_H, TSL2561_CHANNEL1_L, TSL2561_CHANNEL1_H]:
+            transaction.write_read([reg], 1)
+        ch0_l, ch0_h, ch1_l, ch1_h = [read[0] for read in transaction.execute()]
+
         # Convert to UINT16
         ch0 = ((ch0_h << 8) | ch0_l) & 0xFFFF
         ch1 = ((ch1_h << 8) | ch1_l) & 0xFFFF
@@ -213,14 +217,8 @@ class TSL2561:
 
     #--------------------------------------------------------------------------------------------------#
 
-    # Return raw value only, not convert to lux
-    # ch0: Full Spectrum channel value
-    # ch1: Infrared channel value
-    def get_raw_value(self):
-        self.__write_register(TSL2561_CONTROL, 0x03)      # Power up
-        sleep(0.015)                                      # Power up and wait > 13.7 ms for measure
-        ch0, ch1 = self.__get_chx_value()                 # Read add channel 0, 1
-        self.__write_register(TSL2561_CONTROL, 0x00)      # Power down
+    # Raw value to return
+    def __check_raw_value(self, ch0, ch1):
         if ch1 == 0:
             return 0, 0
         
@@ -230,14 +228,8 @@ class TSL2561:
 
         return ch0, ch1
 
-    # Get lux value
-    # Return lux value
-    # If error, return None
-    def get_lux(self):
-        self.__write_register(TSL2561_CONTROL, 0x03)      # Power up
-        sleep(0.015)                                      # Power up and wait > 13.7 ms for measure
-        ch0, ch1 = self.__get_chx_value()                 # Read add channel 0, 1
-        self.__write_register(TSL2561_CONTROL, 0x00)      # Power down
+    # Lux value to return
+    def __check_lux(self, ch0, ch1):
         if ch1 == 0:
             return 0
         
@@ -248,6 +240,54 @@ class TSL2561:
         lux = self.__calculation_lux(ch0, ch1, 0, 0, 0)   # T package, no gain, 13.7 ms
         return lux
 
+    # Power up, wait > 13.7 ms for measure, read channel 0, 1 and power down
+    def __measure(self):
+        self.__write_register(TSL2561_CONTROL, 0x03)      # Power up
+        sleep(0.015)                                      # Power up and wait > 13.7 ms for measure
+        ch0, ch1 = self.__get_chx_value()                 # Read add channel 0, 1
+        self.__write_register(TSL2561_CONTROL, 0x00)      # Power down
+        return ch0, ch1
+
+    # Same as __measure, but await the integration time instead of sleeping
+    # Bus calls run in the bus thread (AsyncI2C), never in the event loop
+    async def __measure_async(self):
+        aio = AsyncI2C.of(self.__i2c)
+        await aio.call(self.__write_register, TSL2561_CONTROL, 0x03)
+        await asyncio.sleep(0.015)
+        ch0, ch1 = await aio.call(self.__get_chx_value)
+        await aio.call(self.__write_register, TSL2561_CONTROL, 0x00)
+        return ch0, ch1
+
+    #--------------------------------------------------------------------------------------------------#
+
+    # Return raw value only, not convert to lux
+    # ch0: Full Spectrum channel value
+    # ch1: Infrared channel value
+    def get_raw_value(self):
+        ch0, ch1 = self.__measure()
+        return self.__check_raw_value(ch0, ch1)
+
+    async def get_raw_value_async(self):
+        ch0, ch1 = await self.__measure_async()
+        return self.__check_raw_value(ch0, ch1)
+
+    # Get lux value
+    # Return lux value
+    # If error, return None
+    def get_lux(self):
+        ch0, ch1 = self.__measure()
+        return self.__check_lux(ch0, ch1)
+
+    async def get_lux_async(self):
+        ch0, ch1 = await self.__measure_async()
+        return self.__check_lux(ch0, ch1)
+
+    # Yield (t, lux) at rate_hz, paced on the monotonic clock
+    # Rate is limited by the integration time (get_lux waits for it)
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_lux, rate_hz, count)
+
 #-------------------------- Example --------------------------
 
 """
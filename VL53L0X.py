@@ -12,8 +12,11 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import asyncio
 from time import sleep
 from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -43,8 +46,7 @@ class VL53L0X:
     
     # Read bytes from register
     def __read_reg(self, reg, size):
-        self.__i2c.i2c_write_byte(self.__address, reg)
-        return self.__i2c.i2c_read_data(self.__address, size)
+        return self.__i2c.i2c_read_write_data(self.__address, [reg], size)
 
     #--------------------------------------------------------------------------------------------------#
     
@@ -54,16 +56,38 @@ class VL53L0X:
     def get_device_id(self):
         return self.__read_reg(VL53L0X_REG_FINAL_RANGE_CONFIG_VCSEL_PERIOD, 3)
 
-    def read_range(self):
-        # Start measurement
+    # Start measurement
+    def __start_range(self):
         self.__write_reg(VL53L0X_REG_SYSRANGE_START, [0x01])
 
+    # Measurement is done
+    def __range_ready(self):
+        result = self.__read_reg(VL53L0X_REG_RESULT_RANGE_STATUS, 1)[0]
+        return result & 0x01
+
+    # Read result from register
+    # Return distance or None
+    def __read_range_result(self):
+        read = self.__read_reg(VL53L0X_REG_RESULT_RANGE_STATUS, 12)
+
+        # ambient = int.from_bytes([read[6], read[7]], byteorder = 'little', signed = False)
+        # signal_count = int.from_bytes([read[8], read[9]], byteorder = 'little', signed = False)
+        distance = int.from_bytes([read[10], read[11]], byteorder = 'big', signed = False)
+        status = (read[0] & 0x78) >> 3
+
+        if status == 0x0B:
+            return distance
+        else:
+            return None
+
+    def read_range(self):
+        self.__start_range()
+
         count = 0
         # Wait max timeout 1ss
         while count < 100:
             sleep(0.01)
-            result = self.__read_reg(VL53L0X_REG_RESULT_RANGE_STATUS, 1)[0]
-            if result & 0x01:
+            if self.__range_ready():
                 break
             count += 1
         
@@ -71,22 +95,35 @@ class VL53L0X:
         if count >= 100:
             return None
 
-        # Read result from register
-        read = self.__read_reg(VL53L0X_REG_RESULT_RANGE_STATUS, 12)
+        return self.__read_range_result()
 
-        # ambient = int.from_bytes([read[6], read[7]], byteorder = 'little', signed = False)
-        # signal_count = int.from_bytes([read[8], read[9]], byteorder = 'little', signed = False)
-        distance = int.from_bytes([read[10], read[11]], byteorder = 'big', signed = False)
-        status = (read[0] & 0x78) >> 3
+    # Same as read_range, but await between polls instead of sleeping
+    # Bus calls run in the bus thread (AsyncI2C), never in the event loop
+    async def read_range_async(self):
+        aio = AsyncI2C.of(self.__i2c)
+        await aio.call(self.__start_range)
 
-        if status == 0x0B:
-            return distance
-        else:
+        count = 0
+        while count < 100:
+            await asyncio.sleep(0.01)
+            if await aio.call(self.__range_ready):
+                break
+            count += 1
+
+        if count >= 100:
             return None
 
-#-------------------------- Example --------------------------
+        return await aio.call(self.__read_range_result)
 
+    # Yield (t, distance) at rate_hz, paced on the monotonic clock
+    # Rate is limited by the ranging time (read_range waits for it)
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.read_range, rate_hz, count)
+
+#-------------------------- Example --------------------------
 
+"""
 from time import sleep
 
 i2c = I2C()
@@ -95,3 +132,4 @@ while True:
     print(vl53l0x.read_range())
     print(" ")
     sleep(0.2)
+"""
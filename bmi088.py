@@ -1,8 +1,11 @@
 #!/usr/bin/python3
 # Author: LocHV
 
+import struct
 from time import sleep
 from i2c.i2c import I2C
+from hub.stream import paced
+from hub.motion import MotionAnalyzer
 
 BMI088_ACC_ADDRESS    =      0x19
 
@@ -123,6 +126,8 @@ class BMI088(object):
         self.devAddrGyro = BMI088_GYRO_ADDRESS
         self.accRange = 0
         self.gyroRange = 0
+        self.buf = bytearray(6)     # Reused by getAcceleration/ getGyroscope
+        self.motion = MotionAnalyzer()  # Updated by get_direction/ is_vibration
 
         self.setAccScaleRange(RANGE_6G)
         self.setAccOutputDataRate(ODR_100)
@@ -218,11 +223,9 @@ class BMI088(object):
 
 
     def getAcceleration(self) :
-        buf = self.read(ACC, BMI088_ACC_X_LSB, 6)
+        self.readInto(ACC, BMI088_ACC_X_LSB, self.buf)
 
-        ax = int.from_bytes([buf[0], buf[1]], byteorder = 'little', signed = True)
-        ay = int.from_bytes([buf[2], buf[3]], byteorder = 'little', signed = True)
-        az = int.from_bytes([buf[4], buf[5]], byteorder = 'little', signed = True)
+        ax, ay, az = struct.unpack_from('<hhh', self.buf)
         
         x = self.accRange * ax / 32768
         y = self.accRange * ay / 32768
@@ -230,6 +233,17 @@ class BMI088(object):
 
         return x,y,z
 
+    # Convert a block of raw accel samples to g in one operation (numpy)
+    # raw: bytes of N samples, 6 bytes each as read from ACC_X_LSB (x, y, z little endian)
+    # Return float array (N, 3), scale of current range
+    def decode_accel(self, raw):
+        import numpy
+
+        if len(raw) % 6:
+            raise ValueError("Raw data must be a multiple of 6 bytes")
+        samples = numpy.frombuffer(raw, dtype = '<i2').reshape(-1, 3)
+        return samples * (self.accRange / 32768)
+
     def getAccelerationX(self):
         ax = self.read16(ACC, BMI088_ACC_X_LSB)
 
@@ -255,11 +269,9 @@ class BMI088(object):
 
 
     def getGyroscope(self) :
-        buf = self.read(GYRO, BMI088_GYRO_RATE_X_LSB, 6)
+        self.readInto(GYRO, BMI088_GYRO_RATE_X_LSB, self.buf)
 
-        gx = int.from_bytes(buf[0:2], byteorder = 'little', signed = True)
-        gy = int.from_bytes(buf[2:4], byteorder = 'little', signed = True)
-        gz = int.from_bytes(buf[4:6], byteorder = 'little', signed = True)
+        gx, gy, gz = struct.unpack_from('<hhh', self.buf)
 
 
         x = self.gyroRange * gx / 32768
@@ -302,6 +314,11 @@ class BMI088(object):
         
         return (data / 8 + 23) 
 
+    # Yield (t, (ax, ay, az, gx, gy, gz)) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(lambda: self.getAcceleration() + self.getGyroscope(), rate_hz, count)
+
 
     def write8(self, dev, reg, val) :
         if (dev):
@@ -353,45 +370,26 @@ class BMI088(object):
         buf = self.i2c.i2c_read_block_data(addr,reg,len)
         return buf
 
+    # Read len(buf) bytes into buf (bytearray), no new list
+    def readInto(self, dev, reg, buf):
+        if (dev):
+            addr = self.devAddrGyro
+        else:
+            addr = self.devAddrAcc
+
+        return self.i2c.i2c_read_block_into(addr,reg,buf)
+
     # Get direction
     # Return up (z max), down (z min), right (x max), left (x min), front (y max), back (y min)
     def get_direction(self):
-        x, y, z = self.getAcceleration()
-        THRESHOLD = 0.3
-
-        if x > THRESHOLD and x > y and x > z:
-            return "Right"
-        elif x < -THRESHOLD and x < y and x < z:
-            return "Left"
-
-        elif y > THRESHOLD and y > x and y > z:
-            return "Front"
-        elif y < -THRESHOLD and y < x and y < z:
-            return "Back"
-
-        elif z > THRESHOLD and z > x and z > y:
-            return "Up"
-        elif z < -THRESHOLD and z < x and z < y:
-            return "Down"
-        
-        else:
-            return "Unknow"
+        return self.motion.update(self.getAcceleration()).direction
 
     # Get sensor is vibration or not
-    # Time sleep between 2 measure depends on data rate
+    # Each call reads one sample (no sleep), vibration is over the last 3 samples at least 0.1 s apart
+    # False until 3 such samples are read (call again, at least every second)
     # Return true if is vibration
     def is_vibration(self):
-        values1 = list(self.getAcceleration())
-        sleep(0.1)  # wait new sample
-        values2 = list(self.getAcceleration())
-        sleep(0.1)  # wait new sample
-        values3 = list(self.getAcceleration())
-
-        delta = 0
-        for i in range(3):
-            delta += abs(values2[i] - values1[i]) + abs(values3[i] - values2[i])
-
-        return delta > 0.5
+        return self.motion.poll(self.getAcceleration).is_vibration()
 
 """
 i2c = I2C()
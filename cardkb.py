@@ -12,6 +12,7 @@
 #------------------------------------------------------------------------------------------------------#
 
 from i2c.i2c import I2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -33,6 +34,11 @@ class CARDKB:
         # read 1 byte from keyborad
         read = self.__i2c.i2c_read_data(self.__address, 1)
         return chr(read[0])
+
+    # Yield (t, key) at rate_hz, paced on the monotonic clock ('\0' when no key)
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_key, rate_hz, count)
     
 #-------------------------- Example --------------------------
 
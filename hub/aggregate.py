@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+#
+# aggregate.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Decimation and aggregation stages
+# Each stage takes a stream of (t, value) (see hub/stream.py) and yields a slower stream.
+# State is a few numbers per channel, the raw history is never stored
+# value: a number or a tuple of numbers (ex (ax, ay, az)), samples with None are skipped
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import math
+from collections import namedtuple
+
+#------------------------------------------------------------------------------------------------------#
+
+# Statistics of one channel over a window
+Aggregate = namedtuple("Aggregate", ["count", "min", "mean", "max", "rms"])
+
+#------------------------------------------------------------------------------------------------------#
+
+# Value as tuple, None if the sample is not valid
+def _values(value):
+    if isinstance(value, (tuple, list)):
+        return None if None in value else value
+    return None if value is None else (value,)
+
+# Output with the same shape as the input (number or tuple)
+def _shape(values, scalar):
+    return values[0] if scalar else tuple(values)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Box decimation: mean of every factor samples
+# Output time is the time of the last sample of the block
+def decimate_box(stream, factor):
+    if factor < 1:
+        raise ValueError("Factor must be >= 1")
+    sums = None
+    count = 0
+    for t, value in stream:
+        values = _values(value)
+        if values is None:
+            continue
+        if sums is None:
+            sums = [0.0] * len(values)
+            scalar = not isinstance(value, (tuple, list))
+        for i, v in enumerate(values):
+            sums[i] += v
+        count += 1
+        if count == factor:
+            yield t, _shape([s / factor for s in sums], scalar)
+            sums = [0.0] * len(sums)
+            count = 0
+
+# CIC decimation (order integrators, decimation, order combs), better alias rejection than box
+# Values are scaled to integers (scale) so integrators are exact on long runs (no float drift)
+# First order outputs are the filter warm-up, they are not yielded
+def decimate_cic(stream, factor, order = 3, scale = 1000000):
+    if factor < 1 or order < 1:
+        raise ValueError("Factor and order must be >= 1")
+    gain = scale * factor ** order
+    integrators = None
+    combs = None
+    count = 0
+    outputs = 0
+    for t, value in stream:
+        values = _values(value)
+        if values is None:
+            continue
+        if integrators is None:
+            integrators = [[0] * order for v in values]
+            combs = [[0] * order for v in values]
+            scalar = not isinstance(value, (tuple, list))
+
+        for channel, v in enumerate(values):
+            stages = integrators[channel]
+            x = int(round(v * scale))
+            for i in range(order):
+                x += stages[i]
+                stages[i] = x
+
+        count += 1
+        if count < factor:
+            continue
+        count = 0
+
+        out = []
+        for channel in range(len(values)):
+            y = integrators[channel][-1]
+            delays = combs[channel]
+            for i in range(order):
+                y, delays[i] = y - delays[i], y
+            out.append(y / gain)
+        outputs += 1
+        if outputs > order:
+            yield t, _shape(out, scalar)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Running min/ mean/ max/ RMS over tumbling windows of period seconds
+# Yield (t of window start, Aggregate or tuple of Aggregate per channel)
+# The last (partial) window is yielded when the stream ends
+def window_stats(stream, period):
+    if period <= 0:
+        raise ValueError("Period must be positive")
+    start = None
+    scalar = False
+    count = 0
+    sums = []
+    squares = []
+    lows = []
+    highs = []
+
+    def window():
+        return start, _shape([Aggregate(count, lows[i], sums[i] / count, highs[i], math.sqrt(squares[i] / count)) for i in range(len(sums))], scalar)
+
+    for t, value in stream:
+        values = _values(value)
+        if values is None:
+            continue
+
+        if start is None or t >= start + period:
+            if count:
+                yield window()
+            # Windows stay aligned to the first one
+            start = t if start is None else start + period * int((t - start) / period)
+            scalar = not isinstance(value, (tuple, list))
+            count = 0
+            sums = [0.0] * len(values)
+            squares = [0.0] * len(values)
+            lows = [math.inf] * len(values)
+            highs = [-math.inf] * len(values)
+
+        count += 1
+        for i, v in enumerate(values):
+            sums[i] += v
+            squares[i] += v * v
+            if v < lows[i]:
+                lows[i] = v
+            if v > highs[i]:
+                highs[i] = v
+
+    if count:
+        yield window()
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from hub.stream import pipeline
+
+adxl345 = ADXL345(I2C())
+
+# 400 Hz -> 50 Hz with CIC, then 1 s statistics for the dashboard
+stream = pipeline(adxl345.stream(400),
+                  lambda s: decimate_cic(s, 8),
+                  lambda s: window_stats(s, 1.0))
+for t, (x, y, z) in stream:
+    print("%.0f z min %.3f mean %.3f max %.3f rms %.3f" % (t, z.min, z.mean, z.max, z.rms))
+"""
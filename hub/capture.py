@@ -0,0 +1,302 @@
+#!/usr/bin/python3
+#
+# capture.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Columnar capture file
+# Samples are written in fixed-size chunks, a chunk has the time of its first sample, a
+# timestamp column and one column per channel. Chunk i is at a fixed offset, so the chunk
+# headers are the sparse time index: the reader memory-maps the file, finds a time with two
+# binary searches and returns numpy views of the columns
+# Times are on the monotonic clock (same as the scheduler and streams), the header keeps the
+# wall-clock time of monotonic 0 (epoch): unix time of a sample is t + epoch. A wall clock step
+# (NTP, date) during a capture does not move the times
+# Values are stored in host byte order (little endian on Raspberry Pi and PC)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import mmap
+import os
+import struct
+import time
+from array import array
+
+#------------------------------------------------------------------------------------------------------#
+
+CAPTURE_MAGIC                           = b"I2CCAP\x00\x00"
+CAPTURE_VERSION                         = 1
+
+# File header: magic, version, typecode, channels, samples per chunk, chunk size (bytes), epoch
+# epoch: unix time of time 0 of the file (0.0 in files without it, their times are unix times)
+FILE_HEADER                             = struct.Struct("<8sHcxIIId")
+NAMES_OFFSET                            = 32
+HEADER_SIZE                             = 512
+
+# Chunk header: number of samples, time of first sample, time of last sample
+CHUNK_HEADER                            = struct.Struct("<I4xdd8x")
+CHUNK_FIRST_OFFSET                      = 8
+
+DEFAULT_CHUNK_SAMPLES                   = 4096
+
+#------------------------------------------------------------------------------------------------------#
+
+# Size of a chunk, multiple of 8 so timestamps stay aligned
+def _chunk_size(width, chunk_samples, itemsize):
+    size = CHUNK_HEADER.size + chunk_samples * 8 + width * chunk_samples * itemsize
+    return (size + 7) & ~7
+
+def _read_header(data, path):
+    magic, version, typecode, width, chunk_samples, chunk_size, epoch = FILE_HEADER.unpack_from(data, 0)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        raise ValueError("%s is not a capture file" % path)
+    names = bytes(data[NAMES_OFFSET:HEADER_SIZE]).rstrip(b"\x00").decode()
+    channels = tuple(names.split(",")) if names else ()
+    if len(channels) != width:
+        raise ValueError("%s has a bad channel list" % path)
+    return typecode.decode(), channels, chunk_samples, chunk_size, epoch
+
+#------------------------------------------------------------------------------------------------------#
+
+# Append samples to a capture file
+# An existing file is continued (channels and typecode must match), after a reboot too: times of
+# this writer are moved by the change of epoch, so they follow the samples already in the file
+# Times never go backwards in the file (the index is sorted): a sample before the last one is
+# written at the time of the last one and counted in steps
+# typecode: array type of values, ex 'f' (float32), 'd', 'h' (raw 16 bit)
+# clock, wall_clock: time functions (replace for simulation)
+class CaptureWriter:
+    def __init__(self, path, channels, typecode = 'f', chunk_samples = DEFAULT_CHUNK_SAMPLES,
+                 clock = time.monotonic, wall_clock = time.time):
+        self.path = path
+        self.channels = tuple(channels)
+        self.typecode = typecode
+        self.chunk_samples = chunk_samples
+        self.count = 0                  # Samples written by this writer
+        self.steps = 0                  # Samples before the last one (clock step), written at its time
+        self.clock = clock
+        self.epoch = wall_clock() - clock()
+        self.__shift = 0.0              # File time - clock time
+
+        width = len(self.channels)
+        self.__times = array('d', [0.0]) * chunk_samples
+        self.__columns = [array(typecode, [0]) * chunk_samples for i in range(width)]
+        self.__fill = 0                 # Samples in current chunk
+        self.__dirty = False
+        self.__last_t = None            # Time of last sample in file
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self.__open_existing()
+        else:
+            self.__create()
+
+    def __create(self):
+        names = ",".join(self.channels).encode()
+        if NAMES_OFFSET + len(names) > HEADER_SIZE:
+            raise ValueError("Channel names are too long")
+        self.chunk_size = _chunk_size(len(self.channels), self.chunk_samples, self.__columns[0].itemsize if self.channels else 1)
+
+        self.__file = open(self.path, "w+b")
+        header = bytearray(HEADER_SIZE)
+        FILE_HEADER.pack_into(header, 0, CAPTURE_MAGIC, CAPTURE_VERSION, self.typecode.encode(), len(self.channels), self.chunk_samples, self.chunk_size, self.epoch)
+        header[NAMES_OFFSET:NAMES_OFFSET + len(names)] = names
+        self.__file.write(header)
+        self.__offset = HEADER_SIZE     # Offset of current chunk
+
+    # Continue a file, a partial last chunk is loaded and completed
+    def __open_existing(self):
+        self.__file = open(self.path, "r+b")
+        header = self.__file.read(HEADER_SIZE)
+        typecode, channels, chunk_samples, chunk_size, epoch = _read_header(header, self.path)
+        if channels != self.channels or typecode != self.typecode:
+            raise ValueError("%s has channels %s (%s)" % (self.path, channels, typecode))
+        # Clock of this boot on the time line of the file
+        self.__shift = self.epoch - epoch
+        self.epoch = epoch
+        self.chunk_samples = chunk_samples
+        self.chunk_size = chunk_size
+        self.__times = array('d', [0.0]) * chunk_samples
+        self.__columns = [array(typecode, [0]) * chunk_samples for i in range(len(channels))]
+
+        chunks = (os.path.getsize(self.path) - HEADER_SIZE) // chunk_size
+        self.__offset = HEADER_SIZE + chunks * chunk_size
+        if chunks == 0:
+            return
+
+        last = HEADER_SIZE + (chunks - 1) * chunk_size
+        self.__file.seek(last)
+        chunk = self.__file.read(chunk_size)
+        count, first, self.__last_t = CHUNK_HEADER.unpack_from(chunk, 0)
+        if count < chunk_samples:
+            offset = CHUNK_HEADER.size
+            self.__times = array('d', chunk[offset:offset + chunk_samples * 8])
+            offset += chunk_samples * 8
+            itemsize = self.__columns[0].itemsize if channels else 1
+            for i in range(len(channels)):
+                self.__columns[i] = array(typecode, chunk[offset:offset + chunk_samples * itemsize])
+                offset += chunk_samples * itemsize
+            self.__fill = count
+            self.__offset = last
+
+    #--------------------------------------------------------------------------#
+
+    # Append one sample, O(1) (a full chunk is written with one write)
+    # values: tuple of channel values (or one value for one channel)
+    # t: time of sample on clock (time.monotonic), default now
+    def append(self, values, t = None):
+        if t is None:
+            t = self.clock()
+        if not isinstance(values, (tuple, list)):
+            values = (values,)
+        t += self.__shift
+        if self.__last_t is not None and t < self.__last_t:
+            self.steps += 1
+            t = self.__last_t
+        self.__last_t = t
+
+        n = self.__fill
+        self.__times[n] = t
+        for column, value in zip(self.__columns, values):
+            column[n] = value
+        self.__fill = n + 1
+        self.__dirty = True
+        self.count += 1
+
+        if self.__fill == self.chunk_samples:
+            self.__write_chunk()
+            self.__offset += self.chunk_size
+            self.__fill = 0
+            self.__dirty = False
+
+    # Sink of a driver read (scheduler, stream tee)
+    def sink(self, t, value):
+        self.append(value, t)
+
+    def __write_chunk(self):
+        fill = self.__fill
+        header = CHUNK_HEADER.pack(fill, self.__times[0], self.__times[fill - 1])
+        self.__file.seek(self.__offset)
+        self.__file.write(header)
+        self.__file.write(memoryview(self.__times))
+        for column in self.__columns:
+            self.__file.write(memoryview(column))
+        padding = self.chunk_size - (self.__file.tell() - self.__offset)
+        if padding:
+            self.__file.write(bytes(padding))
+
+    # Write the partial chunk (readers see the samples), it is completed by next writes
+    def flush(self):
+        if self.__dirty:
+            self.__write_chunk()
+            self.__dirty = False
+        self.__file.flush()
+
+    def close(self):
+        self.flush()
+        self.__file.close()
+
+#------------------------------------------------------------------------------------------------------#
+
+# Read a capture file (numpy)
+# Unix time of a sample is t + epoch
+class CaptureReader:
+    def __init__(self, path):
+        import numpy
+        self.__np = numpy
+
+        self.path = path
+        with open(path, "rb") as file:
+            self.__mm = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        self.typecode, self.channels, self.chunk_samples, self.chunk_size, self.epoch = _read_header(self.__mm, path)
+        self.dtype = numpy.dtype(self.typecode)
+
+        self.chunks = (len(self.__mm) - HEADER_SIZE) // self.chunk_size
+        self.count = 0
+        if self.chunks:
+            last = CHUNK_HEADER.unpack_from(self.__mm, HEADER_SIZE + (self.chunks - 1) * self.chunk_size)[0]
+            self.count = (self.chunks - 1) * self.chunk_samples + last
+
+        # Sparse time index: first time of each chunk, strided view of the chunk headers
+        if self.chunks == 0:
+            self.index = numpy.empty(0, dtype = numpy.float64)
+        else:
+            self.index = numpy.ndarray((self.chunks,), dtype = numpy.float64, buffer = self.__mm,
+                                       offset = HEADER_SIZE + CHUNK_FIRST_OFFSET, strides = (self.chunk_size,))
+
+    def __len__(self):
+        return self.count
+
+    # Views of chunk i
+    # Return (times (n,), {channel: values (n,)})
+    def chunk(self, i):
+        numpy = self.__np
+        offset = HEADER_SIZE + i * self.chunk_size
+        count = CHUNK_HEADER.unpack_from(self.__mm, offset)[0]
+        offset += CHUNK_HEADER.size
+        times = numpy.frombuffer(self.__mm, dtype = numpy.float64, count = count, offset = offset)
+        offset += self.chunk_samples * 8
+        columns = {}
+        for name in self.channels:
+            columns[name] = numpy.frombuffer(self.__mm, dtype = self.dtype, count = count, offset = offset)
+            offset += self.chunk_samples * self.dtype.itemsize
+        return times, columns
+
+    # Index of the first sample with time >= t, O(log n)
+    def seek(self, t):
+        if self.count == 0:
+            return 0
+        i = max(int(self.__np.searchsorted(self.index, t, side = "right")) - 1, 0)
+        times, columns = self.chunk(i)
+        j = int(self.__np.searchsorted(times, t, side = "left"))
+        return i * self.chunk_samples + j
+
+    # Views of samples start - stop (index), one (times, columns) per chunk, no copy
+    def iter_range(self, start, stop):
+        stop = min(stop, self.count)
+        while start < stop:
+            i, j = divmod(start, self.chunk_samples)
+            end = min(stop - i * self.chunk_samples, self.chunk_samples)
+            times, columns = self.chunk(i)
+            yield times[j:end], {name: values[j:end] for name, values in columns.items()}
+            start = i * self.chunk_samples + end
+
+    # Samples with t0 <= time < t1
+    # Return (times, {channel: values}), views if in one chunk, else concatenated
+    def read_time(self, t0, t1):
+        parts = list(self.iter_range(self.seek(t0), self.seek(t1)))
+        if len(parts) == 1:
+            return parts[0]
+        numpy = self.__np
+        if not parts:
+            return numpy.empty(0), {name: numpy.empty(0, dtype = self.dtype) for name in self.channels}
+        times = numpy.concatenate([part[0] for part in parts])
+        return times, {name: numpy.concatenate([part[1][name] for part in parts]) for name in self.channels}
+
+    # Views still used keep the mapping until they are released
+    def close(self):
+        self.index = None
+        try:
+            self.__mm.close()
+        except BufferError:
+            pass
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from hub.scheduler import RateScheduler
+
+writer = CaptureWriter("adxl345.cap", ("ax", "ay", "az"))
+scheduler = RateScheduler()
+scheduler.add(ADXL345(I2C()), "get_accel", 1 / 800, sink = writer.sink)
+scheduler.run(duration = 3 * 3600)
+writer.close()
+
+reader = CaptureReader("adxl345.cap")
+start = reader.index[0]
+times, columns = reader.read_time(start + 600, start + 601)     # Second 600, no full scan
+print(time.ctime(times[0] + reader.epoch), len(times), columns["az"].mean())
+"""
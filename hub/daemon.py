@@ -0,0 +1,501 @@
+#!/usr/bin/python3
+#
+# daemon.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Sensor hub daemon
+# The only owner of the buses: drivers are created from a config, polled by one scheduler per
+# bus, and samples are served to local clients over a Unix socket with a binary framing.
+# Every channel is read once for all clients (subscribers share the scheduled read, concurrent
+# on-demand requests share one bus read)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import importlib
+import json
+import logging
+import math
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from i2c.pool import BusPool
+from i2c.trace import BusTracer
+from hub.metrics import MetricsExporter
+from hub.scheduler import RateScheduler
+from hub.shm import ShmPublisher
+
+#------------------------------------------------------------------------------------------------------#
+
+# Frame: type, flags, channel id, payload length, then payload
+FRAME                                   = struct.Struct("<BBHI")
+
+# Frame types
+MSG_LIST                                = 1     # Client: list channels, reply payload is JSON
+MSG_SUBSCRIBE                           = 2     # Client: push every sample of channel
+MSG_UNSUBSCRIBE                         = 3
+MSG_GET                                 = 4     # Client: one sample of channel (latest, or read on demand)
+MSG_SAMPLE                              = 5     # Server: payload is time + values (float64)
+MSG_ERROR                               = 6     # Server: payload is UTF-8 text
+
+# Frame flags
+FLAG_REPLY                              = 0x01  # Reply of a request (not a pushed sample)
+
+# Max frames queued to a slow client, later samples are dropped
+CLIENT_QUEUE_SIZE                       = 1024
+
+DEFAULT_SOCKET                          = "/tmp/sensor-hub.sock"
+
+# Name of the shared-memory ring of a channel (hub/shm.py), ex "hub.accel" in /dev/shm
+SHM_NAME                                = "hub.%s"
+
+_log = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------------------------------#
+
+# One value as float: None -> NaN, a character (ex CARDKB key) -> its code, not a number -> NaN
+def _to_float(value):
+    if value is None:
+        return math.nan
+    if isinstance(value, str) and len(value) == 1:
+        return float(ord(value))
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+# Flatten driver result to floats
+def _to_floats(value):
+    if isinstance(value, (tuple, list)):
+        return [_to_float(v) for v in value]
+    return [_to_float(value)]
+
+def encode_frame(msg_type, channel, payload = b"", flags = 0):
+    return FRAME.pack(msg_type, flags, channel, len(payload)) + payload
+
+def encode_sample(channel, t, value, flags = 0):
+    values = _to_floats(value)
+    return encode_frame(MSG_SAMPLE, channel, struct.pack("<%dd" % (len(values) + 1), t, *values), flags)
+
+def decode_sample(payload):
+    values = struct.unpack("<%dd" % (len(payload) // 8), payload)
+    return values[0], values[1:]
+
+# Read exactly size bytes, None when the peer closed
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        try:
+            chunk = sock.recv(size - len(data))
+        except ConnectionResetError:
+            return None         # Peer closed with unread samples
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+# Read one frame
+# Return (type, flags, channel, payload) or None when the peer closed
+def read_frame(sock):
+    header = _recv_exact(sock, FRAME.size)
+    if header is None:
+        return None
+    msg_type, flags, channel, length = FRAME.unpack(header)
+    payload = _recv_exact(sock, length) if length else b""
+    if payload is None:
+        return None
+    return msg_type, flags, channel, payload
+
+# Load config from JSON file
+# {
+#   "socket": "/tmp/sensor-hub.sock",
+#   "metrics_port": 9105,
+#   "channels": [
+#     {"name": "accel", "module": "ADXL345", "class": "ADXL345", "method": "get_accel", "rate": 200, "values": ["ax", "ay", "az"], "shm": 4096},
+#     {"name": "pressure", "module": "BMP280", "class": "BMP280", "method": "get_pressure", "rate": 0, "max_age": 0.5},
+#     {"name": "light", "module": "TSL2561", "class": "TSL2561", "method": "get_lux", "rate": 5, "bus": 3, "kwargs": {"address": 57}}
+#   ]
+# }
+# rate: Hz, 0 = read only on request; max_age: on request, reuse a sample younger than max_age seconds
+# metrics_port: optional Prometheus endpoint (hub/metrics.py); values: optional names of values
+# shm: optional capacity of a shared-memory ring of the channel (SHM_NAME), a channel of many values needs values
+def load_config(path):
+    with open(path) as file:
+        return json.load(file)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Named channel, one driver method
+class Channel:
+    def __init__(self, channel_id, name, read, bus, rate, max_age, bus_lock):
+        self.id = channel_id
+        self.name = name
+        self.bus = bus
+        self.rate = rate
+        self.max_age = max_age
+        self.subscribers = set()
+        self.latest = None          # (t, value)
+        self.reads = 0              # Bus reads
+        self.requests = 0           # Requests of clients (GET)
+        self.errors = 0             # Failed reads
+        self.last_error = None
+        self.ring = None            # ShmPublisher while the hub runs
+        self.__read = read
+        self.__bus_lock = bus_lock
+        self.__cond = threading.Condition()
+        self.__reading = False
+        self.__read_error = None    # Error of the last on-demand read, raised to its waiters
+        self.__failing = False      # Scheduled reads are failing (logged once)
+
+    # Read the driver (bus lock held), publish to subscribers
+    # The ring has one producer: it is written under the bus lock (scheduled and on-demand reads)
+    # A failure is counted in errors and raised
+    def read(self):
+        try:
+            with self.__bus_lock:
+                t = time.monotonic()
+                value = self.__read()
+                if self.ring is not None:
+                    self.ring.publish(_to_floats(value), t)
+            self.reads += 1
+            self.publish(t, value)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = repr(e)
+            raise
+        return t, value
+
+    # Scheduled read, a failing channel does not stop the other channels of the bus
+    # Errors are counted (stats), the first of a series is logged
+    def poll(self):
+        try:
+            self.read()
+        except Exception:
+            if not self.__failing:
+                _log.exception("Channel %s read failed, next errors are only counted", self.name)
+            self.__failing = True
+            return
+        if self.__failing:
+            _log.info("Channel %s read again after %d errors", self.name, self.errors)
+            self.__failing = False
+
+    # New sample: keep it and push one encoded frame to all subscribers
+    def publish(self, t, value):
+        self.latest = (t, value)
+        if self.subscribers:
+            frame = encode_sample(self.id, t, value)
+            for client in list(self.subscribers):
+                client.send(frame)
+
+    # Sample for a request
+    # Scheduled channel: latest sample. On demand: fresh read, shared by concurrent requests,
+    # a failed read raises its error in all of them
+    def get(self):
+        self.requests += 1
+        if self.rate > 0 and self.latest is not None:
+            return self.latest
+
+        with self.__cond:
+            latest = self.latest
+            if latest is not None and time.monotonic() - latest[0] <= self.max_age:
+                return latest
+            if self.__reading:
+                # Another client is reading, wait for its result
+                while self.__reading:
+                    self.__cond.wait()
+                if self.__read_error is not None:
+                    raise self.__read_error
+                return self.latest
+            self.__reading = True
+
+        error = None
+        try:
+            return self.read()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            with self.__cond:
+                self.__reading = False
+                self.__read_error = error
+                self.__cond.notify_all()
+
+    def info(self):
+        return {"id": self.id, "name": self.name, "bus": self.bus, "rate": self.rate}
+
+#------------------------------------------------------------------------------------------------------#
+
+# Connection of a client, samples are sent by a writer thread from a bounded queue
+class _ClientHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.hub = self.server.hub
+        self.channels = set()
+        self.dropped = 0
+        self.__queue = queue.Queue(CLIENT_QUEUE_SIZE)
+        self.__writer = threading.Thread(target = self.__write_loop, daemon = True)
+        self.__writer.start()
+
+    def send(self, frame):
+        try:
+            self.__queue.put_nowait(frame)
+        except queue.Full:
+            self.dropped += 1
+
+    def __write_loop(self):
+        while True:
+            frame = self.__queue.get()
+            if frame is None:
+                return
+            try:
+                self.request.sendall(frame)
+            except OSError:
+                return
+
+    def handle(self):
+        while True:
+            frame = read_frame(self.request)
+            if frame is None:
+                return
+            msg_type, flags, channel_id, payload = frame
+
+            if msg_type == MSG_LIST:
+                info = [channel.info() for channel in self.hub.channels]
+                self.send(encode_frame(MSG_LIST, 0, json.dumps(info).encode(), FLAG_REPLY))
+                continue
+
+            channel = self.hub.channels[channel_id] if channel_id < len(self.hub.channels) else None
+            if channel is None:
+                self.send(encode_frame(MSG_ERROR, channel_id, b"Unknown channel", FLAG_REPLY))
+            elif msg_type == MSG_SUBSCRIBE:
+                channel.subscribers.add(self)
+                self.channels.add(channel)
+            elif msg_type == MSG_UNSUBSCRIBE:
+                channel.subscribers.discard(self)
+                self.channels.discard(channel)
+            elif msg_type == MSG_GET:
+                try:
+                    t, value = channel.get()
+                    self.send(encode_sample(channel.id, t, value, FLAG_REPLY))
+                except Exception as e:
+                    self.send(encode_frame(MSG_ERROR, channel.id, str(e).encode(), FLAG_REPLY))
+            else:
+                self.send(encode_frame(MSG_ERROR, channel_id, b"Unknown request", FLAG_REPLY))
+
+    def finish(self):
+        for channel in self.channels:
+            channel.subscribers.discard(self)
+        self.__queue.put(None)
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+#------------------------------------------------------------------------------------------------------#
+
+class SensorHub:
+    # config: dict (see load_config)
+    # pool: BusPool, default opens I2C of the buses in config
+    def __init__(self, config, pool = None):
+        self.config = config
+        self.pool = pool if pool is not None else BusPool()
+        self.socket_path = config.get("socket", DEFAULT_SOCKET)
+        self.channels = []
+        self.schedulers = {}        # bus -> RateScheduler
+        self.__rings = {}           # channel -> (names of values, capacity)
+        self.__bus_locks = {}
+        self.__drivers = {}
+        self.__threads = []
+        self.__server = None
+        self.metrics = None         # MetricsExporter if config has "metrics_port"
+
+        for entry in config["channels"]:
+            self.__add_channel(entry)
+
+    # One driver object per (bus, module, class, arguments), shared by its channels
+    def __driver(self, bus, entry):
+        kwargs = entry.get("kwargs", {})
+        key = (bus, entry["module"], entry["class"], json.dumps(kwargs, sort_keys = True))
+        driver = self.__drivers.get(key)
+        if driver is None:
+            cls = getattr(importlib.import_module(entry["module"]), entry["class"])
+            driver = self.__drivers[key] = cls(self.pool.get(bus), **kwargs)
+        return driver
+
+    def __add_channel(self, entry):
+        bus = entry.get("bus", 1)
+        driver = self.__driver(bus, entry)
+        method = getattr(driver, entry["method"])
+        args = entry.get("args", [])
+        read = (lambda: method(*args)) if args else method
+
+        lock = self.__bus_locks.setdefault(bus, threading.Lock())
+        channel = Channel(len(self.channels), entry["name"], read, bus, entry.get("rate", 0), entry.get("max_age", 0.0), lock)
+        self.channels.append(channel)
+        if entry.get("shm"):
+            self.__rings[channel] = (entry.get("values", [channel.name]), entry["shm"])
+
+        if channel.rate > 0:
+            scheduler = self.schedulers.setdefault(bus, RateScheduler())
+            scheduler.add(None, channel.poll, 1.0 / channel.rate, name = channel.name)
+
+    def channel(self, name):
+        for channel in self.channels:
+            if channel.name == name:
+                return channel
+        raise KeyError(name)
+
+    #--------------------------------------------------------------------------#
+
+    # Prometheus endpoint: last samples and bus statistics (a tracer on each bus)
+    def __start_metrics(self, port):
+        self.metrics = MetricsExporter(self.config.get("metrics_interval", 1.0))
+        self.metrics.add_hub(self, {entry["name"]: entry["values"] for entry in self.config["channels"] if "values" in entry})
+        for bus in self.__bus_locks:
+            tracer = BusTracer(self.pool.get(bus))
+            tracer.enable()
+            self.metrics.add_tracer(tracer, bus)
+        self.metrics.start(port)
+
+    # Start schedulers (one thread per bus), the socket server, the metrics endpoint and the rings
+    def start(self):
+        for channel, (names, capacity) in self.__rings.items():
+            channel.ring = ShmPublisher(SHM_NAME % channel.name, names, capacity)
+
+        if self.config.get("metrics_port"):
+            self.__start_metrics(self.config["metrics_port"])
+
+        for bus, scheduler in self.schedulers.items():
+            thread = threading.Thread(target = scheduler.run, name = "hub-bus-%d" % bus, daemon = True)
+            thread.start()
+            self.__threads.append(thread)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.__server = _Server(self.socket_path, _ClientHandler)
+        self.__server.hub = self
+        thread = threading.Thread(target = self.__server.serve_forever, name = "hub-server", daemon = True)
+        thread.start()
+        self.__threads.append(thread)
+
+    def stop(self):
+        for scheduler in self.schedulers.values():
+            scheduler.stop()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self.metrics is not None:
+            self.metrics.stop()
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+        # Rings stay in /dev/shm: readers go on with the next start
+        for channel in self.__rings:
+            ring, channel.ring = channel.ring, None
+            if ring is not None:
+                ring.close()
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    # Reads and requests of each channel
+    def stats(self):
+        return {channel.name: {"reads": channel.reads, "requests": channel.requests, "errors": channel.errors, "last_error": channel.last_error,
+                               "subscribers": len(channel.subscribers)} for channel in self.channels}
+
+#------------------------------------------------------------------------------------------------------#
+
+# Client of the daemon
+class HubClient:
+    def __init__(self, path = DEFAULT_SOCKET):
+        self.__sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.__sock.connect(path)
+        self.__pushed = []          # Samples received while waiting for a reply
+        self.__lock = threading.Lock()
+        self.channels = {info["name"]: info for info in json.loads(self.__request(MSG_LIST, 0)[3])}
+        self.__names = {info["id"]: name for name, info in self.channels.items()}
+
+    def __request(self, msg_type, channel):
+        with self.__lock:
+            self.__sock.sendall(encode_frame(msg_type, channel))
+            while True:
+                frame = read_frame(self.__sock)
+                if frame is None:
+                    raise ConnectionError("Hub closed the connection")
+                if frame[1] & FLAG_REPLY:
+                    if frame[0] == MSG_ERROR:
+                        raise OSError(frame[3].decode())
+                    return frame
+                self.__pushed.append(frame)
+
+    def __id(self, name):
+        return self.channels[name]["id"]
+
+    # One sample of channel
+    # Return (t, values)
+    def get(self, name):
+        return decode_sample(self.__request(MSG_GET, self.__id(name))[3])
+
+    def subscribe(self, name):
+        with self.__lock:
+            self.__sock.sendall(encode_frame(MSG_SUBSCRIBE, self.__id(name)))
+
+    def unsubscribe(self, name):
+        with self.__lock:
+            self.__sock.sendall(encode_frame(MSG_UNSUBSCRIBE, self.__id(name)))
+
+    # Yield (name, t, values) of subscribed channels
+    def samples(self):
+        while True:
+            if self.__pushed:
+                frame = self.__pushed.pop(0)
+            else:
+                frame = read_frame(self.__sock)
+                if frame is None:
+                    return
+            if frame[0] == MSG_SAMPLE:
+                t, values = decode_sample(frame[3])
+                yield self.__names[frame[2]], t, values
+
+    def close(self):
+        self.__sock.close()
+
+#------------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    SensorHub(load_config(sys.argv[1])).serve_forever()
+
+#-------------------------- Example --------------------------
+
+"""
+# Daemon: python3 -m hub.daemon hub.json
+
+# Client
+client = HubClient()
+print(client.get("pressure"))           # Many clients at once: one bus read
+client.subscribe("accel")
+for name, t, (ax, ay, az) in client.samples():
+    print(name, t, ax, ay, az)
+
+# Reader of the ring of "accel" (config "shm"), no socket
+from hub.shm import ShmSubscriber
+
+reader = ShmSubscriber("hub.accel")
+for sequence, t, (ax, ay, az) in reader.read():
+    print(sequence, t, ax, ay, az)
+"""
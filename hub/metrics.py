@@ -0,0 +1,224 @@
+#!/usr/bin/python3
+#
+# metrics.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Prometheus metrics endpoint (standard library only)
+# Last sample of every sensor and bus statistics (transactions/s, errors, latency quantiles
+# per address). A snapshot thread builds the text every interval, a scrape only sends the
+# last snapshot: it never touches the bus. The snapshot copies the tracer counters under the
+# tracer lock (a traced bus call may wait for that copy), all formatting is done outside it
+# An error while building a snapshot is logged, the previous snapshot is kept until the next one
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#------------------------------------------------------------------------------------------------------#
+
+DEFAULT_PORT                            = 9105
+DEFAULT_INTERVAL                        = 1.0
+CONTENT_TYPE                            = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency quantiles of each address
+QUANTILES                               = (0.5, 0.9, 0.99)
+
+_log = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Value of a sample as text, same conversion as the hub frames (hub/daemon.py _to_float):
+# None -> NaN, a character (ex CARDKB key) -> its code, not a number -> NaN
+def _number(value):
+    if isinstance(value, str) and len(value) == 1:
+        value = ord(value)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return "NaN"
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+def _labels(**labels):
+    return ",".join('%s="%s"' % (key, str(value).replace("\\", "\\\\").replace('"', '\\"')) for key, value in labels.items())
+
+def _address(address):
+    return "-" if address is None else "0x%02X" % address
+
+#------------------------------------------------------------------------------------------------------#
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.exporter.text()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+#------------------------------------------------------------------------------------------------------#
+
+class MetricsExporter:
+    # interval: seconds between snapshots
+    # prefix: prefix of metric names
+    def __init__(self, interval = DEFAULT_INTERVAL, prefix = "i2c"):
+        self.interval = interval
+        self.prefix = prefix
+        self.__sensors = {}         # name -> channels
+        self.__latest = {}          # name -> (t, value), written by the sampling threads
+        self.__hubs = []
+        self.__tracers = []         # (bus, BusTracer)
+        self.__previous = {}        # (bus, address) -> (time, count), for rates
+        self.__snapshot = b""
+        self.errors = 0             # Failed snapshots
+        self.last_error = None
+        self.__stop = threading.Event()
+        self.__threads = []
+        self.__server = None
+
+    # Register a sensor, return its sink(t, value) (scheduler, stream tee)
+    # channels: names of values, ex ("ax", "ay", "az"), default index of value
+    def sink(self, name, channels = None):
+        self.__sensors[name] = tuple(channels) if channels is not None else None
+
+        def sink(t, value):
+            self.__latest[name] = (t, value)
+        return sink
+
+    # Last sample of every channel of a SensorHub (hub/daemon.py)
+    # channels: dict channel name -> names of values
+    def add_hub(self, hub, channels = None):
+        self.__hubs.append((hub, channels or {}))
+
+    # Bus statistics of a BusTracer (enabled on the I2C of bus)
+    def add_tracer(self, tracer, bus = None):
+        if bus is None:
+            bus = getattr(tracer.i2c, "bus_number", 0)
+        self.__tracers.append((bus, tracer))
+
+    #--------------------------------------------------------------------------#
+
+    def __samples(self):
+        samples = [(name, self.__sensors[name], latest) for name, latest in list(self.__latest.items())]
+        for hub, channels in self.__hubs:
+            for channel in hub.channels:
+                if channel.latest is not None:
+                    samples.append((channel.name, channels.get(channel.name), channel.latest))
+        return samples
+
+    # Build the metrics text, called by the snapshot thread (or by hand without start)
+    def snapshot(self):
+        p = self.prefix
+        now = time.monotonic()
+
+        values = ["# HELP %s_sensor_value Last sample of sensor" % p, "# TYPE %s_sensor_value gauge" % p]
+        ages = ["# HELP %s_sensor_age_seconds Age of last sample" % p, "# TYPE %s_sensor_age_seconds gauge" % p]
+        for name, channels, (t, value) in self.__samples():
+            items = value if isinstance(value, (tuple, list)) else (value,)
+            for i, item in enumerate(items):
+                channel = channels[i] if channels is not None and i < len(channels) else i
+                values.append("%s_sensor_value{%s} %s" % (p, _labels(sensor = name, channel = channel), _number(item)))
+            ages.append("%s_sensor_age_seconds{%s} %s" % (p, _labels(sensor = name), _number(now - t)))
+
+        counts = ["# HELP %s_transactions_total Bus transactions" % p, "# TYPE %s_transactions_total counter" % p]
+        rates = ["# HELP %s_transactions_per_second Bus transactions per second" % p, "# TYPE %s_transactions_per_second gauge" % p]
+        errors = ["# HELP %s_errors_total Failed bus transactions" % p, "# TYPE %s_errors_total counter" % p]
+        latency = ["# HELP %s_latency_seconds Bus transaction latency" % p, "# TYPE %s_latency_seconds summary" % p]
+        for bus, tracer in self.__tracers:
+            for stats in tracer.address_stats():
+                labels = _labels(bus = bus, address = _address(stats.address))
+                key = (bus, stats.address)
+                previous = self.__previous.get(key)
+                rate = 0.0
+                if previous is not None and now > previous[0]:
+                    rate = max(stats.count - previous[1], 0) / (now - previous[0])
+                self.__previous[key] = (now, stats.count)
+
+                counts.append("%s_transactions_total{%s} %d" % (p, labels, stats.count))
+                rates.append("%s_transactions_per_second{%s} %s" % (p, labels, _number(rate)))
+                errors.append("%s_errors_total{%s} %d" % (p, labels, stats.errors))
+                for q in QUANTILES:
+                    latency.append("%s_latency_seconds{%s,quantile=\"%s\"} %s" % (p, labels, q, _number(stats.quantile(q))))
+                latency.append("%s_latency_seconds_sum{%s} %s" % (p, labels, _number(stats.total_ns * 1e-9)))
+                latency.append("%s_latency_seconds_count{%s} %d" % (p, labels, stats.count))
+
+        lines = values + ages + counts + rates + errors + latency
+        self.__snapshot = ("\n".join(lines) + "\n").encode()
+        return self.__snapshot
+
+    # Last snapshot (bytes), what a scrape returns
+    def text(self):
+        return self.__snapshot
+
+    def __snapshot_loop(self):
+        while not self.__stop.wait(self.interval):
+            try:
+                self.snapshot()
+            except Exception as error:
+                self.errors += 1
+                self.last_error = repr(error)
+                _log.exception("Metrics snapshot failed")
+
+    #--------------------------------------------------------------------------#
+
+    # Start the snapshot thread and the HTTP server (http://host:port/metrics)
+    def start(self, port = DEFAULT_PORT, host = ""):
+        self.__stop.clear()
+        self.snapshot()
+        self.__server = _Server((host, port), _MetricsHandler)
+        self.__server.exporter = self
+        self.port = self.__server.server_address[1]
+        for target, name in ((self.__snapshot_loop, "metrics-snapshot"), (self.__server.serve_forever, "metrics-http")):
+            thread = threading.Thread(target = target, name = name, daemon = True)
+            thread.start()
+            self.__threads.append(thread)
+
+    def stop(self):
+        self.__stop.set()
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from i2c.trace import BusTracer
+from ADXL345 import ADXL345
+from hub.scheduler import RateScheduler
+
+i2c = I2C()
+tracer = BusTracer(i2c)
+tracer.enable()
+
+metrics = MetricsExporter()
+metrics.add_tracer(tracer)
+scheduler = RateScheduler()
+scheduler.add(ADXL345(i2c), "get_accel", 1 / 200, sink = metrics.sink("adxl345", ("ax", "ay", "az")))
+
+metrics.start(9105)             # curl http://localhost:9105/metrics
+scheduler.run()
+"""
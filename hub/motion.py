@@ -0,0 +1,245 @@
+#!/usr/bin/python3
+#
+# motion.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Motion analytics of any accelerometer (ADXL345, BMI088, MPU6886, MMA7660FC)
+# Vibration, energy, orientation and tilt are updated on each sample in O(1), no sleep:
+# feed it from a stream, a scheduler sink or the driver reads, the answer is always current
+# Vibration compares samples at least interval apart (the 0.1 s of the old driver reads):
+# closer samples are skipped, so a fast caller or a fast stream gives the same answer
+# tilt_angles and directions do the same on (N, 3) arrays (numpy), ex a capture file or decode_accel
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import math
+import time
+from collections import deque
+
+#------------------------------------------------------------------------------------------------------#
+
+DIRECTION_THRESHOLD                     = 0.3   # g
+VIBRATION_THRESHOLD                     = 0.5   # g, sum of |delta| of x, y, z over the window
+VIBRATION_WINDOW                        = 3     # Samples
+VIBRATION_INTERVAL                      = 0.1   # s, min time between samples of the window
+VIBRATION_MAX_GAP                       = 1.0   # s, a longer gap starts a new window
+ENERGY_ALPHA                            = 0.05  # Smoothing of gravity and energy
+
+DIRECTIONS                              = ("Right", "Left", "Front", "Back", "Up", "Down", "Unknow")
+
+#------------------------------------------------------------------------------------------------------#
+
+# Direction of the axis with gravity
+# Return up (z max), down (z min), right (x max), left (x min), front (y max), back (y min)
+def direction(x, y, z, threshold = DIRECTION_THRESHOLD):
+    if x > threshold and x > y and x > z:
+        return "Right"
+    elif x < -threshold and x < y and x < z:
+        return "Left"
+
+    elif y > threshold and y > x and y > z:
+        return "Front"
+    elif y < -threshold and y < x and y < z:
+        return "Back"
+
+    elif z > threshold and z > x and z > y:
+        return "Up"
+    elif z < -threshold and z < x and z < y:
+        return "Down"
+
+    else:
+        return "Unknow"
+
+# Tilt angle of x, y, z axis in radian
+# https://wiki.dfrobot.com/How_to_Use_a_Three-Axis_Accelerometer_for_Tilt_Sensing
+def tilt(x, y, z):
+    if y == 0 and z == 0:
+        ax = math.pi / 2 if x >= 0 else -math.pi / 2
+    else:
+        ax = math.atan(x / math.sqrt(y * y + z * z))
+
+    if x == 0 and z == 0:
+        ay = math.pi / 2 if y >= 0 else -math.pi / 2
+    else:
+        ay = math.atan(y / math.sqrt(x * x + z * z))
+
+    az = 0 if z == 0 else math.atan(math.sqrt(x * x + y * y) / z)
+    return ax, ay, az
+
+#------------------------------------------------------------------------------------------------------#
+
+# Split (N, 3) acceleration (or (N, 6) with gyro after) into x, y, z columns
+def _columns(accel):
+    import numpy
+
+    accel = numpy.asarray(accel, dtype = numpy.float64)
+    if accel.ndim != 2 or accel.shape[1] < 3:
+        raise ValueError("Acceleration must be an (N, 3) array")
+    return numpy, accel[:, 0], accel[:, 1], accel[:, 2]
+
+# Tilt of a block of samples (numpy), same values as tilt() without a Python loop
+# arctan2 gives +-pi/2 when the denominator is 0, and atan(r / z) is arctan2(r * sign(z), |z|) (0 when z = 0)
+# accel: array (N, 3), unit g
+# Return (ax, ay, az) arrays (N,) in radian
+def tilt_angles(accel):
+    numpy, x, y, z = _columns(accel)
+    ryz = numpy.hypot(y, z)
+    rxz = numpy.hypot(x, z)
+    rxy = numpy.hypot(x, y)
+
+    # x = 0 on the axis of gravity: tilt() returns pi/2 where arctan2(0, 0) is 0
+    ax = numpy.where((ryz == 0) & (x == 0), math.pi / 2, numpy.arctan2(x, ryz))
+    ay = numpy.where((rxz == 0) & (y == 0), math.pi / 2, numpy.arctan2(y, rxz))
+    az = numpy.arctan2(rxy * numpy.sign(z), numpy.abs(z))
+    return ax, ay, az
+
+# Direction of a block of samples (numpy), same as direction()
+# Return array (N,) of index in DIRECTIONS, ex numpy.array(DIRECTIONS)[directions(accel)]
+def directions(accel, threshold = DIRECTION_THRESHOLD):
+    numpy, x, y, z = _columns(accel)
+    conditions = [(x > threshold) & (x > y) & (x > z),
+                  (x < -threshold) & (x < y) & (x < z),
+                  (y > threshold) & (y > x) & (y > z),
+                  (y < -threshold) & (y < x) & (y < z),
+                  (z > threshold) & (z > x) & (z > y),
+                  (z < -threshold) & (z < x) & (z < y)]
+    return numpy.select(conditions, numpy.arange(6, dtype = numpy.int8), len(DIRECTIONS) - 1).astype(numpy.int8)
+
+#------------------------------------------------------------------------------------------------------#
+
+class MotionAnalyzer:
+    # window: samples of the vibration test (3 = the 3 reads the drivers used to take)
+    # interval: min time between samples of the window, 0 = every sample with a time
+    # max_gap: samples further apart start a new window (a slow caller gets no vibration)
+    # alpha: smoothing of the gravity estimate and of the energy (per sample)
+    # clock: time of poll
+    def __init__(self, window = VIBRATION_WINDOW, vibration_threshold = VIBRATION_THRESHOLD,
+                 direction_threshold = DIRECTION_THRESHOLD, alpha = ENERGY_ALPHA,
+                 interval = VIBRATION_INTERVAL, max_gap = VIBRATION_MAX_GAP, clock = time.monotonic):
+        if window < 2:
+            raise ValueError("Window must be >= 2 samples")
+        self.vibration_threshold = vibration_threshold
+        self.direction_threshold = direction_threshold
+        self.alpha = alpha
+        self.interval = interval
+        self.max_gap = max_gap
+        self.clock = clock
+        self.__deltas = deque(maxlen = window - 1)
+        self.__last = None              # Last sample of the window
+        self.__last_t = None
+
+        self.count = 0
+        self.t = None
+        self.activity = 0.0             # Sum of |delta| over the window (g)
+        self.energy = 0.0               # Smoothed squared deviation from gravity (g^2)
+        self.gravity = None             # Low-passed acceleration (x, y, z)
+        self.direction = "Unknow"
+        self.tilt = (0.0, 0.0, 0.0)
+
+    # New sample, O(1)
+    # values: (ax, ay, az, ...) unit g, values after the first 3 are ignored (ex gyro)
+    # t: time of sample, a sample without time only updates orientation, gravity and energy
+    def update(self, values, t = None):
+        x, y, z = values[0], values[1], values[2]
+
+        if t is not None:
+            self.__update_window(x, y, z, t)
+
+        if self.gravity is None:
+            self.gravity = (x, y, z)
+        else:
+            gx, gy, gz = self.gravity
+            a = self.alpha
+            dx, dy, dz = x - gx, y - gy, z - gz
+            self.gravity = (gx + a * dx, gy + a * dy, gz + a * dz)
+            self.energy += a * (dx * dx + dy * dy + dz * dz - self.energy)
+
+        self.count += 1
+        self.t = t
+        self.direction = direction(x, y, z, self.direction_threshold)
+        self.tilt = tilt(x, y, z)
+        return self
+
+    # Vibration window, a sample closer than interval to the last one of the window is skipped
+    # 10 % margin: a stream at 1 / interval keeps all its samples despite jitter
+    def __update_window(self, x, y, z, t):
+        if self.__last_t is not None:
+            gap = t - self.__last_t
+            if gap < self.interval * 0.9:
+                return
+            if gap > self.max_gap:
+                self.__restart()
+
+        if self.__last is not None:
+            lx, ly, lz = self.__last
+            delta = abs(x - lx) + abs(y - ly) + abs(z - lz)
+            if len(self.__deltas) == self.__deltas.maxlen:
+                self.activity -= self.__deltas[0]
+            self.__deltas.append(delta)
+            self.activity = max(self.activity + delta, 0.0)
+        self.__last = (x, y, z)
+        self.__last_t = t
+
+    # Sink of a driver read (scheduler, stream tee)
+    def sink(self, t, value):
+        self.update(value, t)
+
+    # One read of a driver (ex is_vibration), timed with clock, no sleep
+    def poll(self, read):
+        return self.update(read(), self.clock())
+
+    # The vibration window has window samples
+    def is_full(self):
+        return len(self.__deltas) == self.__deltas.maxlen
+
+    # Vibration over the last window samples (False until the window has window samples)
+    def is_vibration(self):
+        return self.is_full() and self.activity > self.vibration_threshold
+
+    # Vibration window starts again (gravity and energy are kept)
+    def __restart(self):
+        self.__deltas.clear()
+        self.__last = None
+        self.__last_t = None
+        self.activity = 0.0
+
+    def reset(self):
+        self.__restart()
+        self.count = 0
+        self.t = None
+        self.energy = 0.0
+        self.gravity = None
+        self.direction = "Unknow"
+        self.tilt = (0.0, 0.0, 0.0)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Stage of a stream of (t, (ax, ay, az, ...))
+# Yield (t, analyzer) on each sample, read its attributes before the next one
+def analyze(stream, analyzer = None):
+    if analyzer is None:
+        analyzer = MotionAnalyzer()
+    for t, value in stream:
+        yield t, analyzer.update(value, t)
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+
+adxl345 = ADXL345(I2C())
+for t, motion in analyze(adxl345.stream(200)):
+    print(motion.direction, motion.is_vibration(), "%.4f" % motion.energy, motion.tilt)
+
+# A day of 200 Hz log (hub/capture.py), chunk by chunk
+import numpy
+from hub.capture import CaptureReader
+
+reader = CaptureReader("adxl345.cap")
+for times, columns in reader.iter_range(0, len(reader)):
+    ax, ay, az = tilt_angles(numpy.column_stack((columns["ax"], columns["ay"], columns["az"])))
+"""
@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+#
+# ringbuffer.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Fixed-capacity sample history
+# Samples are stored interleaved in an array (no Python object per sample) with a monotonic
+# timestamp each. Storage is mirrored (every sample is written twice, capacity apart), so the
+# last n samples are always contiguous and a window is a view, never a copy
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import bisect
+import time
+from array import array
+
+#------------------------------------------------------------------------------------------------------#
+
+# Channel sets of the drivers
+ACCEL                                   = ("ax", "ay", "az")
+GYRO                                    = ("gx", "gy", "gz")
+IMU                                     = ACCEL + GYRO
+TEMP_HUMI                               = ("temp", "humi")
+TEMP_PRESSURE                           = ("temp", "pressure")
+RGB                                     = ("r", "g", "b")
+RGBC                                    = ("r", "g", "b", "c")
+LUX                                     = ("lux",)
+DISTANCE                                = ("distance",)
+VOLTAGE                                 = ("volts",)
+
+#------------------------------------------------------------------------------------------------------#
+
+class RingBuffer:
+    # channels: names of values of a sample, ex ACCEL
+    # capacity: max number of samples kept
+    # typecode: array type of values, ex 'd' (float), 'f', 'h' (raw 16 bit adc), 'i'
+    def __init__(self, channels, capacity, typecode = 'd'):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self.typecode = typecode
+        self.total = 0                  # Number of samples appended since start
+
+        width = len(self.channels)
+        self.__width = width
+        self.__data = array(typecode, [0]) * (2 * capacity * width)
+        self.__times = array('d', [0.0]) * (2 * capacity)
+        self.__head = 0                 # Next write position (0 - capacity - 1)
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    # Index of channel name
+    def index(self, name):
+        return self.channels.index(name)
+
+    def clear(self):
+        self.__head = 0
+        self.__size = 0
+
+    #--------------------------------------------------------------------------#
+
+    # Append one sample, O(1)
+    # values: tuple of channel values (or one value for one channel)
+    # t: time of sample (time.monotonic), default now
+    def append(self, values, t = None):
+        if t is None:
+            t = time.monotonic()
+        if self.__width == 1 and not isinstance(values, (tuple, list)):
+            values = (values,)
+        if len(values) != self.__width:
+            raise ValueError("Sample has %d values, expected %d %s" % (len(values), self.__width, self.channels))
+
+        head = self.__head
+        mirror = head + self.capacity
+        self.__times[head] = t
+        self.__times[mirror] = t
+
+        data = self.__data
+        i = head * self.__width
+        j = mirror * self.__width
+        for value in values:
+            data[i] = value
+            data[j] = value
+            i += 1
+            j += 1
+
+        self.__head = head + 1 if head + 1 < self.capacity else 0
+        if self.__size < self.capacity:
+            self.__size += 1
+        self.total += 1
+
+    # Sink of a driver read, ex scheduler.add(adxl345, "get_accel", 1 / 200, sink = ring.sink)
+    def sink(self, t, value):
+        self.append(value, t)
+
+    #--------------------------------------------------------------------------#
+
+    # First position of the last n samples in mirrored storage
+    def __start(self, n):
+        if n is None or n > self.__size:
+            n = self.__size
+        return (self.__head - n) % self.capacity, n
+
+    # Last sample
+    # Return (t, tuple of values)
+    def latest(self):
+        if self.__size == 0:
+            raise IndexError("Ring buffer is empty")
+        start, n = self.__start(1)
+        i = start * self.__width
+        return self.__times[start], tuple(self.__data[i:i + self.__width])
+
+    # Timestamps of the last n samples (all samples if n is None), oldest first
+    # Return memoryview (no copy)
+    def timestamps(self, n = None):
+        start, n = self.__start(n)
+        return memoryview(self.__times)[start:start + n]
+
+    # Values of the last n samples, interleaved (sample 0 channel 0, sample 0 channel 1...)
+    # Return memoryview (no copy)
+    def values(self, n = None):
+        start, n = self.__start(n)
+        return memoryview(self.__data)[start * self.__width:(start + n) * self.__width]
+
+    # One channel of the last n samples
+    # Return strided memoryview (no copy)
+    def channel(self, name, n = None):
+        start, n = self.__start(n)
+        first = start * self.__width + self.index(name)
+        return memoryview(self.__data)[first:first + n * self.__width:self.__width]
+
+    # Number of samples with time >= t
+    def count_since(self, t):
+        times = self.timestamps()
+        return len(times) - bisect.bisect_left(times, t)
+
+    # numpy views of the last n samples (numpy is only needed here)
+    # Return (timestamps (n,), values (n, channels)), both share memory with the buffer
+    def numpy(self, n = None):
+        import numpy
+
+        start, n = self.__start(n)
+        times = numpy.frombuffer(self.__times, dtype = numpy.float64)[start:start + n]
+        data = numpy.frombuffer(self.__data, dtype = numpy.dtype(self.typecode)).reshape(-1, self.__width)[start:start + n]
+        return times, data
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from hub.scheduler import RateScheduler
+
+accel = RingBuffer(ACCEL, 200 * 60)         # Last minute at 200 Hz, constant memory
+scheduler = RateScheduler()
+scheduler.add(ADXL345(I2C()), "get_accel", 1 / 200, sink = accel.sink)
+scheduler.run(duration = 5)
+
+az = accel.channel("az", 200)               # Last second of z, no copy
+print(sum(az) / len(az))
+print(accel.count_since(accel.latest()[0] - 1.0))
+"""
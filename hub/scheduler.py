@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+#
+# scheduler.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Rate-group polling scheduler
+# Driver reads are registered with a period, tasks with the same period form a rate group.
+# Groups are released on absolute deadlines of a monotonic clock (no drift), their tasks run
+# back to back, and groups are phase shifted so slow groups fill the idle time of fast ones
+# A failing task or sink is counted and logged, it never stops the other tasks
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import heapq
+import logging
+import time
+
+#------------------------------------------------------------------------------------------------------#
+
+# Last part of the wait is busy wait, sleep() can wake up late
+SPIN_TIME                               = 0.0002
+
+_log = logging.getLogger(__name__)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Timing statistics of a task
+class TaskStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0             # Exceptions of the read or of the sink
+        self.last_error = None
+        self.overruns = 0           # Releases skipped because the group was still late
+        self.jitter_total = 0.0     # Start time - release time
+        self.jitter_max = 0.0
+        self.busy_total = 0.0       # Execution time
+        self.busy_max = 0.0
+
+    def add(self, jitter, busy):
+        self.count += 1
+        self.jitter_total += jitter
+        self.busy_total += busy
+        if jitter > self.jitter_max:
+            self.jitter_max = jitter
+        if busy > self.busy_max:
+            self.busy_max = busy
+
+    # Return dict, times in seconds
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "overruns": self.overruns,
+            "jitter_mean": self.jitter_total / self.count if self.count else 0.0,
+            "jitter_max": self.jitter_max,
+            "busy_mean": self.busy_total / self.count if self.count else 0.0,
+            "busy_max": self.busy_max,
+        }
+
+#------------------------------------------------------------------------------------------------------#
+
+# Registered read
+# sink(t, value) receives each result with its time (monotonic clock, start of the read)
+class Task:
+    def __init__(self, name, function, period, sink = None):
+        self.name = name
+        self.function = function
+        self.period = period
+        self.sink = sink
+        self.stats = TaskStats()
+
+# Tasks released together
+class RateGroup:
+    def __init__(self, period):
+        self.period = period
+        self.phase = 0.0
+        self.tasks = []
+        self.release = 0.0
+
+#------------------------------------------------------------------------------------------------------#
+
+class RateScheduler:
+    # clock, sleep: time functions (replace for simulation)
+    def __init__(self, clock = time.monotonic, sleep = time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.groups = {}
+        self.running = False
+        self.__added = False        # Group added, picked up by run
+
+    # Register a read
+    # driver, method: object and method name, ex (adxl345, "get_accel"), or driver None and method a function
+    # period: seconds, ex 1 / 200
+    # Return Task
+    def add(self, driver, method, period, sink = None, name = None):
+        if period <= 0:
+            raise ValueError("Period must be positive")
+        if driver is None:
+            function = method
+            name = name or getattr(method, "__qualname__", repr(method))
+        else:
+            function = getattr(driver, method)
+            name = name or "%s.%s" % (type(driver).__name__, method)
+
+        # Periods equal to the microsecond are one group
+        key = round(period * 1e6)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = RateGroup(period)
+            self.__added = True
+        task = Task(name, function, period, sink)
+        group.tasks.append(task)
+        self.__update_phases()
+        return task
+
+    def remove(self, task):
+        for key, group in list(self.groups.items()):
+            if task in group.tasks:
+                group.tasks.remove(task)
+                if not group.tasks:
+                    del self.groups[key]
+        self.__update_phases()
+
+    # Fastest group at phase 0, slower groups spread over the period of the fastest group,
+    # so they run in its idle time instead of all at the same release
+    def __update_phases(self):
+        groups = sorted(self.groups.values(), key = lambda group: group.period)
+        if not groups:
+            return
+        step = groups[0].period / len(groups)
+        for i, group in enumerate(groups):
+            group.phase = i * step
+
+    #--------------------------------------------------------------------------#
+
+    def tasks(self):
+        return [task for group in self.groups.values() for task in group.tasks]
+
+    # Estimated fraction of time the bus is busy (mean execution time / period)
+    # Over 1.0, the registered rates cannot be sustained
+    def load(self):
+        return sum(task.stats.busy_total / task.stats.count / task.period for task in self.tasks() if task.stats.count)
+
+    # Statistics of all tasks
+    # Return dict {name: {"count", "errors", "overruns", "jitter_mean", ...}}
+    def stats(self):
+        return {task.name: task.stats.as_dict() for task in self.tasks()}
+
+    def stop(self):
+        self.running = False
+
+    #--------------------------------------------------------------------------#
+
+    def __wait_until(self, deadline):
+        remain = deadline - self.clock()
+        if remain > SPIN_TIME:
+            self.sleep(remain - SPIN_TIME)
+        while self.clock() < deadline and self.running:
+            pass
+
+    # Bus errors (OSError) are expected (NACK...), they are logged at debug level
+    def __error(self, task, error):
+        task.stats.errors += 1
+        task.stats.last_error = repr(error)
+        if isinstance(error, OSError):
+            _log.debug("Task %s failed: %r", task.name, error)
+        else:
+            _log.exception("Task %s failed", task.name)
+
+    def __run_group(self, group):
+        for task in list(group.tasks):
+            start = self.clock()
+            try:
+                value = task.function()
+            except Exception as e:
+                self.__error(task, e)
+                continue
+            end = self.clock()
+            task.stats.add(start - group.release, end - start)
+            if task.sink is not None:
+                try:
+                    task.sink(start, value)
+                except Exception as e:
+                    self.__error(task, e)
+
+    # Groups not released yet (added before run or while running) start now, with their phase
+    def __schedule_added(self, heap, scheduled):
+        self.__added = False
+        now = self.clock()
+        for key, group in list(self.groups.items()):
+            if key not in scheduled:
+                group.release = now + group.phase
+                heapq.heappush(heap, (group.release, key))
+                scheduled.add(key)
+
+    # Run until stop() or duration (seconds) elapsed
+    # An exception of a read or a sink is counted as error of the task (see stats)
+    # Tasks can be added and removed while running (ex from a sink or another thread)
+    def run(self, duration = None):
+        start = self.clock()
+        end = start + duration if duration is not None else None
+
+        heap = []
+        scheduled = set()
+        self.__schedule_added(heap, scheduled)
+
+        self.running = True
+        try:
+            while self.running and heap:
+                if self.__added:
+                    self.__schedule_added(heap, scheduled)
+                release, key = heap[0]
+                if end is not None and release >= end:
+                    break
+                if release > self.clock():
+                    self.__wait_until(release)
+                    continue
+
+                heapq.heappop(heap)
+                group = self.groups.get(key)
+                if group is None:
+                    scheduled.discard(key)
+                    continue            # Removed while running
+                group.release = release
+                self.__run_group(group)
+
+                # Next release, skip releases whose period is already over (no burst to catch up),
+                # a release only a little late runs now
+                release += group.period
+                now = self.clock()
+                if now >= release + group.period:
+                    missed = int((now - release) / group.period)
+                    release += missed * group.period
+                    for task in group.tasks:
+                        task.stats.overruns += missed
+                heapq.heappush(heap, (release, key))
+        finally:
+            self.running = False
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from SHT35 import SHT35
+from TSL2561 import TSL2561
+
+i2c = I2C()
+scheduler = RateScheduler()
+scheduler.add(ADXL345(i2c), "get_accel", 1 / 200, sink = lambda t, value: print(t, value))
+scheduler.add(SHT35(i2c), "read_measure_data", 1.0, sink = lambda t, value: print(t, value))
+scheduler.add(TSL2561(i2c), "get_lux", 1 / 5, sink = lambda t, value: print(t, value))
+scheduler.run(duration = 10)
+
+print(scheduler.load())
+for name, stats in scheduler.stats().items():
+    print(name, stats)
+"""
@@ -0,0 +1,293 @@
+#!/usr/bin/python3
+#
+# shm.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Shared-memory sample ring
+# One process (the bus owner) publishes samples into a memory-mapped ring in /dev/shm,
+# other processes read them without pickling and without a lock. Every sample has a sequence
+# number, slots are guarded by the sequence (seqlock), so readers detect torn reads and overruns
+# Sequences in the file are native 32-bit words (one aligned store, no torn value on 32-bit ARM),
+# both sides count with Python ints and compare the low 32 bits
+# A file is never truncated while mapped (readers would get SIGBUS): a restarted writer with the
+# same layout goes on in the same file, another layout replaces the file (readers keep the old one)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import mmap
+import os
+import struct
+import time
+
+#------------------------------------------------------------------------------------------------------#
+
+SHM_DIR                                 = "/dev/shm"
+SHM_MAGIC                               = b"I2CSHM\x00\x00"
+SHM_VERSION                             = 2
+
+# Header (native byte order, like SEQ): magic, version, channels, capacity, slot size, wraps of sequence,
+# last published sequence
+HEADER                                  = struct.Struct("=8sIIIIII")
+HEADER_WRAPS_OFFSET                     = 24
+HEADER_SEQ_OFFSET                       = 28
+NAMES_OFFSET                            = 32
+NAMES_SIZE                              = 256
+SLOTS_OFFSET                            = NAMES_OFFSET + NAMES_SIZE
+
+# Slot: sequence (0 while written), padding, time, values
+# Native format: struct copies the word with one store, little-endian formats write byte by byte
+SEQ                                     = struct.Struct("I")
+SEQ_BITS                                = 32
+SEQ_MASK                                = (1 << SEQ_BITS) - 1
+SEQ_WRITING                             = 0
+SLOT_DATA_OFFSET                        = 8
+
+#------------------------------------------------------------------------------------------------------#
+
+def _path(name):
+    return os.path.join(SHM_DIR, name)
+
+# Struct of slot data (time + values)
+def _slot_struct(width):
+    return struct.Struct("<d%dd" % width)
+
+# Sequence after sequence, numbers with low 32 bits 0 (SEQ_WRITING) are not used
+def _next_sequence(sequence):
+    sequence += 1
+    if not sequence & SEQ_MASK:
+        sequence += 1
+    return sequence
+
+# Names of channels as stored in the file
+def _encode_names(channels):
+    names = ",".join(channels).encode()
+    if len(names) > NAMES_SIZE:
+        raise ValueError("Channel names are too long")
+    return names.ljust(NAMES_SIZE, b"\x00")
+
+#------------------------------------------------------------------------------------------------------#
+
+# Single producer
+# name: file name in /dev/shm, ex "adxl345"
+# channels: names of values, ex ("ax", "ay", "az")
+class ShmPublisher:
+    def __init__(self, name, channels, capacity):
+        self.name = name
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self.sequence = 0
+
+        self.__names = _encode_names(self.channels)
+        self.__data = _slot_struct(len(self.channels))
+        self.__slot_size = SLOT_DATA_OFFSET + self.__data.size
+        self.__size = SLOTS_OFFSET + capacity * self.__slot_size
+
+        self.__mm = self.__open_existing()
+        if self.__mm is None:
+            self.__mm = self.__create()
+
+    # Ring of a previous writer with the same layout: map it as it is and go on with its sequence
+    # Return None if there is no file or its layout is different
+    def __open_existing(self):
+        try:
+            fd = os.open(_path(self.name), os.O_RDWR)
+        except FileNotFoundError:
+            return None
+        try:
+            if os.fstat(fd).st_size < self.__size:
+                return None
+            mm = mmap.mmap(fd, self.__size)
+        finally:
+            os.close(fd)
+
+        magic, version, width, capacity, slot_size, wraps, sequence = HEADER.unpack_from(mm, 0)
+        names = bytes(mm[NAMES_OFFSET:NAMES_OFFSET + NAMES_SIZE])
+        if (magic, version, width, capacity, slot_size, names) != (SHM_MAGIC, SHM_VERSION, len(self.channels), self.capacity, self.__slot_size, self.__names):
+            mm.close()
+            return None
+        self.sequence = (wraps << SEQ_BITS) | SEQ.unpack_from(mm, HEADER_SEQ_OFFSET)[0]
+        return mm
+
+    # New ring, written under a temporary name and renamed: readers never see a partial header,
+    # readers of a replaced file keep their mapping
+    def __create(self):
+        path = _path(self.name)
+        temp = "%s.%d.tmp" % (path, os.getpid())
+        fd = os.open(temp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, self.__size)
+            mm = mmap.mmap(fd, self.__size)
+        finally:
+            os.close(fd)
+
+        HEADER.pack_into(mm, 0, SHM_MAGIC, SHM_VERSION, len(self.channels), self.capacity, self.__slot_size, 0, 0)
+        mm[NAMES_OFFSET:NAMES_OFFSET + NAMES_SIZE] = self.__names
+        os.rename(temp, path)
+        return mm
+
+    # Publish one sample
+    # values: tuple of channel values (or one value for one channel)
+    def publish(self, values, t = None):
+        if t is None:
+            t = time.monotonic()
+        if not isinstance(values, (tuple, list)):
+            values = (values,)
+
+        sequence = _next_sequence(self.sequence)
+        offset = SLOTS_OFFSET + (sequence % self.capacity) * self.__slot_size
+        mm = self.__mm
+        SEQ.pack_into(mm, offset, SEQ_WRITING)
+        self.__data.pack_into(mm, offset + SLOT_DATA_OFFSET, t, *values)
+        SEQ.pack_into(mm, offset, sequence & SEQ_MASK)
+        if sequence >> SEQ_BITS != self.sequence >> SEQ_BITS:
+            SEQ.pack_into(mm, HEADER_WRAPS_OFFSET, sequence >> SEQ_BITS)
+        SEQ.pack_into(mm, HEADER_SEQ_OFFSET, sequence & SEQ_MASK)
+        self.sequence = sequence
+
+    # Sink of a driver read (scheduler, stream tee)
+    def sink(self, t, value):
+        self.publish(value, t)
+
+    def close(self):
+        self.__mm.close()
+
+    # Remove the file (readers still mapped keep their memory)
+    # Keep it to let readers go on over a restart of the writer
+    def unlink(self):
+        try:
+            os.unlink(_path(self.name))
+        except FileNotFoundError:
+            pass
+
+#------------------------------------------------------------------------------------------------------#
+
+# One of many consumers, each has its own read position
+# start: "latest" (only new samples) or "oldest" (all samples still in the ring)
+class ShmSubscriber:
+    def __init__(self, name, start = "latest"):
+        self.name = name
+        with open(_path(name), "rb") as file:
+            self.__inode = os.fstat(file.fileno()).st_ino
+            self.__mm = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+
+        magic, version, width, capacity, slot_size, wraps, sequence = HEADER.unpack_from(self.__mm, 0)
+        if magic != SHM_MAGIC or version != SHM_VERSION:
+            raise ValueError("%s is not a sample ring" % name)
+        if len(self.__mm) < SLOTS_OFFSET + capacity * slot_size:
+            raise ValueError("%s is too small" % name)
+        names = bytes(self.__mm[NAMES_OFFSET:NAMES_OFFSET + NAMES_SIZE]).rstrip(b"\x00")
+        self.channels = tuple(names.decode().split(",")) if names else ()
+        self.capacity = capacity
+        self.__slot_size = slot_size
+        self.__data = _slot_struct(width)
+
+        self.overruns = 0       # Samples lost because the reader was too slow
+        sequence = self.__start_sequence()
+        if start == "oldest":
+            self.next = max(1, sequence - capacity + 1)
+        else:
+            self.next = _next_sequence(sequence)
+
+    # Full sequence of header, wraps read again if the low word wrapped meanwhile
+    def __start_sequence(self):
+        while True:
+            wraps = SEQ.unpack_from(self.__mm, HEADER_WRAPS_OFFSET)[0]
+            sequence = SEQ.unpack_from(self.__mm, HEADER_SEQ_OFFSET)[0]
+            if SEQ.unpack_from(self.__mm, HEADER_WRAPS_OFFSET)[0] == wraps:
+                return (wraps << SEQ_BITS) | sequence
+
+    # Last published sequence
+    # The header has its low 32 bits, the writer is never 2^32 samples ahead of the read position
+    def sequence(self):
+        previous = self.next - 1
+        return previous + ((SEQ.unpack_from(self.__mm, HEADER_SEQ_OFFSET)[0] - previous) & SEQ_MASK)
+
+    # The writer replaced the file (other layout), open a new subscriber to follow it
+    def replaced(self):
+        try:
+            return os.stat(_path(self.name)).st_ino != self.__inode
+        except FileNotFoundError:
+            return True
+
+    # Read slot of sequence
+    # Return (t, values) or None if the slot was overwritten
+    def __read_slot(self, sequence):
+        offset = SLOTS_OFFSET + (sequence % self.capacity) * self.__slot_size
+        mm = self.__mm
+        stored = sequence & SEQ_MASK
+        if SEQ.unpack_from(mm, offset)[0] != stored:
+            return None
+        data = self.__data.unpack_from(mm, offset + SLOT_DATA_OFFSET)
+        if SEQ.unpack_from(mm, offset)[0] != stored:
+            return None         # Written while reading
+        return data[0], data[1:]
+
+    # Read new samples since last call
+    # max_count: max number of samples returned, None = all
+    # Return list of (sequence, t, values)
+    def read(self, max_count = None):
+        samples = []
+        while max_count is None or len(samples) < max_count:
+            last = self.sequence()
+            if self.next > last:
+                break
+
+            # Reader is more than one ring behind
+            oldest = last - self.capacity + 1
+            if self.next < oldest:
+                self.overruns += oldest - self.next
+                self.next = oldest
+            if not self.next & SEQ_MASK:
+                self.next += 1              # Not used by the writer
+
+            sample = self.__read_slot(self.next)
+            if sample is None:
+                # Overwritten between header and slot read, skip it
+                self.overruns += 1
+                self.next = _next_sequence(self.next)
+                continue
+            samples.append((self.next, sample[0], sample[1]))
+            self.next = _next_sequence(self.next)
+        return samples
+
+    # Latest sample, does not move the read position
+    # Return (sequence, t, values) or None
+    def latest(self):
+        for i in range(3):
+            sequence = self.sequence()
+            if sequence <= 0:
+                return None
+            sample = self.__read_slot(sequence)
+            if sample is not None:
+                return sequence, sample[0], sample[1]
+        return None
+
+    def close(self):
+        self.__mm.close()
+
+#-------------------------- Example --------------------------
+
+"""
+# Sampler process (bus owner)
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from hub.scheduler import RateScheduler
+
+ring = ShmPublisher("adxl345", ("ax", "ay", "az"), 4096)
+scheduler = RateScheduler()
+scheduler.add(ADXL345(I2C()), "get_accel", 1 / 200, sink = ring.sink)
+scheduler.run()
+
+# Logger process
+import time
+
+reader = ShmSubscriber("adxl345")
+while True:
+    for sequence, t, (ax, ay, az) in reader.read():
+        print(sequence, t, ax, ay, az)
+    print("lost", reader.overruns)
+    time.sleep(0.1)
+"""
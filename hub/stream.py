@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+#
+# stream.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Sample streams
+# A stream is a generator of (t, value), t is time of the read on the monotonic clock.
+# Reads are paced on absolute deadlines (rate does not drift with read time), stages are
+# generators too, so a pipeline never builds a list
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import time
+
+#------------------------------------------------------------------------------------------------------#
+
+# Call read() at rate_hz and yield (t, value)
+# count: number of samples, None = forever
+# When a read is late by more than a period, missed samples are skipped (no burst to catch up)
+def paced(read, rate_hz, count = None, clock = time.monotonic, sleep = time.sleep):
+    if rate_hz <= 0:
+        raise ValueError("Rate must be positive")
+    period = 1.0 / rate_hz
+    release = clock()
+    n = 0
+    while count is None or n < count:
+        now = clock()
+        if release > now:
+            sleep(release - now)
+        t = clock()
+        yield t, read()
+        n += 1
+
+        release += period
+        late = clock() - release
+        if late > period:
+            release += int(late / period) * period
+
+#------------------------------------------------------------------------------------------------------#
+
+# Stages, each takes a stream and returns a stream
+
+# Apply function to values
+# Ex: magnitude = map_values(adxl345.stream(200), lambda v: math.sqrt(v[0]**2 + v[1]**2 + v[2]**2))
+def map_values(stream, function):
+    for t, value in stream:
+        yield t, function(value)
+
+# Keep samples where predicate(value) is true
+def filter_values(stream, predicate):
+    for t, value in stream:
+        if predicate(value):
+            yield t, value
+
+# Send each sample to sink(t, value) (ex RingBuffer.sink) and pass it on
+def tee(stream, sink):
+    for t, value in stream:
+        sink(t, value)
+        yield t, value
+
+# Stop after count samples (the stream is not read once more)
+def take(stream, count):
+    if count <= 0:
+        return
+    for n, sample in enumerate(stream, 1):
+        yield sample
+        if n >= count:
+            return
+
+# Chain stages, a stage is a function of a stream (use lambda or functools.partial for arguments)
+# Ex: pipeline(sht35.stream(1), lambda s: filter_values(s, lambda v: v[0] is not None), lambda s: tee(s, ring.sink))
+def pipeline(stream, *stages):
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+# Pull all samples of a stream (ex end of a pipeline that only feeds sinks)
+def drain(stream):
+    for sample in stream:
+        pass
+
+#-------------------------- Example --------------------------
+
+"""
+import math
+from i2c.i2c import I2C
+from ADXL345 import ADXL345
+from hub.ringbuffer import RingBuffer
+
+adxl345 = ADXL345(I2C())
+ring = RingBuffer(("g",), 1000)
+
+stream = pipeline(adxl345.stream(200, count = 2000),
+                  lambda s: map_values(s, lambda v: math.sqrt(v[0] ** 2 + v[1] ** 2 + v[2] ** 2)),
+                  lambda s: filter_values(s, lambda g: g > 1.5),
+                  lambda s: tee(s, ring.sink))
+for t, g in stream:
+    print("Shock %.2f g at %.3f" % (g, t))
+"""
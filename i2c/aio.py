@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+#
+# aio.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# asyncio front end of the I2C layer
+# Bus calls run in one worker thread (bus access stays serialized) and are awaited,
+# so the event loop is never blocked by the bus
+# Drivers keep the plain I2C object, their *_async methods run each bus segment with
+# AsyncI2C.of(i2c).call(...), in the worker thread of the AsyncI2C of that I2C object
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from i2c.transaction import I2CTransaction
+
+#------------------------------------------------------------------------------------------------------#
+
+# Async wrapper of I2C (or any object with the same methods, ex SimI2C, BusClient)
+# Every i2c_* method becomes a coroutine function with the same arguments
+# Ex: read = await aio.i2c_read_block_data(address, reg, 6)
+# The first AsyncI2C of an I2C object is attached to it (see of)
+class AsyncI2C:
+    def __init__(self, i2c, executor = None):
+        if isinstance(i2c, AsyncI2C):
+            raise TypeError("i2c is already an AsyncI2C")
+        self.i2c = i2c
+        self.__own_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "i2c")
+        self.__executor = executor
+        if getattr(i2c, "_aio", None) is None:
+            i2c._aio = self
+
+    # AsyncI2C of an I2C object (the one attached to it, created on first use)
+    # Drivers are given the I2C object (ex aio.i2c), not the AsyncI2C
+    @staticmethod
+    def of(i2c):
+        if isinstance(i2c, AsyncI2C):
+            raise TypeError("Drivers take the I2C object (aio.i2c), not the AsyncI2C")
+        aio = getattr(i2c, "_aio", None)
+        if aio is None:
+            aio = AsyncI2C(i2c)
+        return aio
+
+    # Run any blocking function (ex a driver method without async variant) in the bus thread
+    # Ex: values = await aio.call(sht35.read_measure_data)
+    async def call(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    # The method is looked up on each call (a tracer enabled later sees the calls)
+    def __getattr__(self, name):
+        method = getattr(self.i2c, name)
+        if not name.startswith("i2c_") or not callable(method):
+            return method
+
+        async def coroutine(*args, **kwargs):
+            return await self.call(getattr(self.i2c, name), *args, **kwargs)
+
+        setattr(self, name, coroutine)
+        return coroutine
+
+    # execute() of the transaction returns a coroutine
+    # Ex: reads = await aio.i2c_transaction(address).write_read([reg], 2).execute()
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+    # Stop the bus thread (only when created here)
+    def close(self):
+        if self.__own_executor:
+            self.__executor.shutdown(wait = True)
+
+#-------------------------- Example --------------------------
+
+"""
+import asyncio
+from i2c.i2c import I2C
+from input import LTC2497
+from TCS3472 import TCS3472
+from VL53L0X import VL53L0X
+
+# Drivers use the wrapped I2C, their *_async methods run the bus calls in the bus thread
+# of aio (same thread as aio.i2c_* calls) and await the conversion delays
+aio = AsyncI2C(I2C())
+ltc2497 = LTC2497(aio.i2c)
+tcs3472 = TCS3472(aio.i2c)
+vl53l0x = VL53L0X(aio.i2c)
+
+async def main():
+    while True:
+        volts, rgbc, distance = await asyncio.gather(ltc2497.get_adc_async(0), tcs3472.get_raw_data_async(), vl53l0x.read_range_async())
+        print(volts, rgbc, distance)
+
+asyncio.run(main())
+"""
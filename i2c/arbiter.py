@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+#
+# arbiter.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Thread-safe bus arbiter
+# Many threads share one I2C object. Each thread uses its own client, every I2C call
+# of a client is atomic, and waiting clients get the bus by priority
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import heapq
+import itertools
+import threading
+import time
+from i2c.transaction import I2CTransaction
+
+#------------------------------------------------------------------------------------------------------#
+
+# Priority, lower value gets the bus first
+PRIORITY_HIGH                           = 0     # Ex: IMU sampling
+PRIORITY_NORMAL                         = 10
+PRIORITY_LOW                            = 20    # Ex: display frame push
+
+#------------------------------------------------------------------------------------------------------#
+
+# Wait time statistics of a client
+class WaitStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, wait):
+        self.count += 1
+        self.total += wait
+        if wait > self.max:
+            self.max = wait
+
+    # Return dict of count, total/mean/max wait time in seconds
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+#------------------------------------------------------------------------------------------------------#
+
+# Client of the arbiter, used by drivers in place of the I2C object
+# Ex: imu = MPU6886(arbiter.client("imu", PRIORITY_HIGH))
+# Use "with client:" to hold the bus for several calls (lock is reentrant)
+class BusClient:
+    def __init__(self, arbiter, name, priority):
+        self.__arbiter = arbiter
+        self.name = name
+        self.priority = priority
+        self.wait_stats = WaitStats()
+
+    def __enter__(self):
+        self.__arbiter.acquire(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__arbiter.release()
+
+    # Wrap I2C methods with acquire/ release
+    # The method is looked up on each call (a tracer enabled later sees the calls)
+    def __getattr__(self, name):
+        method = getattr(self.__arbiter.i2c, name)
+        if not name.startswith("i2c_") or not callable(method):
+            return method
+
+        arbiter = self.__arbiter
+        def locked(*args, **kwargs):
+            arbiter.acquire(self)
+            try:
+                return getattr(arbiter.i2c, name)(*args, **kwargs)
+            finally:
+                arbiter.release()
+
+        setattr(self, name, locked)     # Cache, next call does not go through __getattr__
+        return locked
+
+    # Transaction is submitted with the lock held
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+#------------------------------------------------------------------------------------------------------#
+
+class BusArbiter:
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.clients = {}
+        self.__cond = threading.Condition()
+        self.__owner = None
+        self.__depth = 0
+        self.__waiting = []                 # Heap of (priority, order, thread id)
+        self.__order = itertools.count()
+
+    # Create (or get) client by name
+    def client(self, name, priority = PRIORITY_NORMAL):
+        if name not in self.clients:
+            self.clients[name] = BusClient(self, name, priority)
+        return self.clients[name]
+
+    # Wait until the bus is free and no higher priority client is waiting
+    def acquire(self, client):
+        me = threading.get_ident()
+        with self.__cond:
+            if self.__owner == me:
+                self.__depth += 1
+                return
+
+            start = time.monotonic()
+            if self.__owner is not None or self.__waiting:
+                entry = (client.priority, next(self.__order), me)
+                heapq.heappush(self.__waiting, entry)
+                while self.__owner is not None or self.__waiting[0] is not entry:
+                    self.__cond.wait()
+                heapq.heappop(self.__waiting)
+
+            self.__owner = me
+            self.__depth = 1
+            client.wait_stats.add(time.monotonic() - start)
+
+    def release(self):
+        with self.__cond:
+            if self.__owner != threading.get_ident():
+                raise RuntimeError("Release bus not owned by this thread")
+            self.__depth -= 1
+            if self.__depth == 0:
+                self.__owner = None
+                self.__cond.notify_all()
+
+    # Wait time statistics of all clients
+    # Return dict {name: {"count", "total", "mean", "max"}}
+    def stats(self):
+        return {name: client.wait_stats.as_dict() for name, client in self.clients.items()}
+
+#-------------------------- Example --------------------------
+
+"""
+import threading
+from i2c.i2c import I2C
+from MPU6886 import MPU6886
+from OLED128x64 import OLED128x64
+
+arbiter = BusArbiter(I2C())
+imu = MPU6886(arbiter.client("imu", PRIORITY_HIGH))
+oled = OLED128x64(arbiter.client("oled", PRIORITY_LOW))
+
+threading.Thread(target = lambda: [imu.get_accel() for i in range(1000)]).start()
+oled.display_image('image/earth.png', 32, 0)
+print(arbiter.stats())
+"""
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+#
+# cache.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Shadow register cache
+# Write-through copy of the 8 bit registers of one device, so read-modify-write of
+# configuration registers does not need a bus read
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+# Per-device register cache
+# Registers are read with SMBus "read byte data" and written with "write byte data"
+# (same as i2c_write_data(address, [reg, value]) on the wire)
+# volatile: registers changed by the device itself (status, data...), never cached
+# self_clearing: {reg: mask} bits the device clears after a write, they are not kept in cache
+class RegisterCache:
+    def __init__(self, i2c, address, volatile = None, self_clearing = None):
+        self.__i2c = i2c
+        self.address = address
+        self.volatile = set(volatile or [])
+        self.self_clearing = dict(self_clearing or {})
+        self.__values = {}
+        self.hits = 0
+        self.misses = 0
+
+    # Register value is in cache (a read does not need the bus)
+    def is_cached(self, reg):
+        return reg in self.__values
+
+    # Read register, from cache if possible
+    def read(self, reg):
+        if reg in self.__values:
+            self.hits += 1
+            return self.__values[reg]
+
+        self.misses += 1
+        value = self.__i2c.i2c_read_block_data(self.address, reg, 1)[0]
+        if reg not in self.volatile:
+            self.__values[reg] = value
+        return value
+
+    # Write register and update cache
+    def write(self, reg, value):
+        value &= 0xFF
+        self.__i2c.i2c_write_block_data(self.address, reg, [value])
+        if reg not in self.volatile:
+            self.__values[reg] = value & ~self.self_clearing.get(reg, 0)
+
+    # Read-modify-write
+    # Return new value
+    def update(self, reg, set_bits = 0, clr_bits = 0):
+        value = (self.read(reg) | set_bits) & ~clr_bits & 0xFF
+        self.write(reg, value)
+        return value
+
+    # Forget register (or all registers if reg is None)
+    # Call after the device is reset or changed by someone else
+    def invalidate(self, reg = None):
+        if reg is None:
+            self.__values.clear()
+        else:
+            self.__values.pop(reg, None)
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+
+i2c = I2C()
+cache = RegisterCache(i2c, 0x40, volatile = [0x00])
+cache.write(0x01, 0x04)
+cache.update(0x01, set_bits = 0x10)     # No bus read
+print(cache.hits, cache.misses)
+"""
@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+#
+# discovery.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Device discovery
+# Probe the known addresses of all buses in parallel, identify each device by its ID register
+# and cache the topology by bus fingerprint (set of present addresses), so a warm restart
+# only needs the presence scan
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import importlib
+import json
+import os
+
+#------------------------------------------------------------------------------------------------------#
+
+# Known device
+# name: device name
+# module, cls: driver to create, ex "bmi088", "BMI088"
+# address: slave address
+# id_regs: register(s) of ID, value is built from them (first register is MSB), None = presence only
+# id_values: accepted ID values (after id_mask)
+# extra: other addresses of the device, list of (address, id_regs, id_values)
+# address_arg: keyword of the address in driver constructor, None if driver has fixed address
+class Signature:
+    def __init__(self, name, module, cls, address, id_regs = None, id_values = None, id_mask = 0xFF, extra = (), address_arg = "address"):
+        self.name = name
+        self.module = module
+        self.cls = cls
+        self.address = address
+        self.id_regs = id_regs
+        self.id_values = id_values
+        self.id_mask = id_mask
+        self.extra = extra
+        self.address_arg = address_arg
+
+# Devices with ID register first, presence only devices are used when no ID matches
+# Order matters when many devices share an address (ex 0x29, 0x0F, 0x77)
+SIGNATURES = [
+    Signature("ADXL345",    "ADXL345",      "ADXL345",      0x53, [0x00], [0xE5]),
+    Signature("ADXL345",    "ADXL345",      "ADXL345",      0x1D, [0x00], [0xE5]),
+    Signature("BMP280",     "BMP280",       "BMP280",       0x77, [0xD0], [0x58]),
+    Signature("BMP280",     "BMP280",       "BMP280",       0x76, [0xD0], [0x58]),
+    Signature("MPU6886",    "MPU6886",      "MPU6886",      0x68, [0x75], [0x19]),
+    Signature("BMI088",     "bmi088",       "BMI088",       0x19, [0x00], [0x1E], extra = [(0x69, [0x00], [0x0F])], address_arg = None),
+    Signature("IOE",        "rgb_encoder",  "IOE",          0x18, [0xFB, 0xFA], [0xE26A], id_mask = 0xFFFF, address_arg = "i2c_addr"),
+    Signature("RGBEncoder", "rgb_encoder",  "RGBEncoder",   0x0F, [0xFB, 0xFA], [0xE26A], id_mask = 0xFFFF, address_arg = None),
+    Signature("VL53L0X",    "VL53L0X",      "VL53L0X",      0x29, [0xC0], [0xEE]),
+    Signature("TCS3472",    "TCS3472",      "TCS3472",      0x29, [0x92], [0x44, 0x4D]),
+    Signature("TSL2561",    "TSL2561",      "TSL2561",      0x29, [0x8A], [0x10, 0x50], id_mask = 0xF0),
+    Signature("TSL2561",    "TSL2561",      "TSL2561",      0x39, [0x8A], [0x10, 0x50], id_mask = 0xF0),
+    Signature("TSL2561",    "TSL2561",      "TSL2561",      0x49, [0x8A], [0x10, 0x50], id_mask = 0xF0),
+
+    Signature("LTC2497",            "input",                "LTC2497",          0x14),
+    Signature("LCD16x2",            "LCD16x2",              "LCD16x2",          0x3E),
+    Signature("OLED128x64",         "OLED128x64",           "OLED128x64",       0x3C),
+    Signature("PCA9685",            "output",               "PCA9685",          0x40),
+    Signature("SHT35",              "SHT35",                "SHT35",            0x45),
+    Signature("MMA7660FC",          "MMA7660FC",            "MMA7660FC",        0x4C),
+    Signature("MEGA328P",           "MEGA328P",             "MEGA328P",         0x52),
+    Signature("TouchSensor",        "touch_sensor",         "TouchSensor",      0x5A),
+    Signature("CARDKB",             "cardkb",               "CARDKB",           0x5F),
+    Signature("LedMatrix",          "led_matrix",           "LedMatrix",        0x65),
+    Signature("MotorDriver",        "motor_driver",         "MotorDriver",      0x0F),
+    Signature("WaterLevelSensor",   "water_level_sensor",   "WaterLevelSensor", 0x77, extra = [(0x78, None, None)], address_arg = None),
+]
+
+#------------------------------------------------------------------------------------------------------#
+
+# Address is present (ACK)
+# Same as i2cdetect: read byte in EEPROM ranges (a quick write can corrupt some EEPROM), quick write elsewhere
+def probe_address(i2c, address):
+    try:
+        if 0x30 <= address <= 0x37 or 0x50 <= address <= 0x5F:
+            i2c.i2c_read_byte(address)
+        else:
+            i2c.i2c_write_data(address, [])
+        return True
+    except OSError:
+        return False
+
+# ID value of registers, None if not readable
+def read_id(i2c, address, id_regs):
+    value = 0
+    try:
+        for reg in id_regs:
+            value = (value << 8) | i2c.i2c_read_block_data(address, reg, 1)[0]
+    except OSError:
+        return None
+    return value
+
+#------------------------------------------------------------------------------------------------------#
+
+# Discovery of devices on the buses of a pool
+# cache_path: JSON file of topologies {fingerprint: devices}, None to always probe IDs
+# Device: dict of "bus", "address", "name", "module", "class", "address_arg"
+class BusDiscovery:
+    def __init__(self, pool, cache_path = None, signatures = SIGNATURES):
+        self.pool = pool
+        self.cache_path = cache_path
+        self.signatures = signatures
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # All addresses to scan, sorted
+        addresses = set()
+        for sig in signatures:
+            addresses.add(sig.address)
+            addresses.update(extra[0] for extra in sig.extra)
+        self.addresses = sorted(addresses)
+
+    #--------------------------------------------------------------------------#
+
+    def __load_cache(self):
+        if self.cache_path is None or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def __save_cache(self, cache):
+        if self.cache_path is None:
+            return
+        path = self.cache_path + ".tmp"
+        with open(path, "w") as file:
+            json.dump(cache, file, indent = 2)
+        os.replace(path, self.cache_path)
+
+    # Fingerprint of a bus: bus number and present addresses
+    @staticmethod
+    def fingerprint(bus, present):
+        return "%d:%s" % (bus, ",".join("%02X" % address for address in present))
+
+    #--------------------------------------------------------------------------#
+
+    def __match(self, i2c, sig, present):
+        if sig.id_regs is not None:
+            value = read_id(i2c, sig.address, sig.id_regs)
+            if value is None or (value & sig.id_mask) not in sig.id_values:
+                return False
+        for address, id_regs, id_values in sig.extra:
+            if address not in present:
+                return False
+            if id_regs is not None and read_id(i2c, address, id_regs) not in id_values:
+                return False
+        return True
+
+    # Identify present devices by their ID registers
+    def __identify(self, bus, i2c, present):
+        devices = []
+        claimed = set()
+        for sig in self.signatures:
+            if sig.address not in present or sig.address in claimed:
+                continue
+            if not self.__match(i2c, sig, present):
+                continue
+            claimed.add(sig.address)
+            claimed.update(extra[0] for extra in sig.extra)
+            devices.append({
+                "bus": bus,
+                "address": sig.address,
+                "name": sig.name,
+                "module": sig.module,
+                "class": sig.cls,
+                "address_arg": sig.address_arg,
+            })
+        return sorted(devices, key = lambda device: device["address"])
+
+    # Scan one bus (runs in the worker thread of the bus)
+    # Return (fingerprint, devices, from cache)
+    def __scan_bus(self, i2c, bus, cache):
+        present = [address for address in self.addresses if probe_address(i2c, address)]
+        fingerprint = self.fingerprint(bus, present)
+        if fingerprint in cache:
+            return fingerprint, cache[fingerprint], True
+        return fingerprint, self.__identify(bus, i2c, present), False
+
+    # Scan buses in parallel (one worker thread per bus)
+    # Return list of devices
+    def scan(self, buses = (1,)):
+        cache = self.__load_cache()
+        futures = [self.pool.submit(bus, self.__scan_bus, bus, cache) for bus in buses]
+
+        devices = []
+        changed = False
+        for future in futures:
+            fingerprint, bus_devices, cached = future.result()
+            if cached:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+                cache[fingerprint] = bus_devices
+                changed = True
+            devices += bus_devices
+
+        if changed:
+            self.__save_cache(cache)
+        return devices
+
+    # Create driver of each device
+    # Return dict {(bus, address): driver}
+    def create_drivers(self, devices):
+        drivers = {}
+        for device in devices:
+            cls = getattr(importlib.import_module(device["module"]), device["class"])
+            kwargs = {}
+            if device["address_arg"] is not None:
+                kwargs[device["address_arg"]] = device["address"]
+            drivers[(device["bus"], device["address"])] = cls(self.pool.get(device["bus"]), **kwargs)
+        return drivers
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.pool import BusPool
+
+pool = BusPool()
+discovery = BusDiscovery(pool, cache_path = "topology.json")
+devices = discovery.scan(buses = [1, 3])
+for device in devices:
+    print("bus %d 0x%02X %s" % (device["bus"], device["address"], device["name"]))
+
+drivers = discovery.create_drivers(devices)
+print(drivers[(1, 0x53)].get_accel())
+"""
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 
+from ctypes import POINTER, c_char, cast
 from smbus2 import SMBus, i2c_msg
+from i2c.transaction import I2CTransaction, I2C_WRITE
 
 # https://smbus2.readthedocs.io/en/latest/
 # https://pypi.org/project/smbus2/
@@ -8,10 +10,52 @@ from smbus2 import SMBus, i2c_msg
 # sudo apt-get install -y i2c-tools
 # sudo i2cdetect -y 1
 
+# Max number of messages in one i2c_rdwr (I2C_RDWR_IOCTL_MAX_MSGS in kernel)
+I2C_RDWR_MAX_MSGS = 42
+
+# Max length of one message in i2c_rdwr (i2c-dev limit)
+I2C_RDWR_MAX_LEN = 8192
+
+# Flag of read message (I2C_M_RD in kernel)
+I2C_M_RD = 0x0001
+
+#------------------------------------------------------------------------------------------------------#
+
+# Message using the memory of a buffer (bytearray, memoryview, array...), no copy
+# Read message needs a writable buffer, read-only buffer (ex bytes) is copied for write message
+def _buffer_msg(address, buffer, flags = 0):
+    view = memoryview(buffer).cast("B")
+    if view.readonly:
+        if flags & I2C_M_RD:
+            raise TypeError("Read buffer must be writable")
+        data = (c_char * len(view)).from_buffer_copy(view)
+    else:
+        data = (c_char * len(view)).from_buffer(view)
+    msg = i2c_msg(addr = address, flags = flags, len = len(view), buf = cast(data, POINTER(c_char)))
+    msg._data = data       # Keep memory alive with the message
+    return msg
+
+# Write message from list of byte or any buffer
+def _write_msg(address, data):
+    if isinstance(data, (list, tuple, str)):
+        return i2c_msg.write(address, data)
+    return _buffer_msg(address, data)
+
+# Write then read into buffer with repeated start, used by the *_into methods
+# Not a method, so a traced I2C (BusTracer) counts the outer call only
+def _read_write_into(bus, address, write, buffer):
+    read = _buffer_msg(address, buffer, I2C_M_RD)
+    bus.i2c_rdwr(_write_msg(address, write), read)
+    return read.len
+
+#------------------------------------------------------------------------------------------------------#
+
 class I2C:
-    def __init__(self):
+    # bus: adapter number, /dev/i2c-<bus>
+    def __init__(self, bus = 1):
+        self.bus_number = bus
         self.bus = SMBus()
-        self.bus.open(bus = 1)
+        self.bus.open(bus = bus)
 
     def __del__(self):
         self.bus.close()
@@ -23,9 +67,13 @@ class I2C:
         self.bus.write_byte(address, byte)
 
     # Write multiple bytes to slave
-    # data: list of byte
+    # data: list of byte or buffer (bytes, bytearray, memoryview...), buffer is not copied
+    # One i2c_rdwr on the opened bus, any length up to I2C_RDWR_MAX_LEN (no 32 bytes limit of SMBus)
+    # Ex: full display frame in one transfer
     def i2c_write_data(self, address, data):
-        msg = i2c_msg.write(address, data)
+        if len(data) > I2C_RDWR_MAX_LEN:
+            raise ValueError("Write of %d bytes, max is %d" % (len(data), I2C_RDWR_MAX_LEN))
+        msg = _write_msg(address, data)
         self.bus.i2c_rdwr(msg)
 
     # Write byte to register (reg)
@@ -61,6 +109,20 @@ class I2C:
     def i2c_read_block_data(self, address, reg, size):
         return self.bus.read_i2c_block_data(address, reg, size)
 
+    # Read len(buffer) bytes from slave into buffer (bytearray, memoryview...)
+    # No list is created, use struct.unpack_from to decode
+    # Return number of byte read
+    def i2c_read_into(self, address, buffer):
+        read = _buffer_msg(address, buffer, I2C_M_RD)
+        self.bus.i2c_rdwr(read)
+        return read.len
+
+    # Read len(buffer) bytes from register address (reg) into buffer
+    # Register and data in one transaction with repeated start (no 32 bytes limit of SMBus)
+    # Return number of byte read
+    def i2c_read_block_into(self, address, reg, buffer):
+        return _read_write_into(self.bus, address, [reg], buffer)
+
     #--------------------------------------------------------------------------#
     
     # I2C read and write operations in a transactions with repeated start
@@ -70,7 +132,50 @@ class I2C:
     # Return list of bytes
     def i2c_read_write_data(self, address, write_list, read_size):
         read = i2c_msg.read(address, read_size)
-        write = i2c_msg.write(address, write_list)
+        write = _write_msg(address, write_list)
         self.bus.i2c_rdwr(write, read)
         
         return list(read)
+
+    # Same as i2c_read_write_data, read into buffer (bytearray, memoryview...)
+    # Write: list of byte or buffer
+    # Return number of byte read
+    def i2c_read_write_into(self, address, write, buffer):
+        return _read_write_into(self.bus, address, write, buffer)
+
+    #--------------------------------------------------------------------------#
+
+    # Create a transaction to queue write/read messages
+    # Address: default slave address of messages
+    # Return I2CTransaction, call execute() to submit
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+    # Submit messages in one i2c_rdwr call
+    # Messages: list of (I2C_WRITE, address, data) or (I2C_READ, address, size)
+    # More than I2C_RDWR_MAX_MSGS messages are split, preferably after a read message
+    # Return list of read buffers (list of bytes)
+    def i2c_transfer(self, messages):
+        msgs = []
+        reads = []
+        for msg_type, address, value in messages:
+            if msg_type == I2C_WRITE:
+                msgs.append(_write_msg(address, value))
+            else:
+                msgs.append(i2c_msg.read(address, value))
+                reads.append(msgs[-1])
+
+        start = 0
+        while start < len(msgs):
+            end = min(start + I2C_RDWR_MAX_MSGS, len(msgs))
+            if end < len(msgs):
+                # Keep write + read pairs together
+                cut = end
+                while cut > start and messages[cut - 1][0] == I2C_WRITE:
+                    cut -= 1
+                if cut > start:
+                    end = cut
+            self.bus.i2c_rdwr(*msgs[start:end])
+            start = end
+
+        return [list(read) for read in reads]
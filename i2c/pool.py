@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+#
+# pool.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Bus pool
+# One shared I2C handle per adapter (/dev/i2c-N). Each bus has its own worker thread,
+# so transfers on different adapters run in parallel. submit(), aio() and the *_async
+# methods of drivers (AsyncI2C.of) all run in the worker thread of their bus
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+
+#------------------------------------------------------------------------------------------------------#
+
+# Pool of buses keyed by adapter number
+# factory: create handle of a bus, default I2C(bus), ex lambda bus: SimI2C(bus = bus) for test
+class BusPool:
+    def __init__(self, factory = I2C):
+        self.__factory = factory
+        self.__buses = {}
+        self.__workers = {}
+        self.__lock = threading.Lock()
+
+    # Adapter numbers opened
+    @property
+    def buses(self):
+        with self.__lock:
+            return sorted(self.__buses)
+
+    # Handle of bus, opened on first use and shared after that
+    # Its AsyncI2C (AsyncI2C.of) uses the worker thread of the bus
+    def get(self, bus = 1):
+        with self.__lock:
+            i2c = self.__buses.get(bus)
+            if i2c is None:
+                i2c = self.__buses[bus] = self.__factory(bus)
+                i2c._aio = AsyncI2C(i2c, self.__worker(bus))
+            return i2c
+
+    # Lock held
+    def __worker(self, bus):
+        worker = self.__workers.get(bus)
+        if worker is None:
+            # The thread is started on first submit
+            worker = self.__workers[bus] = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "i2c-%d" % bus)
+        return worker
+
+    # Worker thread of bus (executor with one thread), created on first use
+    # All calls submitted to a bus run in order in its thread
+    def worker(self, bus = 1):
+        with self.__lock:
+            return self.__worker(bus)
+
+    # Run function(i2c, *args) in the worker thread of bus
+    # Return concurrent.futures.Future
+    # Ex: future = pool.submit(1, lambda i2c: i2c.i2c_read_block_data(0x68, 0x3B, 6))
+    def submit(self, bus, function, *args, **kwargs):
+        return self.worker(bus).submit(function, self.get(bus), *args, **kwargs)
+
+    # asyncio front end of bus, running in the worker thread of the bus
+    # Coroutines of different buses run in parallel
+    def aio(self, bus = 1):
+        return AsyncI2C.of(self.get(bus))
+
+    # Stop worker threads and drop handles (buses are closed when handles are released)
+    def close(self):
+        with self.__lock:
+            workers = list(self.__workers.values())
+            self.__workers.clear()
+            self.__buses.clear()
+        for worker in workers:
+            worker.shutdown(wait = True)
+
+#-------------------------- Example --------------------------
+
+"""
+from MPU6886 import MPU6886
+from OLED128x64 import OLED128x64
+
+pool = BusPool()
+imu = MPU6886(pool.get(1))
+oled = OLED128x64(pool.get(3))          # Slow display on its own adapter
+
+# Frame push on bus 3 does not delay IMU sampling on bus 1
+frame = pool.submit(3, lambda i2c: oled.display_image('image/earth.png', 32, 0))
+while not frame.done():
+    print(imu.get_accel())
+pool.close()
+"""
@@ -0,0 +1,308 @@
+#!/usr/bin/python3
+#
+# record.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Bus traffic record and replay
+# BusRecorder logs every I2C call of a real bus into a compact binary file
+# ReplayI2C plays the file back as a stand-in bus, drivers get the recorded responses
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import struct
+import threading
+import time
+from i2c.trace import call_args
+from i2c.transaction import I2CTransaction, I2C_WRITE, I2C_READ
+
+#------------------------------------------------------------------------------------------------------#
+
+# File: header, then one record per call
+# Header: magic, version, bus number, start time (unix)
+# Record: time since previous record (us), op, address, write length, read length, write bytes, read bytes
+RECORD_MAGIC                            = b"I2CREC"
+RECORD_VERSION                          = 1
+HEADER                                  = struct.Struct("<6sHhd")
+RECORD                                  = struct.Struct("<IBBHH")
+
+# Op code = index in this list
+OPS = [
+    "i2c_write_byte",
+    "i2c_write_data",
+    "i2c_write_block_data",
+    "i2c_read_byte",
+    "i2c_read_data",
+    "i2c_read_block_data",
+    "i2c_read_write_data",
+    "i2c_read_into",
+    "i2c_read_block_into",
+    "i2c_read_write_into",
+    "i2c_transfer",
+]
+
+# Op flag: call raised OSError, read length is errno
+OP_ERROR                                = 0x80
+
+# Message header inside the write bytes of i2c_transfer: type, address, length
+TRANSFER_MESSAGE                        = struct.Struct("<BBH")
+
+#------------------------------------------------------------------------------------------------------#
+
+# Encode messages of i2c_transfer into write bytes
+def _encode_messages(messages):
+    data = bytearray()
+    for msg_type, address, value in messages:
+        if msg_type == I2C_WRITE:
+            data += TRANSFER_MESSAGE.pack(msg_type, address, len(value))
+            data += bytes(value)
+        else:
+            data += TRANSFER_MESSAGE.pack(msg_type, address, value)
+    return bytes(data)
+
+# Write bytes of a call
+# args: arguments of the call, address first
+def _encode_write(name, args):
+    if name == "i2c_write_byte":
+        return bytes([args[1]])
+    if name == "i2c_write_block_data":
+        return bytes([args[1]]) + bytes(args[2])
+    if name in ("i2c_write_data", "i2c_read_write_data", "i2c_read_write_into"):
+        return bytes(args[1])
+    if name in ("i2c_read_block_data", "i2c_read_block_into"):
+        return bytes([args[1]])
+    if name == "i2c_transfer":
+        return _encode_messages(args[0])
+    return b""
+
+# Read bytes of a call
+def _encode_read(name, args, result):
+    if name == "i2c_read_byte":
+        return bytes([result])
+    if name in ("i2c_read_data", "i2c_read_block_data", "i2c_read_write_data"):
+        return bytes(result)
+    if name in ("i2c_read_into", "i2c_read_block_into", "i2c_read_write_into"):
+        return bytes(args[-1])
+    if name == "i2c_transfer":
+        return b"".join(bytes(read) for read in result)
+    return b""
+
+#------------------------------------------------------------------------------------------------------#
+
+# Recording proxy, used by drivers in place of the I2C object
+# Ex: i2c = BusRecorder(I2C(), "rig.i2crec")
+class BusRecorder:
+    def __init__(self, i2c, path):
+        self.i2c = i2c
+        self.path = path
+        self.records = 0
+        self.__file = open(path, "wb")
+        self.__lock = threading.Lock()
+        self.__file.write(HEADER.pack(RECORD_MAGIC, RECORD_VERSION, getattr(i2c, "bus_number", -1), time.time()))
+        self.__last = time.perf_counter_ns()
+
+    def __write(self, name, address, write, read, error):
+        op = OPS.index(name)
+        with self.__lock:
+            now = time.perf_counter_ns()
+            delta = min((now - self.__last) // 1000, 0xFFFFFFFF)
+            self.__last = now
+            if error is not None:
+                # Read length is errno, no read bytes
+                self.__file.write(RECORD.pack(delta, op | OP_ERROR, address, len(write), error & 0xFFFF))
+                self.__file.write(write)
+            else:
+                self.__file.write(RECORD.pack(delta, op, address, len(write), len(read)))
+                self.__file.write(write)
+                self.__file.write(read)
+            self.records += 1
+
+    # Wrap I2C methods, record each call
+    # The method is looked up on each call (a tracer enabled later sees the calls)
+    def __getattr__(self, name):
+        method = getattr(self.i2c, name)
+        if not name.startswith("i2c_") or not callable(method):
+            return method
+        if name not in OPS:
+            raise AttributeError("%s is not recorded" % name)
+
+        def recorded(*args, **kwargs):
+            method = getattr(self.i2c, name)
+            args = call_args(method, args, kwargs)
+            address = args[0]
+            if name == "i2c_transfer":
+                address = args[0][0][1] if args[0] else 0
+            try:
+                result = method(*args)
+            except OSError as e:
+                self.__write(name, address, _encode_write(name, args), b"", e.errno or 0)
+                raise
+            self.__write(name, address, _encode_write(name, args), _encode_read(name, args, result), None)
+            return result
+
+        setattr(self, name, recorded)
+        return recorded
+
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+    def flush(self):
+        with self.__lock:
+            self.__file.flush()
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
+
+#------------------------------------------------------------------------------------------------------#
+
+# One record of a file
+class Record:
+    def __init__(self, time, op, address, write, read, error):
+        self.time = time            # Seconds since start of recording
+        self.op = op                # Method name
+        self.address = address
+        self.write = write          # bytes
+        self.read = read            # bytes
+        self.error = error          # errno or None
+
+# Read all records of a file
+# Return (header dict, list of Record)
+def load_records(path):
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, bus, start = HEADER.unpack_from(data, 0)
+    if magic != RECORD_MAGIC or version != RECORD_VERSION:
+        raise ValueError("%s is not a bus record file" % path)
+
+    records = []
+    offset = HEADER.size
+    elapsed = 0
+    while offset < len(data):
+        delta, op, address, wlen, rlen = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        elapsed += delta
+        write = data[offset:offset + wlen]
+        offset += wlen
+        error = None
+        if op & OP_ERROR:
+            error = rlen
+            rlen = 0
+        read = data[offset:offset + rlen]
+        offset += rlen
+        records.append(Record(elapsed * 1e-6, OPS[op & ~OP_ERROR], address, write, read, error))
+
+    return {"bus": bus, "start": start, "version": version}, records
+
+#------------------------------------------------------------------------------------------------------#
+
+# Stand-in bus playing a record file
+# Each call must match the next record (method and address), its recorded result is returned
+# check_write: also compare written bytes (catch drivers sending other commands)
+class ReplayI2C:
+    def __init__(self, path, check_write = True):
+        header, self.records = load_records(path)
+        self.bus_number = header["bus"]
+        self.start_time = header["start"]
+        self.check_write = check_write
+        self.position = 0
+
+    # Number of records not replayed yet
+    @property
+    def remaining(self):
+        return len(self.records) - self.position
+
+    # Replay again from record position (ex run a benchmark many times, skipping driver init)
+    def rewind(self, position = 0):
+        self.position = position
+
+    def __next(self, name, address, write = b""):
+        if self.position >= len(self.records):
+            raise RuntimeError("Replay ended, %s(0x%02X) not recorded" % (name, address))
+        record = self.records[self.position]
+        if record.op != name or record.address != address:
+            raise RuntimeError("Replay mismatch at record %d: %s(0x%02X), recorded %s(0x%02X)" % (self.position, name, address, record.op, record.address))
+        if self.check_write and record.write != write:
+            raise RuntimeError("Replay mismatch at record %d: %s(0x%02X) writes %s, recorded %s" % (self.position, name, address, write.hex(), record.write.hex()))
+        self.position += 1
+        if record.error is not None:
+            raise OSError(record.error, "Recorded error (address 0x%02X)" % address)
+        return record.read
+
+    @staticmethod
+    def __copy(buffer, read):
+        view = memoryview(buffer).cast("B")
+        view[:] = read
+        return len(view)
+
+    #--------------------------------------------------------------------------#
+
+    def i2c_write_byte(self, address, byte):
+        self.__next("i2c_write_byte", address, bytes([byte]))
+
+    def i2c_write_data(self, address, data):
+        self.__next("i2c_write_data", address, bytes(data))
+
+    def i2c_write_block_data(self, address, reg, data):
+        self.__next("i2c_write_block_data", address, bytes([reg]) + bytes(data))
+
+    def i2c_read_byte(self, address):
+        return self.__next("i2c_read_byte", address)[0]
+
+    def i2c_read_data(self, address, size):
+        return list(self.__next("i2c_read_data", address))
+
+    def i2c_read_block_data(self, address, reg, size):
+        return list(self.__next("i2c_read_block_data", address, bytes([reg])))
+
+    def i2c_read_write_data(self, address, write_list, read_size):
+        return list(self.__next("i2c_read_write_data", address, bytes(write_list)))
+
+    def i2c_read_into(self, address, buffer):
+        return self.__copy(buffer, self.__next("i2c_read_into", address))
+
+    def i2c_read_block_into(self, address, reg, buffer):
+        return self.__copy(buffer, self.__next("i2c_read_block_into", address, bytes([reg])))
+
+    def i2c_read_write_into(self, address, write, buffer):
+        return self.__copy(buffer, self.__next("i2c_read_write_into", address, bytes(write)))
+
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+    def i2c_transfer(self, messages):
+        address = messages[0][1] if messages else 0
+        read = self.__next("i2c_transfer", address, _encode_messages(messages))
+        reads = []
+        offset = 0
+        for msg_type, msg_address, value in messages:
+            if msg_type == I2C_READ:
+                reads.append(list(read[offset:offset + value]))
+                offset += value
+        return reads
+
+#-------------------------- Example --------------------------
+
+"""
+import time
+from i2c.i2c import I2C
+from BMP280 import BMP280
+
+# On the rig
+i2c = BusRecorder(I2C(), "bmp280.i2crec")
+sensor = BMP280(i2c)
+for i in range(1000):
+    sensor.get_pressure()
+i2c.close()
+
+# On a laptop, same calls get the same responses
+replay = ReplayI2C("bmp280.i2crec")
+sensor = BMP280(replay)
+start = time.perf_counter()
+while replay.remaining:
+    sensor.get_pressure()
+print("%.1f us per read" % ((time.perf_counter() - start) / 1000 * 1e6))
+"""
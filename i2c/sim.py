@@ -0,0 +1,292 @@
+#!/usr/bin/python3
+#
+# sim.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# In-memory simulated I2C bus
+# Drop-in replacement of I2C (same methods), so drivers can run, be profiled and
+# load-tested without a Raspberry Pi. Slaves are modelled by device objects
+# SimGPIO replaces RPi.GPIO for the interrupt pins of drivers (gpio argument)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import errno
+from i2c.transaction import I2CTransaction, I2C_WRITE
+
+#------------------------------------------------------------------------------------------------------#
+
+# Base device model
+# A device receives the raw bytes of each write message and produces the bytes of each read message
+class SimDevice:
+    def __init__(self, address):
+        self.address = address
+
+    # Write message from master
+    # data: list of bytes
+    def write(self, data):
+        pass
+
+    # Read message from master
+    # size: number of byte to read
+    # Return list of bytes
+    def read(self, size):
+        return [0] * size
+
+#------------------------------------------------------------------------------------------------------#
+
+# Register map device model
+# First byte of a write selects the register, next bytes are written to the register map
+# Reads return the register map from the selected register
+# Register pointer is auto incremented after each byte (most sensors work this way)
+class RegisterDevice(SimDevice):
+    def __init__(self, address, registers = None, size = 256, auto_increment = True):
+        SimDevice.__init__(self, address)
+        self.size = size
+        self.auto_increment = auto_increment
+        self.regs = [0] * size
+        self.pointer = 0
+
+        # Hooks to model registers with side effect
+        # on_read[reg](reg) -> value
+        # on_write[reg](reg, value)
+        self.on_read = {}
+        self.on_write = {}
+
+        if registers is not None:
+            for reg, value in registers.items():
+                self.set_register(reg, value)
+
+    # Preload register(s) without triggering hooks
+    # value: a byte or list of bytes from reg
+    def set_register(self, reg, value):
+        if isinstance(value, int):
+            value = [value]
+        for i, byte in enumerate(value):
+            self.regs[(reg + i) % self.size] = byte & 0xFF
+
+    # Get register value without triggering hooks
+    def get_register(self, reg, size = 1):
+        values = [self.regs[(reg + i) % self.size] for i in range(size)]
+        return values[0] if size == 1 else values
+
+    def read_register(self, reg):
+        if reg in self.on_read:
+            return self.on_read[reg](reg) & 0xFF
+        return self.regs[reg]
+
+    def write_register(self, reg, value):
+        self.regs[reg] = value & 0xFF
+        if reg in self.on_write:
+            self.on_write[reg](reg, value & 0xFF)
+
+    def __next_pointer(self):
+        if self.auto_increment:
+            self.pointer = (self.pointer + 1) % self.size
+
+    def write(self, data):
+        if len(data) == 0:
+            return
+        self.pointer = data[0] % self.size
+        for value in data[1:]:
+            self.write_register(self.pointer, value)
+            self.__next_pointer()
+
+    def read(self, size):
+        read = []
+        for i in range(size):
+            read.append(self.read_register(self.pointer))
+            self.__next_pointer()
+        return read
+
+#------------------------------------------------------------------------------------------------------#
+
+# Simulated bus, same methods as I2C
+class SimI2C:
+    def __init__(self, devices = None, bus = 1):
+        self.bus_number = bus
+        self.devices = {}
+        self.transactions = 0
+        if devices is not None:
+            for device in devices:
+                self.add_device(device)
+
+    # Attach a device model to the bus
+    # Return the device
+    def add_device(self, device):
+        self.devices[device.address] = device
+        return device
+
+    def remove_device(self, address):
+        self.devices.pop(address, None)
+
+    # Device at address, no device means NACK like a real bus
+    def __device(self, address):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(errno.EREMOTEIO, "Remote I/O error (address 0x%02X)" % address)
+        return device
+
+    def __write(self, address, data):
+        self.__device(address).write(list(data))
+
+    def __read(self, address, size):
+        return list(self.__device(address).read(size))
+
+    # Read into buffer, return number of byte
+    def __read_into(self, address, buffer):
+        view = memoryview(buffer).cast("B")
+        view[:] = bytes(self.__device(address).read(len(view)))
+        return len(view)
+
+    #--------------------------------------------------------------------------#
+
+    def i2c_write_byte(self, address, byte):
+        self.transactions += 1
+        self.__write(address, [byte])
+
+    def i2c_write_data(self, address, data):
+        self.transactions += 1
+        self.__write(address, data)
+
+    def i2c_write_block_data(self, address, reg, data):
+        self.transactions += 1
+        self.__write(address, [reg] + list(data))
+
+    #--------------------------------------------------------------------------#
+
+    def i2c_read_byte(self, address):
+        self.transactions += 1
+        return self.__read(address, 1)[0]
+
+    def i2c_read_data(self, address, size):
+        self.transactions += 1
+        return self.__read(address, size)
+
+    def i2c_read_block_data(self, address, reg, size):
+        self.transactions += 1
+        self.__write(address, [reg])
+        return self.__read(address, size)
+
+    def i2c_read_into(self, address, buffer):
+        self.transactions += 1
+        return self.__read_into(address, buffer)
+
+    def i2c_read_block_into(self, address, reg, buffer):
+        self.transactions += 1
+        self.__write(address, [reg])
+        return self.__read_into(address, buffer)
+
+    #--------------------------------------------------------------------------#
+
+    def i2c_read_write_data(self, address, write_list, read_size):
+        self.transactions += 1
+        self.__write(address, write_list)
+        return self.__read(address, read_size)
+
+    def i2c_read_write_into(self, address, write, buffer):
+        self.transactions += 1
+        self.__write(address, write)
+        return self.__read_into(address, buffer)
+
+    #--------------------------------------------------------------------------#
+
+    def i2c_transaction(self, address = None):
+        return I2CTransaction(self, address)
+
+    # All messages count as one transaction, like one i2c_rdwr
+    def i2c_transfer(self, messages):
+        self.transactions += 1
+        reads = []
+        for msg_type, address, value in messages:
+            if msg_type == I2C_WRITE:
+                self.__write(address, value)
+            else:
+                reads.append(self.__read(address, value))
+        return reads
+
+#------------------------------------------------------------------------------------------------------#
+
+# Simulated GPIO, subset of RPi.GPIO used by drivers
+# Input levels are set by the test with set_input, edges call the callbacks in the caller thread
+class SimGPIO:
+    BCM = 11
+    BOARD = 10
+    IN = 1
+    OUT = 0
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self):
+        self.mode = None
+        self.levels = {}        # pin -> 0 / 1
+        self.directions = {}    # pin -> IN / OUT
+        self.__callbacks = {}   # pin -> (edge, [callback])
+
+    def setwarnings(self, flag):
+        pass
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def setup(self, pin, direction, pull_up_down = PUD_OFF, initial = LOW):
+        self.directions[pin] = direction
+        if pin not in self.levels:
+            self.levels[pin] = self.HIGH if pull_up_down == self.PUD_UP else initial
+
+    def input(self, pin):
+        return self.levels.get(pin, self.LOW)
+
+    def output(self, pin, value):
+        self.set_input(pin, value)
+
+    def add_event_detect(self, pin, edge, callback = None, bouncetime = None):
+        if pin in self.__callbacks:
+            raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+        self.__callbacks[pin] = (edge, [callback] if callback is not None else [])
+
+    def add_event_callback(self, pin, callback):
+        self.__callbacks[pin][1].append(callback)
+
+    def remove_event_detect(self, pin):
+        self.__callbacks.pop(pin, None)
+
+    def cleanup(self, pin = None):
+        if pin is None:
+            self.__callbacks.clear()
+            self.directions.clear()
+        else:
+            self.__callbacks.pop(pin, None)
+            self.directions.pop(pin, None)
+
+    # Drive pin level (device side), callbacks of a matching edge are called
+    def set_input(self, pin, value):
+        value = self.HIGH if value else self.LOW
+        old = self.levels.get(pin, self.LOW)
+        self.levels[pin] = value
+        if value == old or pin not in self.__callbacks:
+            return
+        edge, callbacks = self.__callbacks[pin]
+        if edge == self.BOTH or (edge == self.RISING) == (value == self.HIGH):
+            for callback in list(callbacks):
+                callback(pin)
+
+#-------------------------- Example --------------------------
+
+"""
+from BMP280 import BMP280
+
+i2c = SimI2C()
+device = i2c.add_device(RegisterDevice(0x77, {0xD0: 0x58}))
+sensor = BMP280(i2c)
+print(sensor.get_device_id())
+print(i2c.transactions)
+"""
@@ -0,0 +1,272 @@
+#!/usr/bin/python3
+#
+# trace.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Bus transaction tracer
+# Count transactions, bytes and latency per slave address and per call site (driver method)
+# Traced methods are set on the I2C object, proxies (BusClient, AsyncI2C, BusRecorder) look the
+# method up on each call, so they follow enable and disable
+# When disabled, the I2C object is untouched (no overhead)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+#------------------------------------------------------------------------------------------------------#
+
+# Size in byte of write data (list of byte or any buffer) or of a read (int)
+def _nbytes(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, (list, tuple, str)):
+        return len(value)
+    return memoryview(value).nbytes
+
+# Number of byte moved on the bus by each I2C method (address is not counted)
+# args: arguments after address
+BYTES_MOVED = {
+    "i2c_write_byte":           lambda args, result: 1,
+    "i2c_write_data":           lambda args, result: _nbytes(args[0]),
+    "i2c_write_block_data":     lambda args, result: 1 + _nbytes(args[1]),
+    "i2c_read_byte":            lambda args, result: 1,
+    "i2c_read_data":            lambda args, result: args[0],
+    "i2c_read_block_data":      lambda args, result: 1 + args[1],
+    "i2c_read_write_data":      lambda args, result: _nbytes(args[0]) + args[1],
+    "i2c_read_into":            lambda args, result: result,
+    "i2c_read_block_into":      lambda args, result: 1 + result,
+    "i2c_read_write_into":      lambda args, result: _nbytes(args[0]) + result,
+    # Messages, count all
+    "i2c_transfer":             lambda args, result: sum(_nbytes(value) for msg_type, msg_address, value in args[0]),
+}
+
+# Methods not traced, they go through a traced method
+NOT_TRACED = ["i2c_transaction"]
+
+# Latency histogram has buckets of power of 2 microseconds
+HISTOGRAM_SIZE = 32
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+#------------------------------------------------------------------------------------------------------#
+
+# Arguments of a call as positional arguments (BYTES_MOVED and records use positions)
+def call_args(method, args, kwargs):
+    if not kwargs:
+        return args
+    return inspect.signature(method).bind(*args, **kwargs).args
+
+#------------------------------------------------------------------------------------------------------#
+
+# Statistics of one (address, call site)
+class TraceStats:
+    def __init__(self, address, site):
+        self.address = address
+        self.site = site
+        self.count = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * HISTOGRAM_SIZE   # bucket i: latency < 2^i us
+
+    def add(self, ns, nbytes, error):
+        self.count += 1
+        self.bytes += nbytes
+        self.total_ns += ns
+        if error:
+            self.errors += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+        bucket = min((ns // 1000).bit_length(), HISTOGRAM_SIZE - 1)
+        self.histogram[bucket] += 1
+
+    # Add counts of other (ex all call sites of an address)
+    def merge(self, other):
+        self.count += other.count
+        self.errors += other.errors
+        self.bytes += other.bytes
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        for bucket, count in enumerate(other.histogram):
+            self.histogram[bucket] += count
+
+    # Latency (seconds) of quantile q (0 - 1), upper bound of the histogram bucket
+    def quantile(self, q):
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for bucket, count in enumerate(self.histogram):
+            total += count
+            if total >= rank:
+                return min((1 << bucket) * 1e-6, self.max_ns * 1e-9)
+        return self.max_ns * 1e-9
+
+    def as_dict(self):
+        return {
+            "address": self.address,
+            "site": self.site,
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "total": self.total_ns * 1e-9,
+            "mean": self.total_ns * 1e-9 / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p99": self.quantile(0.99),
+            "max": self.max_ns * 1e-9,
+        }
+
+#------------------------------------------------------------------------------------------------------#
+
+class BusTracer:
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.enabled = False
+        self.lost = 0                           # Transactions not recorded (accounting failed)
+        self.__stats = {}
+        self.__lock = threading.Lock()
+
+    # Call site: nearest public function (or constructor) outside the i2c package, ex "OLED128x64.putc"
+    def __call_site(self):
+        frame = sys._getframe(3)
+        first = None
+        while frame is not None:
+            code = frame.f_code
+            if os.path.dirname(os.path.abspath(code.co_filename)) != _PACKAGE_DIR:
+                name = getattr(code, "co_qualname", code.co_name)
+                if first is None:
+                    first = name
+                if not code.co_name.startswith("_") or code.co_name == "__init__":
+                    return name
+            frame = frame.f_back
+        return first
+
+    # Account one call, an error here never replaces the result of the call
+    def __record(self, name, method, args, kwargs, result, ns, error):
+        try:
+            args = call_args(method, args, kwargs)
+            if name == "i2c_transfer":
+                # Address of first message
+                address = args[0][0][1] if args[0] else None
+                nbytes = BYTES_MOVED[name](args, result) if not error else 0
+            else:
+                address = args[0]
+                count_bytes = BYTES_MOVED.get(name)
+                nbytes = count_bytes(args[1:], result) if count_bytes is not None and not error else 0
+            site = self.__call_site()
+        except Exception:
+            with self.__lock:
+                self.lost += 1
+            return
+
+        with self.__lock:
+            key = (address, site)
+            stats = self.__stats.get(key)
+            if stats is None:
+                stats = self.__stats[key] = TraceStats(address, site)
+            stats.add(ns, nbytes, error)
+
+    def __wrap(self, name, method):
+        @functools.wraps(method)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.__record(name, method, args, kwargs, None, time.perf_counter_ns() - start, True)
+                raise
+            self.__record(name, method, args, kwargs, result, time.perf_counter_ns() - start, False)
+            return result
+
+        return traced
+
+    #--------------------------------------------------------------------------#
+
+    # Start tracing: I2C methods of the object are replaced by traced ones
+    def enable(self):
+        if self.enabled:
+            return
+        for name in dir(type(self.i2c)):
+            if name.startswith("i2c_") and name not in NOT_TRACED:
+                setattr(self.i2c, name, self.__wrap(name, getattr(self.i2c, name)))
+        self.enabled = True
+
+    # Stop tracing: original methods are restored
+    def disable(self):
+        if not self.enabled:
+            return
+        for name in dir(type(self.i2c)):
+            if name.startswith("i2c_") and name in vars(self.i2c):
+                delattr(self.i2c, name)
+        self.enabled = False
+
+    def reset(self):
+        with self.__lock:
+            self.__stats.clear()
+
+    # Return list of dict, sorted by total bus time (highest first)
+    def stats(self):
+        with self.__lock:
+            stats = [stats.as_dict() for stats in self.__stats.values()]
+        return sorted(stats, key = lambda s: s["total"], reverse = True)
+
+    # Statistics of each address (all call sites merged)
+    # Only the raw counters are copied under the lock, traced calls wait for a few copies at most
+    # Return list of TraceStats (copies), sorted by address
+    def address_stats(self):
+        with self.__lock:
+            counters = [(stats.address, stats.count, stats.errors, stats.bytes, stats.total_ns, stats.max_ns, stats.histogram[:])
+                        for stats in self.__stats.values()]
+
+        merged = {}
+        for address, count, errors, nbytes, total_ns, max_ns, histogram in counters:
+            stats = merged.get(address)
+            if stats is None:
+                stats = merged[address] = TraceStats(address, None)
+            stats.count += count
+            stats.errors += errors
+            stats.bytes += nbytes
+            stats.total_ns += total_ns
+            stats.max_ns = max(stats.max_ns, max_ns)
+            for bucket, n in enumerate(histogram):
+                stats.histogram[bucket] += n
+        return sorted(merged.values(), key = lambda s: -1 if s.address is None else s.address)
+
+    # Print a table of statistics
+    def dump(self, file = sys.stdout):
+        file.write("%-7s %-40s %8s %6s %10s %10s %10s %10s\n" % ("addr", "site", "count", "errors", "bytes", "p50 (us)", "p99 (us)", "total (ms)"))
+        for s in self.stats():
+            address = "0x%02X" % s["address"] if s["address"] is not None else "-"
+            file.write("%-7s %-40s %8d %6d %10d %10.1f %10.1f %10.2f\n" % (address, s["site"], s["count"], s["errors"], s["bytes"], s["p50"] * 1e6, s["p99"] * 1e6, s["total"] * 1e3))
+
+    # Export statistics to a JSON file
+    def export(self, path):
+        with open(path, "w") as file:
+            json.dump(self.stats(), file, indent = 2)
+
+#-------------------------- Example --------------------------
+
+"""
+from i2c.i2c import I2C
+from OLED128x64 import OLED128x64
+
+i2c = I2C()
+tracer = BusTracer(i2c)
+tracer.enable()
+
+oled = OLED128x64(i2c)
+oled.print("Hello")
+
+tracer.disable()
+tracer.dump()       # OLED128x64.putc: 8 transactions per character
+"""
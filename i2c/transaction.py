@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+#
+# transaction.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Batched I2C transaction
+# Queue many write/read messages and submit them together (one i2c_rdwr on the real bus)
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+# Message type
+I2C_WRITE                               = 0
+I2C_READ                                = 1
+
+#------------------------------------------------------------------------------------------------------#
+
+# Transaction builder
+# Messages are stored as (type, address, data or size)
+# Ex: reads = i2c.i2c_transaction(address).write([reg1]).read(2).write([reg2]).read(2).execute()
+class I2CTransaction:
+    def __init__(self, i2c, address = None):
+        self.__i2c = i2c
+        self.__address = address
+        self.messages = []
+
+    def __get_address(self, address):
+        if address is None:
+            address = self.__address
+        if address is None:
+            raise ValueError("Slave address is not set")
+        return address
+
+    # Queue a write message
+    # data: list of byte
+    # address: slave address, default is address of transaction
+    def write(self, data, address = None):
+        self.messages.append((I2C_WRITE, self.__get_address(address), data))
+        return self
+
+    # Queue a read message
+    # size: number of byte to read
+    def read(self, size, address = None):
+        self.messages.append((I2C_READ, self.__get_address(address), size))
+        return self
+
+    # Queue a write then read (repeated start), ex register read
+    def write_read(self, write_list, read_size, address = None):
+        self.write(write_list, address)
+        self.read(read_size, address)
+        return self
+
+    # Submit all messages
+    # Return list of read buffers (list of bytes), in order of read messages
+    def execute(self):
+        return self.__i2c.i2c_transfer(self.messages)
@@ -12,7 +12,10 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import asyncio
 from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+from hub.stream import paced
 from time import sleep
 
 #------------------------------------------------------------------------------------------------------#
@@ -45,20 +48,18 @@ class LTC2497:
         self.__i2c = i2c
         self.__address = address
 
-    # Get measurement value and detect plugging
-    # If input is not plugin, return None
-    # Return measurement value
-    def get_adc(self, channel):
-        channel_cmd = LTC2497_CHANNEL[channel]
+    # Command to start conversation
+    def __start_conversion(self, channel):
+        self.__i2c.i2c_write_byte(self.__address, LTC2497_CHANNEL[channel])
 
-        # Command to start conversation
-        self.__i2c.i2c_write_byte(self.__address, channel_cmd)
-        sleep(TIEMPO)
+    # Read conversation result
+    def __read_conversion(self, channel):
+        return self.__i2c.i2c_read_block_data(self.__address, LTC2497_CHANNEL[channel], LANGE)
 
-        # read value
-        reading = self.__i2c.i2c_read_block_data(self.__address, channel_cmd, LANGE)
+    # Convert reading to volts
+    # Return None if input is not plugin
+    def __convert(self, reading):
         valor = ((((reading[0] & 0x3F)) << 16)) + ((reading[1] << 8)) + (((reading[2] & 0xE0)))
-        sleep(TIEMPO)
 
         # End of conversion of the Channel
         volts = valor * VREF / MAX_READING
@@ -69,6 +70,39 @@ class LTC2497:
     
         # Measure success
         return volts
+
+    #--------------------------------------------------------------------------------------------------#
+
+    # Get measurement value and detect plugging
+    # If input is not plugin, return None
+    # Return measurement value
+    def get_adc(self, channel):
+        self.__start_conversion(channel)
+        sleep(TIEMPO)
+
+        # read value
+        reading = self.__read_conversion(channel)
+        sleep(TIEMPO)
+
+        return self.__convert(reading)
+
+    # Same as get_adc, but await the conversion time instead of sleeping
+    # Bus calls run in the bus thread (AsyncI2C), never in the event loop
+    async def get_adc_async(self, channel):
+        aio = AsyncI2C.of(self.__i2c)
+        await aio.call(self.__start_conversion, channel)
+        await asyncio.sleep(TIEMPO)
+
+        reading = await aio.call(self.__read_conversion, channel)
+        await asyncio.sleep(TIEMPO)
+
+        return self.__convert(reading)
+
+    # Yield (t, volts) of channel at rate_hz, paced on the monotonic clock
+    # Rate is limited by the conversion time (get_adc waits for it)
+    # count: number of samples, None = forever
+    def stream(self, channel, rate_hz, count = None):
+        return paced(lambda: self.get_adc(channel), rate_hz, count)
     
 #-------------------------- Example --------------------------
 
@@ -14,31 +14,6 @@ from i2c.i2c import I2C
 
 #------------------------------------------------------------------------------------------------------#
 
-import io
-import fcntl
-import sys
-
-I2C_SLAVE = 0x0703
-
-# Write I2C without SMBus because SMBus max block size is 32 bytes
-class I2C_Raw:
-    def __init__(self, device, bus):
-        self.fr = io.open("/dev/i2c-"+str(bus), "rb", buffering=0)
-        self.fw = io.open("/dev/i2c-"+str(bus), "wb", buffering=0)
-
-        fcntl.ioctl(self.fr, I2C_SLAVE, device)
-        fcntl.ioctl(self.fw, I2C_SLAVE, device)
-
-    # Write multiple byte
-    def write(self, data):
-        self.fw.write(bytearray(data))
-    
-    def close(self):
-        self.fw.close()
-        self.fr.close()
-
-#------------------------------------------------------------------------------------------------------#
-
 RGB_LED_MATRIX_DEF_I2C_ADDR          	= 0x65 # The device i2c address in default
 
 GROVE_TWO_RGB_LED_MATRIX_VID 			= 0x2886 # Vender ID of the device
@@ -337,17 +312,16 @@ class LedMatrix:
     # Duration: Set the display time(ms) duration. Set it to 0 to not display
     # Forever: Set it to true to display forever, or set it to false to display one time
     def display_frame(self, buffer, duration, forever):
-        data = [I2C_CMD_DISP_CUSTOM]
+        data = bytearray([I2C_CMD_DISP_CUSTOM])
         data.append(duration & 0xFF)
         data.append((duration >> 8) & 0xFF)
         data.append(int(forever == True))
         data.append(0x01)
-        data += [0x00, 0x00, 0x00]
-        data += buffer
+        data += bytes([0x00, 0x00, 0x00])
+        data += bytes(buffer)
 
-        dev = I2C_Raw(RGB_LED_MATRIX_DEF_I2C_ADDR, 1)
-        dev.write(data)
-        dev.close()
+        # One write longer than SMBus block (32 bytes)
+        self.__i2c.i2c_write_data(self.__address, data)
 
 #-------------------------- Example --------------------------
 
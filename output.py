@@ -11,7 +11,9 @@
 
 #------------------------------------------------------------------------------------------------------#
 
+import math
 from i2c.i2c import I2C
+from i2c.cache import RegisterCache
 from time import sleep
 
 #------------------------------------------------------------------------------------------------------#
@@ -52,21 +54,24 @@ class PCA9685:
     def __init__(self, i2c, address = PCA9685_I2C_ADDRESS):
         self.__i2c = i2c
         self.__address = address
+        # Shadow copy of registers, so set_frequency does not read MODE1 from the bus
+        # RESTART bit of MODE1 is cleared by the chip when the restart is done, it is not cached
+        self.__registers = RegisterCache(i2c, address, self_clearing = {MODE1: RESTART})
 
     # Write one byte to register with address
     def __write8(self, reg, byte):
-        self.__i2c.i2c_write_block_data(self.__address, reg, [byte])
+        self.__registers.write(reg, byte)
 
-    # Read data from register
+    # Read data from register (from cache if possible)
     def __read8(self, reg):
-        self.__i2c.i2c_write_data(self.__address, [reg])
-        return self.__i2c.i2c_read_byte(self.__address)
+        return self.__registers.read(reg)
 
     #--------------------------------------------------------------------------------------------------#
 
     # Reset device
     def reset(self):
         self.__write8(MODE1, 0x06)    # SWRST
+        self.__registers.invalidate()
 
     # Set the PWM frequency for the entire chip, from 40Hz to 1000Hz
     def set_frequency(self, frequency):
@@ -79,12 +84,12 @@ class PCA9685:
         # Calculate prescale
         prescaleval = 25000000.0    # 25MHz
         prescaleval /= 4096.0       # 12-bit
-        prescaleval /= float(freq_hz)
+        prescaleval /= float(frequency)
         prescaleval -= 1.0
         prescale = int(math.floor(prescaleval + 0.5))
 
-        oldmode = self.__read8(MODE1)
-        newmode = (oldmode & 0x7F) | 0x10    # sleep
+        oldmode = self.__read8(MODE1) & 0x7F # without RESTART, it is set after the oscillator is up
+        newmode = oldmode | 0x10             # sleep
         self.__write8(MODE1, newmode)        # go to sleep for configuration
         self.__write8(PRESCALE, prescale)    # set prescale
         self.__write8(MODE1, oldmode)
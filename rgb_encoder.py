@@ -14,6 +14,7 @@
 import time
 import colorsys
 from i2c.i2c import I2C
+from i2c.cache import RegisterCache
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -227,6 +228,14 @@ MASK_CTRL_ADDRWR = 0x10
 # writing the *whole* port and smashing the i2c pins
 BIT_ADDRESSED_REGS = [REG_P0, REG_P1, REG_P2, REG_P3]
 
+# Registers changed by the chip itself (status, counters, data, self-clearing bits)
+# or written with bit-addressing, never kept in the register cache
+VOLATILE_REGS = BIT_ADDRESSED_REGS + [
+    REG_ENC_1_COUNT, REG_ENC_2_COUNT, REG_ENC_3_COUNT, REG_ENC_4_COUNT,
+    REG_INT, REG_CTRL, REG_ADDR,
+    REG_ADCCON0, REG_ADCRL, REG_ADCRH, REG_PWMCON0,
+] + list(range(REG_CAPTOUCH_0, REG_CAPTOUCH_0 + 8)) + list(range(REG_SWITCH_P00, REG_SWITCH_P10 + 8))
+
 # These values encode our desired pin function: IO, ADC, PWM
 # alongwide the GPIO MODE for that port and pin (section 8.1)
 # the 5th bit additionally encodes the default output state
@@ -317,9 +326,13 @@ class ADC_OR_PWM_PIN(ADC_PIN, PWM_PIN):
 #------------------------------------------------------------------------------------------------------#
 
 class IOE():
-    def __init__(self, i2c, i2c_addr=I2C_ADDR, interrupt_timeout=1.0, interrupt_pin=None, gpio=None, skip_chip_id_check=False):
+    def __init__(self, i2c, i2c_addr=I2C_ADDR, interrupt_timeout=1.0, interrupt_pin=None, gpio=None, skip_chip_id_check=False, register_cache=False):
         self._i2c_addr = i2c_addr
         self._i2c_dev = i2c
+        self._cache = None
+        if register_cache:
+            # Shadow copy of configuration registers, set_bits/clr_bits skip the read
+            self._cache = RegisterCache(i2c, i2c_addr, volatile=VOLATILE_REGS)
         self._debug = False
         self._vref = 3.3
         self._timeout = interrupt_timeout
@@ -333,8 +346,8 @@ class IOE():
                 import RPi.GPIO as GPIO
                 self._gpio = GPIO
             self._gpio.setwarnings(False)
-            self._gpio.setmode(GPIO.BCM)
-            self._gpio.setup(self._interrupt_pin, GPIO.IN, pull_up_down=GPIO.PUD_OFF)
+            self._gpio.setmode(self._gpio.BCM)
+            self._gpio.setup(self._interrupt_pin, self._gpio.IN, pull_up_down=self._gpio.PUD_OFF)
             self.enable_interrupt_out()
 
         self._pins = [
@@ -361,11 +374,16 @@ class IOE():
 
     def i2c_read8(self, reg):
         """Read a single (8bit) register from the device."""
+        if self._cache is not None:
+            return self._cache.read(reg)
         read = self._i2c_dev.i2c_read_block_data(self._i2c_addr, reg, 1)
         return read[0]
 
     def i2c_write8(self, reg, value):
         """Write a single (8bit) register to the device."""
+        if self._cache is not None:
+            self._cache.write(reg, value)
+            return
         self._i2c_dev.i2c_write_block_data(self._i2c_addr, reg, [value])
 
     #--------------------------------------------------------------------------------------------------#
@@ -409,10 +427,21 @@ class IOE():
                 if bits & (1 << bit):
                     self.i2c_write8(reg, 0b1000 | (bit & 0b111))
         else:
+            cached = self.is_register_cached(reg)
             value = self.i2c_read8(reg)
-            time.sleep(0.001)
+            if not cached:
+                time.sleep(0.001)
             self.i2c_write8(reg, value | bits)
 
+    def is_register_cached(self, reg):
+        """Returns True if the register value is known without a bus read."""
+        return self._cache is not None and self._cache.is_cached(reg)
+
+    def invalidate_register_cache(self, reg=None):
+        """Forget cached register value(s), ie. after the chip was reset or changed by someone else."""
+        if self._cache is not None:
+            self._cache.invalidate(reg)
+
     def set_bit(self, reg, bit):
         """Set the specified bit (nth position from right) in a register."""
         self.set_bits(reg, (1 << bit))
@@ -424,8 +453,10 @@ class IOE():
                 if bits & (1 << bit):
                     self.i2c_write8(reg, 0b0000 | (bit & 0b111))
         else:
+            cached = self.is_register_cached(reg)
             value = self.i2c_read8(reg)
-            time.sleep(0.001)
+            if not cached:
+                time.sleep(0.001)
             self.i2c_write8(reg, value & ~bits)
 
     def clr_bit(self, reg, bit):
@@ -505,6 +536,8 @@ class IOE():
         self.set_bit(REG_CTRL, 4)
         self.i2c_write8(REG_ADDR, i2c_addr)
         self._i2c_addr = i2c_addr
+        if self._cache is not None:
+            self._cache.address = i2c_addr
         time.sleep(0.25)  # TODO Handle addr change IOError better
         # self._wait_for_flash()
         self.clr_bit(REG_CTRL, 4)
@@ -725,7 +758,7 @@ PERIOD = int(255 / BRIGHTNESS)  # Add a period large enough to get 0-255 steps a
 
 class RGBEncoder:
     def __init__(self, i2c):
-        self.__ioe = IOE(i2c = i2c, i2c_addr = RGB_ENCODER_I2C_ADDR, interrupt_pin = 4)
+        self.__ioe = IOE(i2c = i2c, i2c_addr = RGB_ENCODER_I2C_ADDR, interrupt_pin = 4, register_cache = True)
         self.__ioe.enable_interrupt_out(pin_swap = True)
         self.__ioe.setup_rotary_encoder(1, POT_ENC_A, POT_ENC_B, pin_c = POT_ENC_C)
 
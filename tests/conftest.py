@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+#
+# conftest.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+# Tests run without hardware: buses are i2c.sim.SimI2C, time functions are replaced
+# Drivers import i2c.i2c (smbus2), their tests are skipped when smbus2 is not installed
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#------------------------------------------------------------------------------------------------------#
+
+# Clock moved by the test
+# step: time added by each read of the clock (busy waits end)
+class FakeClock:
+    def __init__(self, now = 0.0, step = 0.0):
+        self.now = now
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
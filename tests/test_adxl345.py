@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+#
+# test_adxl345.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import struct
+import pytest
+from i2c.sim import SimI2C, RegisterDevice
+
+pytest.importorskip("smbus2")
+
+import ADXL345
+from ADXL345 import REG_DATAX0, REG_FIFO_STATUS, REG_INT_ENABLE, REG_INT_MAP
+
+#------------------------------------------------------------------------------------------------------#
+
+# ADXL345 with a FIFO: a 6 byte read of DATAX0 pops one entry, FIFO_STATUS has the number of entries
+class FifoDevice(RegisterDevice):
+    def __init__(self):
+        RegisterDevice.__init__(self, ADXL345.ADXL345_I2C_ADDRESS, {0x00: 0xE5})
+        self.fifo = []
+
+    def push(self, count):
+        for i in range(count):
+            n = len(self.fifo) + 1
+            self.fifo.append(struct.pack("<hhh", n, -n, 32))
+
+    def read(self, size):
+        if self.pointer == REG_FIFO_STATUS:
+            self.set_register(REG_FIFO_STATUS, min(len(self.fifo), ADXL345.ADXL345_FIFO_SIZE))
+        if self.pointer == REG_DATAX0 and size == ADXL345.ADXL345_SAMPLE_SIZE and self.fifo:
+            return list(self.fifo.pop(0))
+        return RegisterDevice.read(self, size)
+
+def _sensor():
+    device = FifoDevice()
+    i2c = SimI2C([device])
+    return device, i2c, ADXL345.ADXL345(i2c)
+
+#------------------------------------------------------------------------------------------------------#
+
+# Full FIFO: one status read and one batched transaction, samples in order
+def test_read_fifo_raw_drains_all_entries():
+    device, i2c, sensor = _sensor()
+    device.push(ADXL345.ADXL345_FIFO_SIZE)
+    transactions = i2c.transactions
+    t, raw = sensor.read_fifo_raw()
+    assert i2c.transactions - transactions == 2
+    assert len(raw) == ADXL345.ADXL345_FIFO_SIZE * ADXL345.ADXL345_SAMPLE_SIZE
+    assert [x for x, y, z in struct.iter_unpack("<hhh", raw)] == list(range(1, 33))
+    assert sensor.fifo_full == 1
+    assert device.fifo == []
+
+def test_read_fifo_times_follow_previous_block():
+    device, i2c, sensor = _sensor()
+    device.push(4)
+    first = sensor.read_fifo()
+    device.push(4)
+    second = sensor.read_fifo()
+    times = [t for t, value in first + second]
+    assert all(b > a for a, b in zip(times, times[1:]))
+    assert first[0][1][2] == pytest.approx(sensor.convert(32))
+
+# Events keep the watermark interrupt of the FIFO
+def test_config_events_keeps_other_interrupts():
+    device, i2c, sensor = _sensor()
+    sensor.arm_trigger(source = ADXL345.ADXL345_INT_WATERMARK, int2 = True)
+    sensor.config_events(activity = 1.5, inactivity = None, free_fall = 0.45, tap = False)
+    assert device.get_register(REG_INT_MAP) == ADXL345.ADXL345_INT_WATERMARK
+    assert device.get_register(REG_INT_ENABLE) == ADXL345.ADXL345_INT_WATERMARK | ADXL345.ADXL345_INT_ACTIVITY | ADXL345.ADXL345_INT_FREE_FALL
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+#
+# test_aggregate.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import pytest
+from conftest import FakeClock
+from hub.aggregate import decimate_box, decimate_cic, window_stats
+from hub.stream import paced, take
+from i2c.sim import SimI2C, RegisterDevice
+
+#------------------------------------------------------------------------------------------------------#
+
+def _samples(values, rate = 10.0):
+    return [(i / rate, value) for i, value in enumerate(values)]
+
+#------------------------------------------------------------------------------------------------------#
+
+# A finite stream yields its last partial window
+def test_window_stats_last_partial_window():
+    windows = list(window_stats(_samples(range(25)), 1.0))
+    assert [aggregate.count for t, aggregate in windows] == [10, 10, 5]
+    t, last = windows[-1]
+    assert t == pytest.approx(2.0)
+    assert (last.min, last.mean, last.max) == (20, 22.0, 24)
+
+def test_window_stats_tuples_and_invalid_samples():
+    samples = _samples([(1.0, -1.0), (None, 0.0), (3.0, -3.0)])
+    windows = list(window_stats(samples, 1.0))
+    assert len(windows) == 1
+    x, y = windows[0][1]
+    assert (x.count, x.mean, y.min) == (2, 2.0, -3.0)
+    assert x.rms == pytest.approx((5.0) ** 0.5)
+    assert list(window_stats([], 1.0)) == []
+
+def test_decimate_box():
+    assert list(decimate_box(_samples([1, 3, 5, 7, 9]), 2)) == [(0.1, 2.0), (0.3, 6.0)]
+
+# Constant input: after the warm-up every output is the input value
+def test_decimate_cic_constant():
+    out = list(decimate_cic(_samples([(0.25, 1.0)] * 64), 4, order = 3))
+    assert len(out) == 64 // 4 - 3
+    assert all(value == (0.25, 1.0) for t, value in out)
+
+# Register read on the simulated bus, paced on a fake clock, then decimated
+def test_pipeline_on_sim_bus():
+    clock = FakeClock()
+    i2c = SimI2C([RegisterDevice(0x48, {0x00: 100})])
+    stream = paced(lambda: i2c.i2c_read_block_data(0x48, 0x00, 1)[0], 100, clock = clock, sleep = clock.sleep)
+    windows = list(window_stats(take(stream, 150), 1.0))
+    assert [aggregate.count for t, aggregate in windows] == [100, 50]
+    assert i2c.transactions == 150
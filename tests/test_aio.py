@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+#
+# test_aio.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import asyncio
+import threading
+import pytest
+from i2c.aio import AsyncI2C
+from i2c.sim import SimI2C, RegisterDevice
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_of_returns_attached_instance():
+    i2c = SimI2C()
+    aio = AsyncI2C(i2c)
+    assert AsyncI2C.of(i2c) is aio
+    with pytest.raises(TypeError):
+        AsyncI2C.of(aio)
+    aio.close()
+
+def test_calls_run_in_bus_thread():
+    i2c = SimI2C([RegisterDevice(0x53, {0x00: 0xE5})])
+    aio = AsyncI2C(i2c)
+    threads = []
+
+    async def main():
+        read = await aio.i2c_read_block_data(0x53, 0x00, 1)
+        await aio.call(lambda: threads.append(threading.current_thread().name))
+        return read
+
+    assert asyncio.run(main()) == [0xE5]
+    assert threads[0].startswith("i2c")
+    aio.close()
+
+# Gaps between the two ATtiny reads are awaited, nothing sleeps in the bus thread
+def test_water_level_async_does_not_block_bus(monkeypatch):
+    pytest.importorskip("smbus2")
+    import water_level_sensor
+
+    sleeps = []
+    monkeypatch.setattr(water_level_sensor.time, "sleep", lambda seconds: sleeps.append(threading.current_thread().name))
+    high = RegisterDevice(water_level_sensor.ATTINY1_HIGH_ADDR, {0: [200] * 12})
+    low = RegisterDevice(water_level_sensor.ATTINY2_LOW_ADDR, {0: [200] * 8})
+    i2c = SimI2C([high, low])
+    aio = AsyncI2C(i2c)
+    sensor = water_level_sensor.WaterLevelSensor(i2c)
+
+    assert asyncio.run(sensor.get_water_level_async()) == 100
+    assert sleeps == []
+    assert sensor.get_water_level() == 100
+    assert len(sleeps) == 2
+    aio.close()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+#
+# test_cache.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import pytest
+from i2c.cache import RegisterCache
+from i2c.sim import SimI2C, RegisterDevice
+
+#------------------------------------------------------------------------------------------------------#
+
+# Device keeping the list of written (register, value)
+class WriteLog(RegisterDevice):
+    def __init__(self, address, registers = None):
+        RegisterDevice.__init__(self, address, registers)
+        self.writes = []
+
+    def write(self, data):
+        if len(data) > 1:
+            self.writes.append((data[0], data[1]))
+        RegisterDevice.write(self, data)
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_update_without_bus_read():
+    device = WriteLog(0x40)
+    i2c = SimI2C([device])
+    cache = RegisterCache(i2c, 0x40, volatile = [0x00])
+    cache.write(0x01, 0x04)
+    assert cache.update(0x01, set_bits = 0x10) == 0x14
+    assert (cache.hits, cache.misses) == (1, 0)
+    cache.read(0x00)
+    cache.read(0x00)
+    assert cache.misses == 2
+
+def test_self_clearing_bits_are_not_cached():
+    i2c = SimI2C([WriteLog(0x40)])
+    cache = RegisterCache(i2c, 0x40, self_clearing = {0x00: 0x80})
+    cache.write(0x00, 0xA1)
+    assert cache.read(0x00) == 0x21
+
+# Every set_frequency sets RESTART only in the last write, after the wake-up
+def test_pca9685_restart_after_wake():
+    pytest.importorskip("smbus2")
+    from output import PCA9685, MODE1, PRESCALE, RESTART
+
+    device = WriteLog(0x40, {MODE1: 0x11})
+    pca = PCA9685(SimI2C([device]))
+    for frequency in (50, 60):
+        device.writes = []
+        pca.set_frequency(frequency)
+        modes = [value for reg, value in device.writes if reg == MODE1]
+        assert [mode & RESTART for mode in modes] == [0, 0, RESTART]
+        assert [reg for reg, value in device.writes].count(PRESCALE) == 1
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+#
+# test_capture.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import pytest
+from conftest import FakeClock
+from hub.capture import CaptureWriter, CaptureReader
+
+numpy = pytest.importorskip("numpy")
+
+#------------------------------------------------------------------------------------------------------#
+
+def _times(path):
+    reader = CaptureReader(str(path))
+    times = numpy.concatenate([times for times, columns in reader.iter_range(0, len(reader))]) if len(reader) else numpy.empty(0)
+    epoch = reader.epoch
+    reader.close()
+    return times, epoch
+
+def test_empty_file_opens(tmp_path):
+    path = tmp_path / "empty.cap"
+    CaptureWriter(str(path), ("x",)).close()
+    reader = CaptureReader(str(path))
+    assert len(reader) == 0
+    assert len(reader.index) == 0
+    assert reader.seek(1.0) == 0
+
+# NTP step of the wall clock during the capture, default and sink times on the same clock
+def test_wall_clock_step_during_capture(tmp_path):
+    path = tmp_path / "step.cap"
+    clock = FakeClock(100.0)
+    wall = FakeClock(1000000.0)
+    writer = CaptureWriter(str(path), ("x",), chunk_samples = 4, clock = clock, wall_clock = wall)
+    for i in range(5):
+        writer.append(i)
+        clock.sleep(0.1)
+        wall.sleep(0.1)
+    wall.now -= 3600
+    for i in range(5):
+        writer.sink(clock(), 5 + i)
+        clock.sleep(0.1)
+    writer.close()
+
+    assert writer.steps == 0
+    times, epoch = _times(path)
+    assert len(times) == 10
+    assert numpy.all(numpy.diff(times) > 0)
+    assert epoch == pytest.approx(1000000.0 - 100.0)
+
+# Monotonic clock restarts after a reboot, the file continues after its last sample
+def test_continue_after_reboot(tmp_path):
+    path = tmp_path / "reboot.cap"
+    writer = CaptureWriter(str(path), ("x",), chunk_samples = 4, clock = FakeClock(5000.0), wall_clock = FakeClock(1000000.0))
+    for i in range(6):
+        writer.append(i, 5000.0 + i)
+    writer.close()
+
+    writer = CaptureWriter(str(path), ("x",), clock = FakeClock(10.0), wall_clock = FakeClock(1000100.0))
+    writer.append(6)
+    writer.append(7, 11.0)
+    writer.close()
+
+    assert writer.steps == 0
+    times, epoch = _times(path)
+    assert list(times[-2:]) == pytest.approx([5100.0, 5101.0])
+    assert times[-1] + epoch == pytest.approx(1000101.0)
+
+# A time before the last sample is clamped and counted, not raised
+def test_time_going_back_is_clamped(tmp_path):
+    path = tmp_path / "back.cap"
+    writer = CaptureWriter(str(path), ("x",), clock = FakeClock(), wall_clock = FakeClock())
+    writer.append(1.0, 10.0)
+    writer.append(2.0, 9.0)
+    writer.append(3.0, 11.0)
+    writer.close()
+
+    assert writer.steps == 1
+    times, epoch = _times(path)
+    assert list(times) == [10.0, 10.0, 11.0]
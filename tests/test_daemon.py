@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+#
+# test_daemon.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import math
+import threading
+import time
+import pytest
+from i2c.sim import SimI2C, RegisterDevice
+
+pytest.importorskip("smbus2")
+
+from i2c.pool import BusPool
+from hub.daemon import Channel, SensorHub, HubClient, encode_sample, decode_sample, read_frame
+
+#------------------------------------------------------------------------------------------------------#
+
+def _channel(read, rate = 0, max_age = 0.0):
+    return Channel(0, "test", read, 1, rate, max_age, threading.Lock())
+
+def test_sample_values_as_floats():
+    frame = encode_sample(3, 1.5, ("a", None, 2, "text"))
+    t, values = decode_sample(frame[8:])
+    assert t == 1.5
+    assert values[0] == ord("a") and values[2] == 2.0
+    assert math.isnan(values[1]) and math.isnan(values[3])
+
+# Requests waiting for a shared on-demand read get its error, not an old sample
+def test_coalesced_read_error_reaches_all_waiters():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def read():
+        calls.append(1)
+        if len(calls) == 1:
+            return 1.0
+        started.set()
+        release.wait(5)
+        raise OSError(121, "Remote I/O error")
+
+    channel = _channel(read)
+    channel.get()                           # Old sample in latest
+    results = []
+
+    def request():
+        try:
+            results.append(channel.get())
+        except OSError as e:
+            results.append(e)
+
+    threads = [threading.Thread(target = request) for i in range(3)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 2
+    assert len(results) == 3
+    assert all(isinstance(result, OSError) for result in results)
+    assert channel.errors == 1
+
+def test_poll_counts_errors_and_logs_once(caplog):
+    def read():
+        raise ValueError("bad value")
+
+    channel = _channel(read, rate = 10)
+    for i in range(3):
+        channel.poll()
+    assert channel.errors == 3
+    assert "ValueError" in channel.last_error
+    assert len([record for record in caplog.records if "read failed" in record.getMessage()]) == 1
+
+# Hub on the simulated bus: a failing on-demand channel answers the client with an error
+def test_hub_get_error(tmp_path):
+    def factory(bus):
+        return SimI2C([RegisterDevice(0x5F, {0x00: ord("k")})], bus = bus)
+
+    config = {"socket": str(tmp_path / "hub.sock"),
+              "channels": [{"name": "key", "module": "cardkb", "class": "CARDKB", "method": "get_key", "rate": 0},
+                           {"name": "missing", "module": "cardkb", "class": "CARDKB", "method": "get_key", "rate": 0, "kwargs": {"address": 0x60}}]}
+    hub = SensorHub(config, BusPool(factory))
+    hub.start()
+    try:
+        client = HubClient(config["socket"])
+        t, values = client.get("key")
+        assert values == (float(ord("k")),)
+        with pytest.raises(OSError):
+            client.get("missing")
+        client.close()
+    finally:
+        hub.stop()
+        hub.pool.close()
+    assert hub.stats()["missing"]["errors"] == 1
+
+# Channel with "shm": every read is published into its ring in /dev/shm
+def test_hub_publishes_into_ring(tmp_path, monkeypatch):
+    from hub import shm
+    monkeypatch.setattr(shm, "SHM_DIR", str(tmp_path))
+
+    def factory(bus):
+        return SimI2C([RegisterDevice(0x5F, {0x00: ord("k")})], bus = bus)
+
+    config = {"socket": str(tmp_path / "hub.sock"),
+              "channels": [{"name": "key", "module": "cardkb", "class": "CARDKB", "method": "get_key", "rate": 0, "shm": 16}]}
+    hub = SensorHub(config, BusPool(factory))
+    hub.start()
+    try:
+        reader = shm.ShmSubscriber("hub.key")
+        client = HubClient(config["socket"])
+        t, values = client.get("key")
+        client.close()
+    finally:
+        hub.stop()
+        hub.pool.close()
+    assert reader.channels == ("key",)
+    assert reader.read() == [(1, t, (float(ord("k")),))]
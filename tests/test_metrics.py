@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+#
+# test_metrics.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import time
+import urllib.request
+import pytest
+from hub.metrics import MetricsExporter
+from i2c.sim import SimI2C, RegisterDevice
+from i2c.trace import BusTracer
+
+#------------------------------------------------------------------------------------------------------#
+
+# Channels of a SensorHub (only what the exporter reads)
+class _Channel:
+    def __init__(self, name, latest):
+        self.name = name
+        self.latest = latest
+
+class _Hub:
+    def __init__(self, channels):
+        self.channels = channels
+
+def _lines(text):
+    return text.decode().splitlines()
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_character_channel_is_scraped():
+    now = time.monotonic()
+    hub = _Hub([_Channel("key", (now, "a")), _Channel("accel", (now, (0.0, None, 1.0))), _Channel("name", (now, "Up"))])
+    metrics = MetricsExporter()
+    metrics.add_hub(hub, {"accel": ("ax", "ay", "az")})
+    metrics.start(0, "127.0.0.1")
+    try:
+        hub.channels[0].latest = (time.monotonic(), "b")
+        metrics.snapshot()
+        with urllib.request.urlopen("http://127.0.0.1:%d/metrics" % metrics.port) as response:
+            lines = _lines(response.read())
+    finally:
+        metrics.stop()
+
+    assert 'i2c_sensor_value{sensor="key",channel="0"} 98.0' in lines
+    assert 'i2c_sensor_value{sensor="accel",channel="ay"} NaN' in lines
+    assert 'i2c_sensor_value{sensor="name",channel="0"} NaN' in lines
+    assert metrics.errors == 0
+
+# A failing snapshot is counted, the thread goes on and the last text is still served
+def test_snapshot_thread_survives_errors():
+    class FailingHub:
+        fails = 2
+
+        @property
+        def channels(self):
+            if self.fails:
+                self.fails -= 1
+                raise RuntimeError("channel list changed")
+            return [_Channel("key", (time.monotonic(), 1.0))]
+
+    hub = FailingHub()
+    metrics = MetricsExporter(interval = 0.01)
+    metrics.add_hub(_Hub([]))
+    metrics.start(0, "127.0.0.1")
+    try:
+        metrics.add_hub(hub)
+        deadline = time.monotonic() + 5
+        while b"key" not in metrics.text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        metrics.stop()
+    assert metrics.errors == 2
+    assert "RuntimeError" in metrics.last_error
+    assert b'sensor="key"' in metrics.text()
+
+def test_bus_statistics():
+    i2c = SimI2C([RegisterDevice(0x53, {0x00: 0xE5})])
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    for i in range(3):
+        i2c.i2c_read_block_data(0x53, 0x00, 1)
+    with pytest.raises(OSError):
+        i2c.i2c_read_byte(0x29)
+
+    metrics = MetricsExporter()
+    metrics.add_tracer(tracer)
+    lines = _lines(metrics.snapshot())
+    assert 'i2c_transactions_total{bus="1",address="0x53"} 3' in lines
+    assert 'i2c_errors_total{bus="1",address="0x29"} 1' in lines
+
+# Sensor hub on the simulated bus with a CARDKB channel (driver values are characters)
+def test_hub_with_cardkb_channel():
+    pytest.importorskip("smbus2")
+    from i2c.pool import BusPool
+    from hub.daemon import SensorHub
+
+    def factory(bus):
+        return SimI2C([RegisterDevice(0x5F, {0x00: ord("q")})], bus = bus)
+
+    config = {"channels": [{"name": "key", "module": "cardkb", "class": "CARDKB", "method": "get_key", "rate": 0}]}
+    hub = SensorHub(config, BusPool(factory))
+    hub.channel("key").read()
+    metrics = MetricsExporter()
+    metrics.add_hub(hub)
+    lines = _lines(metrics.snapshot())
+    hub.pool.close()
+    assert 'i2c_sensor_value{sensor="key",channel="0"} 113.0' in lines
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+#
+# test_motion.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import itertools
+import math
+import pytest
+from conftest import FakeClock
+from hub.motion import MotionAnalyzer, direction, tilt
+
+#------------------------------------------------------------------------------------------------------#
+
+SHAKE = [(0.5, 0.0, 1.0), (-0.5, 0.0, 1.0)]
+STILL = [(0.0, 0.0, 1.0)]
+
+def _reader(samples):
+    samples = itertools.cycle(samples)
+    return lambda: next(samples)
+
+# Caller in a tight loop: reads closer than the interval are skipped, not compared
+def test_tight_loop_uses_spaced_samples():
+    clock = FakeClock()
+    motion = MotionAnalyzer(clock = clock)
+    # Sensor changes every 100 ms, read every 1 ms (same sample 100 times)
+    shake = _reader(SHAKE)
+    sample = shake()
+    results = []
+    for i in range(300):
+        if i % 100 == 0:
+            sample = shake()
+        results.append(motion.poll(lambda: sample).is_vibration())
+        clock.sleep(0.001)
+    assert not any(results[:180])       # Window: reads at 0, 90 and 180 ms
+    assert results[-1]
+
+def test_still_sensor_is_not_vibration():
+    clock = FakeClock()
+    motion = MotionAnalyzer(clock = clock)
+    read = _reader(STILL)
+    for i in range(10):
+        motion.poll(read)
+        clock.sleep(0.1)
+    assert motion.is_full()
+    assert not motion.is_vibration()
+
+# No answer before window samples, whatever the number of calls
+def test_false_until_window_is_full():
+    clock = FakeClock()
+    motion = MotionAnalyzer(clock = clock)
+    read = _reader(SHAKE)
+    assert not motion.poll(read).is_vibration()
+    clock.sleep(0.1)
+    assert not motion.poll(read).is_vibration()
+    clock.sleep(0.1)
+    assert motion.poll(read).is_vibration()
+
+# Orientation reads (no time) do not enter the vibration window
+def test_orientation_updates_stay_out_of_window():
+    clock = FakeClock()
+    motion = MotionAnalyzer(clock = clock)
+    read = _reader(STILL)
+    for i in range(3):
+        motion.poll(read)
+        motion.update((1.0, 0.0, 0.0))
+        clock.sleep(0.1)
+    assert motion.direction == "Right"
+    assert motion.is_full()
+    assert motion.activity == 0.0
+
+# A slow caller starts a new window
+def test_gap_restarts_window():
+    clock = FakeClock()
+    motion = MotionAnalyzer(clock = clock)
+    read = _reader(SHAKE)
+    for i in range(3):
+        motion.poll(read)
+        clock.sleep(2.0)
+    assert not motion.is_full()
+    assert not motion.is_vibration()
+
+def test_reset_clears_state():
+    motion = MotionAnalyzer()
+    motion.update((1.0, 0.0, 0.0), 1.0)
+    motion.reset()
+    assert (motion.direction, motion.tilt, motion.t, motion.gravity, motion.count) == ("Unknow", (0.0, 0.0, 0.0), None, None, 0)
+    assert not motion.is_full()
+
+def test_stream_rate_does_not_change_answer():
+    for rate in (10, 200, 1000):
+        motion = MotionAnalyzer()
+        for i in range(rate):
+            motion.update(SHAKE[i * 10 // rate % 2], i / rate)
+        assert motion.is_vibration()
+
+def test_tilt_and_direction():
+    assert direction(0.0, 0.0, 1.0) == "Up"
+    assert direction(0.0, -1.0, 0.0) == "Back"
+    assert tilt(0.0, 0.0, 1.0) == (0.0, 0.0, 0.0)
+    assert tilt(1.0, 0.0, 0.0)[0] == pytest.approx(math.pi / 2)
+
+def test_tilt_angles_match_tilt():
+    numpy = pytest.importorskip("numpy")
+    from hub.motion import tilt_angles, directions, DIRECTIONS
+
+    accel = [(0.0, 0.0, 1.0), (1.0, 0.0, 0.0), (0.0, -1.0, 0.0), (0.3, 0.4, -0.8), (0.0, 0.0, 0.0)]
+    angles = numpy.column_stack(tilt_angles(numpy.array(accel)))
+    for row, sample in zip(angles, accel):
+        assert tuple(row) == pytest.approx(tilt(*sample))
+    assert [DIRECTIONS[i] for i in directions(accel)] == [direction(*sample) for sample in accel]
+
+# Driver path on the simulated bus: get_direction reads do not disturb is_vibration
+def test_driver_is_vibration_on_sim():
+    pytest.importorskip("smbus2")
+    import MMA7660FC
+    from i2c.sim import SimI2C, RegisterDevice
+
+    device = RegisterDevice(MMA7660FC.MMA7660FC_I2C_ADDRESS)
+    sensor = MMA7660FC.MMA7660FC(SimI2C([device]))
+    clock = FakeClock()
+    sensor.motion.clock = clock
+    for i in range(5):
+        sensor.get_direction()
+        sensor.is_vibration()
+        clock.sleep(0.1)
+    assert sensor.motion.is_full()
+    assert not sensor.is_vibration()
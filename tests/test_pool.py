@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+#
+# test_pool.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import asyncio
+import threading
+import pytest
+from i2c.sim import SimI2C, RegisterDevice
+
+pytest.importorskip("smbus2")
+
+from i2c.aio import AsyncI2C
+from i2c.pool import BusPool
+
+#------------------------------------------------------------------------------------------------------#
+
+# Register device recording the thread of every bus access
+class ThreadDevice(RegisterDevice):
+    def __init__(self, address, registers = None):
+        RegisterDevice.__init__(self, address, registers)
+        self.threads = set()
+
+    def write(self, data):
+        self.threads.add(threading.current_thread().name)
+        RegisterDevice.write(self, data)
+
+    def read(self, size):
+        self.threads.add(threading.current_thread().name)
+        return RegisterDevice.read(self, size)
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_bus_is_shared():
+    pool = BusPool(lambda bus: SimI2C(bus = bus))
+    assert pool.get(1) is pool.get(1)
+    assert pool.get(1) is not pool.get(3)
+    assert pool.buses == [1, 3]
+    assert pool.aio(1) is AsyncI2C.of(pool.get(1))
+    pool.close()
+
+# Driver *_async path, aio() and submit() all run in the one worker thread of the bus
+def test_async_driver_and_submit_share_thread():
+    import TCS3472
+
+    device = ThreadDevice(0x29, {TCS3472.TCS34725_COMMAND_BIT | TCS3472.TCS34725_ID: 0x44})
+    pool = BusPool(lambda bus: SimI2C([device], bus = bus))
+    sensor = pool.submit(1, lambda i2c: TCS3472.TCS3472(i2c, it = TCS3472.TCS34725_INTEGRATIONTIME_2_4MS)).result()
+
+    async def main():
+        await sensor.get_raw_data_async()
+        await pool.aio(1).i2c_read_byte(0x29)
+
+    asyncio.run(main())
+    pool.submit(1, lambda i2c: i2c.i2c_read_byte(0x29)).result()
+    pool.close()
+
+    assert len(device.threads) == 1
+    assert device.threads.pop().startswith("i2c-1")
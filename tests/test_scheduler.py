@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+#
+# test_scheduler.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+from conftest import FakeClock
+from hub.scheduler import RateScheduler
+
+#------------------------------------------------------------------------------------------------------#
+
+def _scheduler():
+    clock = FakeClock(step = 1e-6)
+    return clock, RateScheduler(clock, clock.sleep)
+
+# Task taking busy seconds on the fake clock for the listed calls
+def _task(clock, busy = None):
+    calls = []
+    def read():
+        calls.append(clock.now)
+        clock.sleep((busy or {}).get(len(calls), 0.0))
+        return len(calls)
+    return read, calls
+
+#------------------------------------------------------------------------------------------------------#
+
+# A read a little longer than the period: the next release runs late, none is skipped
+def test_slightly_late_release_is_not_skipped():
+    clock, scheduler = _scheduler()
+    read, calls = _task(clock, {1: 0.012})
+    task = scheduler.add(None, read, 0.01, name = "imu")
+    scheduler.run(duration = 0.1)
+    assert task.stats.overruns == 0
+    assert len(calls) == 10
+
+# A read of 3.5 periods: only the releases whose period is over are skipped
+def test_long_read_skips_past_releases():
+    clock, scheduler = _scheduler()
+    read, calls = _task(clock, {1: 0.035})
+    task = scheduler.add(None, read, 0.01, name = "imu")
+    scheduler.run(duration = 0.1)
+    assert task.stats.overruns == 2
+    assert 0.035 <= calls[1] < 0.036       # Release 0.03 runs late, 0.01 and 0.02 are skipped
+    assert 0.04 <= calls[2] < 0.041
+    assert len(calls) == 8
+
+def test_exceptions_are_counted_not_raised():
+    clock, scheduler = _scheduler()
+    good, calls = _task(clock)
+    def bad():
+        raise ValueError("not a number")
+    def bad_sink(t, value):
+        raise OSError(121, "Remote I/O error")
+
+    bad_task = scheduler.add(None, bad, 0.01, name = "bad")
+    sink_task = scheduler.add(None, good, 0.01, sink = bad_sink, name = "sink")
+    scheduler.run(duration = 0.05)
+    assert bad_task.stats.errors == 5
+    assert "ValueError" in scheduler.stats()["bad"]["last_error"]
+    assert sink_task.stats.errors == 5
+    assert sink_task.stats.count == 5
+
+def test_group_added_while_running():
+    clock, scheduler = _scheduler()
+    slow, slow_calls = _task(clock)
+    def add_slow(t, value):
+        if value == 3:
+            scheduler.add(None, slow, 0.02, name = "slow")
+
+    fast, fast_calls = _task(clock)
+    scheduler.add(None, fast, 0.01, sink = add_slow, name = "fast")
+    scheduler.run(duration = 0.1)
+    assert len(fast_calls) == 10
+    assert len(slow_calls) >= 3
+    assert slow_calls[0] >= 0.02
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+#
+# test_shm.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import os
+import pytest
+from hub import shm
+from hub.shm import ShmPublisher, ShmSubscriber
+
+#------------------------------------------------------------------------------------------------------#
+
+@pytest.fixture(autouse = True)
+def shm_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(shm, "SHM_DIR", str(tmp_path))
+    return tmp_path
+
+def _publish(ring, first, count):
+    for i in range(first, first + count):
+        ring.publish((float(i), -float(i)), t = i / 100)
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_publish_and_read():
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    reader = ShmSubscriber("accel")
+    assert reader.channels == ("ax", "ay")
+    assert reader.latest() is None
+    _publish(ring, 1, 3)
+    assert reader.read() == [(1, 0.01, (1.0, -1.0)), (2, 0.02, (2.0, -2.0)), (3, 0.03, (3.0, -3.0))]
+    assert reader.read() == []
+    assert reader.latest() == (3, 0.03, (3.0, -3.0))
+
+def test_slow_reader_counts_overruns():
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    reader = ShmSubscriber("accel")
+    _publish(ring, 1, 20)
+    samples = reader.read()
+    assert [sample[0] for sample in samples] == list(range(13, 21))
+    assert reader.overruns == 12
+
+# A restarted writer with the same layout goes on in the same file, readers keep reading
+def test_reader_follows_writer_restart(shm_dir):
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    reader = ShmSubscriber("accel")
+    _publish(ring, 1, 3)
+    inode = os.stat(shm_dir / "accel").st_ino
+    ring.close()
+
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    assert ring.sequence == 3
+    assert os.stat(shm_dir / "accel").st_ino == inode
+    _publish(ring, 4, 2)
+    assert [sample[0] for sample in reader.read()] == [1, 2, 3, 4, 5]
+    assert not reader.replaced()
+    assert ShmSubscriber("accel", start = "oldest").read()[0][0] == 1
+
+# Another layout replaces the file: the old reader keeps its mapping and sees it was replaced
+def test_other_layout_replaces_file():
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    reader = ShmSubscriber("accel")
+    _publish(ring, 1, 2)
+    ring.close()
+
+    ring = ShmPublisher("accel", ("ax", "ay", "az"), 16)
+    assert ring.sequence == 0
+    ring.publish((1.0, 2.0, 3.0), t = 1.0)
+    assert [sample[0] for sample in reader.read()] == [1, 2]
+    assert reader.replaced()
+    assert ShmSubscriber("accel").channels == ("ax", "ay", "az")
+
+# Sequences are 32-bit in the file, readers go on over the wrap
+def test_sequence_wraps():
+    ring = ShmPublisher("accel", ("ax", "ay"), 8)
+    ring.sequence = shm.SEQ_MASK - 2
+    _publish(ring, 0, 1)
+    reader = ShmSubscriber("accel")
+    _publish(ring, 1, 4)
+    sequences = [sample[0] for sample in reader.read()]
+    assert sequences == [shm.SEQ_MASK, shm.SEQ_MASK + 2, shm.SEQ_MASK + 3, shm.SEQ_MASK + 4]
+    assert reader.overruns == 0
+    assert reader.latest()[0] == shm.SEQ_MASK + 4
+
+    ring.close()
+    assert ShmPublisher("accel", ("ax", "ay"), 8).sequence == shm.SEQ_MASK + 4
+    assert ShmSubscriber("accel").next == shm.SEQ_MASK + 5
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+#
+# test_stream.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import pytest
+from conftest import FakeClock
+from hub.stream import paced, take, tee, pipeline, map_values
+from i2c.sim import SimI2C, RegisterDevice
+
+#------------------------------------------------------------------------------------------------------#
+
+def _reader():
+    i2c = SimI2C([RegisterDevice(0x53, {0x00: 0xE5})])
+    return i2c, lambda: i2c.i2c_read_block_data(0x53, 0x00, 1)[0]
+
+#------------------------------------------------------------------------------------------------------#
+
+# take() does not read the stream once more after the last sample
+def test_take_stops_after_last_sample():
+    i2c, read = _reader()
+    clock = FakeClock()
+    assert len(list(take(paced(read, 100, clock = clock, sleep = clock.sleep), 3))) == 3
+    assert i2c.transactions == 3
+    assert list(take(paced(read, 100, clock = clock, sleep = clock.sleep), 0)) == []
+    assert i2c.transactions == 3
+
+# Releases are absolute: a read taking time does not slow the rate
+def test_paced_does_not_drift():
+    i2c, read = _reader()
+    clock = FakeClock()
+
+    def slow_read():
+        clock.sleep(0.004)
+        return read()
+
+    times = [t for t, value in paced(slow_read, 100, count = 100, clock = clock, sleep = clock.sleep)]
+    assert times[-1] == pytest.approx(0.99)
+
+def test_late_read_skips_missed_samples():
+    i2c, read = _reader()
+    clock = FakeClock()
+    stream = paced(read, 100, count = 3, clock = clock, sleep = clock.sleep)
+    next(stream)
+    clock.sleep(0.035)
+    times = [t for t, value in stream]
+    assert times[0] == pytest.approx(0.035)
+    assert times[1] == pytest.approx(0.04)
+
+def test_pipeline_tee():
+    i2c, read = _reader()
+    clock = FakeClock()
+    seen = []
+    stream = pipeline(paced(read, 10, count = 2, clock = clock, sleep = clock.sleep),
+                      lambda s: map_values(s, lambda v: v * 2),
+                      lambda s: tee(s, lambda t, value: seen.append(value)))
+    assert [value for t, value in stream] == seen == [0xE5 * 2] * 2
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+#
+# test_trace.py
+#
+# Created on: October 17, 2026
+# Author: LongHD
+#
+
+#------------------------------------------------------------------------------------------------------#
+
+import array
+import asyncio
+import pytest
+from i2c.aio import AsyncI2C
+from i2c.arbiter import BusArbiter
+from i2c.record import BusRecorder, load_records
+from i2c.sim import SimI2C, RegisterDevice
+from i2c.trace import BusTracer
+
+#------------------------------------------------------------------------------------------------------#
+
+def _bus():
+    return SimI2C([RegisterDevice(0x53, {0x00: 0xE5, 0x32: [1, 0, 2, 0, 3, 0]})])
+
+def _count(tracer):
+    return sum(stats.count for stats in tracer.address_stats())
+
+#------------------------------------------------------------------------------------------------------#
+
+def test_bytes_and_errors():
+    i2c = _bus()
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    i2c.i2c_read_block_into(0x53, 0x32, bytearray(6))
+    i2c.i2c_transfer([(0, 0x53, bytearray([0x32])), (1, 0x53, 6)])
+    with pytest.raises(OSError):
+        i2c.i2c_read_byte(0x29)
+    tracer.disable()
+
+    stats = {s.address: s for s in tracer.address_stats()}
+    assert (stats[0x53].count, stats[0x53].bytes, stats[0x53].errors) == (2, 7 + 7, 0)
+    assert (stats[0x29].count, stats[0x29].errors) == (1, 1)
+    assert tracer.lost == 0
+    assert not [name for name in vars(i2c) if name.startswith("i2c_")]
+
+def test_keyword_arguments_are_forwarded():
+    i2c = _bus()
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    assert i2c.i2c_read_block_data(0x53, 0x32, size = 2) == [1, 0]
+    assert i2c.i2c_read_write_data(address = 0x53, write_list = [0x00], read_size = 1) == [0xE5]
+    stats = tracer.address_stats()
+    assert [(s.address, s.count, s.bytes) for s in stats] == [(0x53, 2, 3 + 2)]
+
+# Buffer payloads (array, memoryview) are counted in bytes, results are returned
+def test_buffer_payloads():
+    i2c = _bus()
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    data = i2c.i2c_transfer([(0, 0x53, array.array("B", [0x32])), (1, 0x53, 2)])
+    i2c.i2c_write_data(0x53, memoryview(bytes([0x1E, 0x00])))
+    assert list(data[-1]) == [1, 0]
+    stats = tracer.address_stats()
+    assert [(s.address, s.count, s.bytes) for s in stats] == [(0x53, 2, 1 + 2 + 2)]
+    assert tracer.lost == 0
+
+# Accounting failure is counted, the call still returns
+def test_lost_record():
+    i2c = _bus()
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    i2c.i2c_write_data(0x53, (value for value in [0x00]))
+    assert tracer.lost == 1
+
+# Proxies used before the tracer is enabled see it, and stop calling it when disabled
+def test_proxies_follow_enable_and_disable(tmp_path):
+    i2c = _bus()
+    client = BusArbiter(i2c).client("imu")
+    aio = AsyncI2C(i2c)
+    recorder = BusRecorder(i2c, str(tmp_path / "bus.i2crec"))
+
+    def calls():
+        client.i2c_read_byte(0x53)
+        asyncio.run(aio.i2c_read_byte(0x53))
+        recorder.i2c_read_byte(0x53)
+        recorder.i2c_read_block_data(0x53, 0x32, size = 6)
+
+    calls()
+    tracer = BusTracer(i2c)
+    tracer.enable()
+    calls()
+    tracer.disable()
+    calls()
+    aio.close()
+    recorder.close()
+
+    assert _count(tracer) == 4
+    assert i2c.transactions == 12
+    header, records = load_records(str(tmp_path / "bus.i2crec"))
+    assert len(records) == 6
+    assert records[-1].write == bytes([0x32]) and records[-1].read == bytes([1, 0, 2, 0, 3, 0])
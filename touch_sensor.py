@@ -12,6 +12,7 @@
 #------------------------------------------------------------------------------------------------------#
 
 from i2c.i2c import I2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -164,6 +165,11 @@ class TouchSensor:
         
         return touch_input
 
+    # Yield (t, list of 12 inputs) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_touch_input, rate_hz, count)
+
 #-------------------------- Example --------------------------
 
 """
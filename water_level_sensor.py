@@ -9,8 +9,11 @@
 # Reference https://github.com/SeeedDocument/Grove-Water-Level-Sensor
 #
 
+import asyncio
 import time
 from i2c.i2c import I2C
+from i2c.aio import AsyncI2C
+from hub.stream import paced
 
 #------------------------------------------------------------------------------------------------------#
 
@@ -42,6 +45,22 @@ class WaterLevelSensor:
     
     #--------------------------------------------------------------------------------------------------#
 
+    # Convert values of 20 sections to water level
+    def __convert_level(self, values):
+        trig_section = 0
+
+        # Check continuous value trigger
+        for value in values:
+            if value > self.__threshold:
+                trig_section += 1
+            else:
+                break
+        
+        # Convert to percentage
+        return trig_section * 5
+
+    #--------------------------------------------------------------------------------------------------#
+
     # Get values of 20 sections
     def get_water_section_value(self):
         low_count = 0
@@ -51,23 +70,31 @@ class WaterLevelSensor:
         low_data = self.__get_low_8_section_value()
 
         return low_data + high_data
+
+    # Same as get_water_section_value, reads run in the bus thread (AsyncI2C)
+    # The 10 ms gaps are awaited, the bus thread is free for other devices meanwhile
+    async def get_water_section_value_async(self):
+        aio = AsyncI2C.of(self.__i2c)
+        high_data = await aio.i2c_read_block_data(ATTINY1_HIGH_ADDR, 0, 12)
+        await asyncio.sleep(0.01)
+        low_data = await aio.i2c_read_block_data(ATTINY2_LOW_ADDR, 0, 8)
+        await asyncio.sleep(0.01)
+
+        return low_data + high_data
     
     # Get water value (0 - 100%)
     # If section 1, 2, 3, 4, 5 value > threshold -> level = 5 * 5 = 25%
     # If section 1, 2, 3, , 5, 6 value > threshold but section 4 < threshold -> level = 3 * 5 = 15%
     def get_water_level(self):
-        values = self.get_water_section_value()
-        trig_section = 0
+        return self.__convert_level(self.get_water_section_value())
 
-        # Check continuous value trigger
-        for value in values:
-            if value > self.__threshold:
-                trig_section += 1
-            else:
-                break
-        
-        # Convert to percentage
-        return trig_section * 5
+    async def get_water_level_async(self):
+        return self.__convert_level(await self.get_water_section_value_async())
+
+    # Yield (t, level) at rate_hz, paced on the monotonic clock
+    # count: number of samples, None = forever
+    def stream(self, rate_hz, count = None):
+        return paced(self.get_water_level, rate_hz, count)
 
     # Set threshold
     # If sensor values > threshold -> active